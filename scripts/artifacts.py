@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for experiment artifacts.
+
+`ingest` hashes files in fixed-size chunks (SHA-256) and keeps one copy
+of each distinct content in the store, `objects/<aa>/<rest of digest>`.
+The store lives under `storage.external_storage` from config.yaml, or
+`research-notes/.artifacts` when that is empty. Each ingested file is
+then placed in the experiment's `artifacts/` directory: files of at
+least `storage.symlink_threshold` MB become symlinks into the store when
+`storage.symlink_large_files` is set; everything else is hard-linked to
+the store object, or copied when the store is on another filesystem or
+the filesystem has no hard links. A hard-linked artifact shares the
+store's read-only file, so replace it rather than editing it in place.
+
+Content already in the store is never copied again, so re-ingesting the
+same file costs one hash pass, and an artifact that is already a symlink
+into the store costs nothing. With `--move` new content is renamed into
+the store instead of copied when source and store share a filesystem.
+
+Every experiment keeps `artifacts/.manifest.json` with the digest and
+size of each ingested file. `verify` re-hashes artifacts against their
+manifests and reports changed, missing and never-ingested files. Files
+are hashed through mmap in a process pool (`--workers`); digests are
+cached in `research-notes/.artifact-digests.json` by inode, mtime and
+size, so files unchanged since the last run are not read again
+(`--full` ignores the cache).
+
+Usage:
+    python3 artifacts.py ingest <project> <idea> <experiment> <path>... [--move]
+    python3 artifacts.py list <project> <idea> <experiment>
+    python3 artifacts.py verify [<project> [<idea> [<experiment>]]] [--full] [--workers <n>]
+"""
+
+import sys
+import os
+import json
+import errno
+import shutil
+import mmap
+import time
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import autocommit
+import catalog
+import frontmatter
+import locator
+import notewriter
+import resolver
+import walker
+
+
+DEFAULT_STORE = ".artifacts"
+MANIFEST_FILE = ".manifest.json"
+CHUNK_SIZE = 4 * 1024 * 1024
+DIGEST_LENGTH = 64
+
+# verify: digest cache keyed by device:inode, checked against mtime and size
+DIGEST_CACHE = ".artifact-digests.json"
+DIGEST_CACHE_VERSION = 1
+# Below this many bytes to hash, a process pool costs more than it saves
+POOL_MIN_BYTES = 64 * 1024 * 1024
+
+
+def storage_config(config):
+    """Return (store dir or None, symlink large files?, threshold in bytes)."""
+    storage = config.get("storage") or {}
+    external = storage.get("external_storage") or None
+    threshold = float(storage.get("symlink_threshold", 10) or 0) * 1024 * 1024
+    return external, bool(storage.get("symlink_large_files", False)), threshold
+
+
+def store_root(research_root, config):
+    """Return the store directory for a notes root."""
+    external = storage_config(config)[0]
+    if external:
+        return Path(external).expanduser()
+    return research_root / DEFAULT_STORE
+
+
+def object_path(store, digest):
+    """Return the path of an object in the store."""
+    return store / "objects" / digest[:2] / digest[2:]
+
+
+def object_digest(store, path):
+    """Return the digest of a path that is (a link to) a store object, or None."""
+    try:
+        target = path.resolve()
+        rel = target.relative_to((store / "objects").resolve())
+    except (OSError, ValueError):
+        return None
+    digest = "".join(rel.parts)
+    return digest if len(digest) == DIGEST_LENGTH else None
+
+
+def hash_file(path):
+    """Return (sha256 hex digest, size) of a file, reading it in chunks."""
+    h = hashlib.sha256()
+    buf = bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    size = 0
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+            size += n
+    return h.hexdigest(), size
+
+
+def store_object(store, src, digest, move=False):
+    """
+    Add src to the store under digest unless it is already there.
+
+    Returns (object path, True if the content was new).
+    """
+    obj = object_path(store, digest)
+    if obj.exists():
+        return obj, False
+
+    obj.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=obj.parent, prefix=".ingest.", suffix=".tmp")
+    os.close(fd)
+    try:
+        moved = False
+        if move:
+            try:
+                os.rename(src, tmp_path)
+                moved = True
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+        if not moved:
+            shutil.copyfile(src, tmp_path)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, obj)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return obj, True
+
+
+def link_target(obj, dest, research_root):
+    """Use a relative link for stores inside the notes root, so it can move."""
+    try:
+        obj.relative_to(research_root)
+    except ValueError:
+        return str(obj)
+    return os.path.relpath(obj, dest.parent)
+
+
+def place(obj, dest, research_root, link):
+    """
+    Put an object at dest, replacing dest atomically.
+
+    With `link` dest becomes a symlink into the store; otherwise a hard
+    link to the object, falling back to a copy. Returns "linked",
+    "hardlinked" or "copied".
+    """
+    if link and dest.is_symlink() and dest.resolve() == obj.resolve():
+        return "linked"
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.parent / f".{dest.name}.{os.getpid()}.tmp"
+    try:
+        if link:
+            os.symlink(link_target(obj, dest, research_root), tmp_path)
+            kind = "linked"
+        else:
+            try:
+                os.link(obj, tmp_path)
+                kind = "hardlinked"
+            except OSError:
+                # Another filesystem, or no hard links (EXDEV, EPERM, EMLINK)
+                shutil.copyfile(obj, tmp_path)
+                kind = "copied"
+        os.replace(tmp_path, dest)
+        return kind
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def sources(path, dest):
+    """Yield (source file, destination) pairs for a file or directory."""
+    if path.is_dir() and not path.is_symlink():
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                src = Path(root) / name
+                yield src, dest / src.relative_to(path)
+    else:
+        yield path, dest
+
+
+def load_manifest(artifacts_dir):
+    try:
+        with open(artifacts_dir / MANIFEST_FILE, 'r', encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(artifacts_dir, manifest):
+    content = json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    notewriter.atomic_write(artifacts_dir / MANIFEST_FILE, content)
+
+
+def ingest(research_root, artifacts_dir, paths, config, move=False):
+    """
+    Ingest files and directories into the store and an experiment's artifacts.
+
+    Returns a dict of counts: files, new (stored), deduplicated, linked,
+    hardlinked, copied, and bytes_stored.
+    """
+    store = store_root(research_root, config)
+    _, symlink_large, threshold = storage_config(config)
+    manifest = load_manifest(artifacts_dir)
+    now = datetime.now().isoformat()
+    counts = {"files": 0, "new": 0, "deduplicated": 0, "linked": 0, "hardlinked": 0, "copied": 0,
+              "bytes_stored": 0}
+
+    try:
+        for path in paths:
+            for src, dest in sources(path, artifacts_dir / path.name):
+                rel = dest.relative_to(artifacts_dir).as_posix()
+                in_place = src.absolute() == dest.absolute()
+                digest = object_digest(store, src)
+                if digest:
+                    obj = object_path(store, digest)
+                    size = obj.stat().st_size
+                    new = False
+                else:
+                    digest, size = hash_file(src)
+                    link = symlink_large and size >= threshold
+                    # An artifact about to be replaced by a link can be moved
+                    obj, new = store_object(store, src, digest, move or (in_place and link))
+
+                link = symlink_large and size >= threshold
+                entry = manifest.get(rel) or {}
+                unchanged_copy = (not link and entry.get("sha256") == digest and not dest.is_symlink()
+                                  and dest.exists() and dest.stat().st_size == size)
+                if unchanged_copy:
+                    kind = "hardlinked" if os.path.samefile(dest, obj) else "copied"
+                else:
+                    kind = place(obj, dest, research_root, link)
+
+                counts["files"] += 1
+                counts["new" if new else "deduplicated"] += 1
+                counts[kind] += 1
+                if new:
+                    counts["bytes_stored"] += size
+                if move and not in_place and src.exists():
+                    src.unlink()
+
+                manifest[rel] = {
+                    "sha256": digest,
+                    "size": size,
+                    "linked": link,
+                    "ingested": now,
+                }
+    finally:
+        save_manifest(artifacts_dir, manifest)
+
+    return counts
+
+
+def resolve_experiment(idea_dir, title):
+    """Return the directory of an experiment by slug or title, or None."""
+    experiments_dir = idea_dir / "experiments"
+    slug = title.lower().replace(' ', '-').replace('_', '-')
+    if (experiments_dir / slug / "experiment.md").exists():
+        return experiments_dir / slug
+
+    if experiments_dir.exists():
+        key = title.casefold()
+        for experiment_dir in sorted(experiments_dir.iterdir()):
+            note = experiment_dir / "experiment.md"
+            if note.exists() and str(frontmatter.read_title(note, "")).casefold() == key:
+                return experiment_dir
+    return None
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def experiments_with_artifacts(research_root, project_dir=None, idea_dir=None):
+    """Return every experiment directory that has an artifacts/ directory."""
+    if idea_dir:
+        dirs = [d for d in sorted((idea_dir / "experiments").glob("*")) if d.is_dir()]
+    else:
+        dirs = [n.dir for n in walker.walk_scope(research_root / "projects", "experiments")
+                if n.kind == "experiment" and (project_dir is None or n.project_dir == project_dir)]
+    return [d for d in dirs if (d / "artifacts").is_dir()]
+
+
+def mmap_hash(path):
+    """Return the sha256 hex digest of a file, read through a memory map."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if hasattr(m, "madvise"):
+                m.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(m)
+            try:
+                for offset in range(0, size, CHUNK_SIZE):
+                    h.update(view[offset:offset + CHUNK_SIZE])
+            finally:
+                view.release()
+    return h.hexdigest()
+
+
+def hash_files(paths, workers):
+    """Hash files with mmap_hash, in a process pool when the work is large enough."""
+    total = sum(size for _, size in paths)
+    if workers <= 1 or len(paths) <= 1 or total < POOL_MIN_BYTES:
+        return [mmap_hash(path) for path, _ in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(workers, len(paths))
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(mmap_hash, [path for path, _ in paths], chunksize=chunksize))
+
+
+def load_digests(research_root):
+    """Load the digest cache: "dev:inode" -> [mtime_ns, size, digest]."""
+    try:
+        with open(research_root / DIGEST_CACHE, 'r', encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != DIGEST_CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_digests(research_root, digests):
+    content = json.dumps({"version": DIGEST_CACHE_VERSION, "files": digests}, separators=(",", ":"))
+    notewriter.atomic_write(research_root / DIGEST_CACHE, content)
+
+
+def untracked_files(artifacts_dir, manifest):
+    """Return artifact paths that are not in the manifest."""
+    untracked = []
+    for root, dirs, files in os.walk(artifacts_dir):
+        for name in files:
+            if name == MANIFEST_FILE or name.endswith(".tmp"):
+                continue
+            rel = (Path(root) / name).relative_to(artifacts_dir).as_posix()
+            if rel not in manifest:
+                untracked.append(artifacts_dir / rel)
+    return sorted(untracked)
+
+
+def verify(research_root, experiment_dirs, config, workers=None, full=False, prune=False):
+    """
+    Check every manifest entry of the given experiments against the disk.
+
+    Each distinct file (by device and inode, so an object linked from many
+    experiments counts once) is hashed only when its (inode, mtime, size)
+    differs from the digest cache, or always with `full`. Returns a dict
+    with lists ok, drift (path, expected, found), missing and untracked,
+    plus counts hashed, cached and bytes_hashed.
+    """
+    if workers is None:
+        workers = walker.default_workers()
+    store = store_root(research_root, config)
+    digests = {} if full else load_digests(research_root)
+    report = {"ok": [], "drift": [], "missing": [], "untracked": [],
+              "hashed": 0, "cached": 0, "bytes_hashed": 0}
+
+    # (path, expected digest, file key, expected size) per manifest entry
+    checks = []
+    files = {}
+    for experiment_dir in experiment_dirs:
+        artifacts_dir = experiment_dir / "artifacts"
+        manifest = load_manifest(artifacts_dir)
+        report["untracked"].extend(untracked_files(artifacts_dir, manifest))
+
+        for rel, entry in sorted(manifest.items()):
+            path = artifacts_dir / rel
+            try:
+                st = path.stat()
+            except OSError:
+                report["missing"].append(path)
+                continue
+
+            expected = entry.get("sha256")
+            linked = object_digest(store, path) if path.is_symlink() else None
+            if linked and linked != expected:
+                report["drift"].append((path, expected, linked))
+                continue
+            if st.st_size != entry.get("size", st.st_size):
+                report["drift"].append((path, expected, f"size {st.st_size}"))
+                continue
+
+            key = f"{st.st_dev}:{st.st_ino}"
+            files[key] = (path, st)
+            checks.append((path, expected, key))
+
+    found = {}
+    to_hash = []
+    for key, (path, st) in files.items():
+        cached = digests.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            found[key] = cached[2]
+            report["cached"] += 1
+        else:
+            to_hash.append((key, path, st))
+
+    # Largest first, so one big file does not start last in the pool
+    to_hash.sort(key=lambda item: item[2].st_size, reverse=True)
+    results = hash_files([(path, st.st_size) for _, path, st in to_hash], workers)
+    for (key, path, st), digest in zip(to_hash, results):
+        found[key] = digest
+        digests[key] = [st.st_mtime_ns, st.st_size, digest]
+        report["hashed"] += 1
+        report["bytes_hashed"] += st.st_size
+
+    for path, expected, key in checks:
+        if found[key] == expected:
+            report["ok"].append(path)
+        else:
+            report["drift"].append((path, expected, found[key]))
+
+    if prune:
+        digests = {key: value for key, value in digests.items() if key in files}
+    if to_hash or prune:
+        save_digests(research_root, digests)
+
+    return report
+
+
+def resolve_scope(research_root, names):
+    """Resolve [project [idea [experiment]]] names to directories, or exit."""
+    project_dir = idea_dir = experiment_dir = None
+    if not names:
+        return project_dir, idea_dir, experiment_dir
+
+    conn = catalog.open_catalog(research_root)
+    project_dir = resolver.resolve_project(research_root, names[0], conn)
+    if project_dir and len(names) > 1:
+        idea_dir = resolver.resolve_idea(research_root, project_dir, names[1], conn)
+    catalog.close_catalog(conn, research_root)
+
+    if not project_dir:
+        print(f"Error: Project '{names[0]}' not found")
+        sys.exit(1)
+
+    if len(names) > 1 and not idea_dir:
+        print(f"Error: Idea '{names[1]}' not found in project '{names[0]}'")
+        sys.exit(1)
+
+    if len(names) > 2:
+        experiment_dir = resolve_experiment(idea_dir, names[2])
+        if not experiment_dir:
+            print(f"Error: Experiment '{names[2]}' not found in idea '{names[1]}'")
+            sys.exit(1)
+
+    return project_dir, idea_dir, experiment_dir
+
+
+def print_usage():
+    print("Usage: python3 artifacts.py ingest <project> <idea> <experiment> <path>... [--move]")
+    print("       python3 artifacts.py list <project> <idea> <experiment>")
+    print("       python3 artifacts.py verify [<project> [<idea> [<experiment>]]] [--full] [--workers <n>]")
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("ingest", "list", "verify"):
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+    workers = walker.parse_workers(sys.argv)
+    move = "--move" in sys.argv
+    full = "--full" in sys.argv
+
+    args = []
+    skip = False
+    for arg in sys.argv[2:]:
+        if skip:
+            skip = False
+        elif arg == "--workers":
+            skip = True
+        elif arg not in ("--move", "--full"):
+            args.append(arg)
+
+    if ((command == "list" and len(args) != 3) or (command == "ingest" and len(args) < 4)
+            or (command == "verify" and len(args) > 3)):
+        print_usage()
+        sys.exit(1)
+
+    config = locator.load_config(research_root)
+    project_dir, idea_dir, experiment_dir = resolve_scope(research_root, args[:3])
+
+    if command == "verify":
+        if experiment_dir:
+            dirs = [experiment_dir] if (experiment_dir / "artifacts").is_dir() else []
+        else:
+            dirs = experiments_with_artifacts(research_root, project_dir, idea_dir)
+
+        start = time.perf_counter()
+        report = verify(research_root, dirs, config, workers, full, prune=not args)
+        elapsed = time.perf_counter() - start
+
+        print(f"🔍 Verified {len(report['ok']) + len(report['drift']) + len(report['missing'])} artifacts in {len(dirs)} experiments")
+        rate = report["bytes_hashed"] / elapsed / 1024 / 1024 if elapsed else 0
+        print(f"Hashed: {report['hashed']} files ({format_size(report['bytes_hashed'])}, {rate:.0f} MB/s), "
+              f"unchanged (cached): {report['cached']}, {elapsed:.1f}s")
+
+        if report["drift"]:
+            print(f"\n⚠️  Changed ({len(report['drift'])}):")
+            for path, expected, found in report["drift"]:
+                found = found if found.startswith("size") else found[:12]
+                print(f"  {path.relative_to(research_root)}: expected {expected[:12]}, found {found}")
+        if report["missing"]:
+            print(f"\n❌ Missing ({len(report['missing'])}):")
+            for path in report["missing"]:
+                print(f"  {path.relative_to(research_root)}")
+        if report["untracked"]:
+            print(f"\nNot ingested ({len(report['untracked'])}):")
+            for path in report["untracked"][:20]:
+                print(f"  {path.relative_to(research_root)}")
+
+        if report["drift"] or report["missing"]:
+            sys.exit(1)
+        print("\n✓ All artifacts match their manifests")
+        return
+
+    artifacts_dir = experiment_dir / "artifacts"
+
+    if command == "list":
+        manifest = load_manifest(artifacts_dir)
+        if not manifest:
+            print("No artifacts ingested")
+            return
+        for name, entry in sorted(manifest.items()):
+            kind = "link" if entry.get("linked") else "copy"
+            print(f"{entry['sha256'][:12]}  {format_size(entry['size']):>10}  {kind}  {name}")
+        return
+
+    paths = [Path(p) for p in args[3:]]
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        print(f"Error: Not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    artifacts_dir.mkdir(exist_ok=True)
+    manifest_path = artifacts_dir / MANIFEST_FILE
+    manifest_is_new = not manifest_path.exists()
+    try:
+        counts = ingest(research_root, artifacts_dir, paths, config, move)
+    except OSError as e:
+        print(f"Error: Ingest failed: {e}")
+        sys.exit(1)
+
+    # The manifest is the record; artifact contents live in the store
+    summary = f"Ingest {counts['files']} artifacts into {experiment_dir.relative_to(research_root / 'projects')}"
+    if manifest_is_new:
+        autocommit.commit(research_root, [], summary, new=[manifest_path])
+    else:
+        autocommit.commit(research_root, [manifest_path], summary)
+
+    print(f"✓ Ingested {counts['files']} files into {artifacts_dir}")
+    print(f"\nNew in store: {counts['new']} ({format_size(counts['bytes_stored'])})")
+    print(f"Already stored: {counts['deduplicated']}")
+    print(f"Linked: {counts['linked']}, hard-linked: {counts['hardlinked']}, copied: {counts['copied']}")
+    print(f"Store: {store_root(research_root, config)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Git auto-commit for research notes, driven by the `git` block of config.yaml:
+
+    git:
+      auto_commit: true
+      auto_push: false
+      commit_message_prefix: "[Research Notes]"
+      commit_window: 0      # seconds; 0 commits at the end of every batch
+      remote: origin
+
+Scripts that change notes call `commit()` once at the end of their batch
+with the paths they wrote, so a batch of thousands of notes becomes one
+commit. Only those paths are staged and committed; anything else in the
+working tree or already staged is left alone. A batch runs a single git
+process, `git commit --only` over its paths; `auto_push` adds one
+`git push`. `--only` refuses paths git does not know yet, so new notes
+are first recorded in the index as intent-to-add entries (what
+`git add -N` writes) by editing the index file directly. Index formats
+this does not handle (split index, SHA-256 repositories, linked
+worktrees) fall back to a `git add` before the commit.
+
+With a `commit_window`, batches are queued in `.git-pending.jsonl` and
+committed together by the first batch that ends after the window since
+the oldest queued change has passed, by a running notes_daemon.py once
+the window has passed, or by `autocommit.py commit`.
+`commit --all` also commits hand edits anywhere under the notes root.
+
+Usage:
+    python3 autocommit.py init
+    python3 autocommit.py commit [--all] [--message <message>]
+    python3 autocommit.py status
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import struct
+import hashlib
+
+import locator
+
+
+PENDING_FILE = ".git-pending.jsonl"
+DEFAULT_PREFIX = "[Research Notes]"
+DEFAULT_REMOTE = "origin"
+# Hidden files in the notes root are caches and local state; artifact
+# contents live in the artifact store, only their manifests are notes
+GITIGNORE = "/.*\n!/.gitignore\n/report/\n**/artifacts/*\n!**/artifacts/.manifest.json\n"
+MAX_BODY_LINES = 50
+
+
+def git_config(research_root):
+    return locator.load_config(research_root).get("git") or {}
+
+
+def git(research_root, *args, stdin=None):
+    """Run one git process in the notes root. Returns CompletedProcess."""
+    import subprocess
+    # Untranslated messages, so "nothing to commit" can be recognized
+    env = dict(os.environ, LC_ALL="C", LANGUAGE="")
+    return subprocess.run(["git", *args], cwd=research_root, input=stdin,
+                          capture_output=True, text=True, env=env)
+
+
+# Index entries (see gitformat-index(5)): stat fields, mode, object ID, flags
+INDEX_ENTRY = struct.Struct(">10I20sH")
+EMPTY_BLOB = bytes.fromhex("e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+FLAG_EXTENDED = 0x4000
+FLAG_INTENT_TO_ADD = 0x2000  # in the extended flags
+NAME_MASK = 0x0FFF
+
+
+def find_git_dir(research_root):
+    """Return (work tree top, .git directory) above the notes root, or None."""
+    for directory in (research_root, *research_root.parents):
+        git_dir = directory / ".git"
+        if git_dir.is_dir():
+            return directory, git_dir
+        if git_dir.exists():
+            return None  # a linked worktree or submodule
+    return None
+
+
+def read_varint(data, pos):
+    """Decode an index v4 offset varint; returns (value, next position)."""
+    c = data[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def encode_varint(value):
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        value -= 1
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def read_index(data):
+    """
+    Parse an index file into (version, [(name, entry, extended flags)]).
+
+    Returns None for anything this module does not rewrite: a bad
+    header or checksum, or a required extension (split index, sparse).
+    """
+    if len(data) < 32 or data[:4] != b"DIRC" or hashlib.sha1(data[:-20]).digest() != data[-20:]:
+        return None
+    version, count = struct.unpack(">II", data[4:12])
+    if version not in (2, 3, 4):
+        return None
+
+    entries = []
+    pos = 12
+    name = b""
+    for _ in range(count):
+        start = pos
+        entry = data[pos:pos + INDEX_ENTRY.size]
+        flags = INDEX_ENTRY.unpack(entry)[-1]
+        pos += INDEX_ENTRY.size
+        extended = b""
+        if flags & FLAG_EXTENDED:
+            extended = data[pos:pos + 2]
+            pos += 2
+        if version == 4:
+            strip, pos = read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = name[:len(name) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b"\0", pos)
+            name = data[pos:end]
+            pos = start + ((end - start + 8) & ~7)
+        entries.append((name, entry, extended))
+
+    # Optional extensions (cache tree, untracked cache, ...) are upper case
+    # and are dropped on rewrite; git rebuilds them. Lower case ones are required.
+    while pos < len(data) - 20:
+        signature = data[pos:pos + 4]
+        size = struct.unpack(">I", data[pos + 4:pos + 8])[0]
+        if not signature[:1].isupper():
+            return None
+        pos += 8 + size
+    return version, entries
+
+
+def write_index(version, entries):
+    """Serialize index entries, sorted by name and stage, with a checksum."""
+    entries = sorted(entries, key=lambda e: (e[0], (INDEX_ENTRY.unpack(e[1])[-1] >> 12) & 3))
+    parts = [b"DIRC", struct.pack(">II", version, len(entries))]
+    previous = b""
+    for name, entry, extended in entries:
+        body = entry + extended
+        if version == 4:
+            common = len(os.path.commonprefix([previous, name]))
+            body += encode_varint(len(previous) - common) + name[common:] + b"\0"
+        else:
+            body += name
+            body += b"\0" * (8 - len(body) % 8)
+        parts.append(body)
+        previous = name
+    data = b"".join(parts)
+    return data + hashlib.sha1(data).digest()
+
+
+def intend_to_add(research_root, paths):
+    """
+    Record the files among paths that git does not track yet as
+    intent-to-add entries in the index, so `git commit --only` accepts
+    them. Returns False when the index cannot be edited here and the
+    caller must `git add` instead.
+    """
+    found = find_git_dir(research_root)
+    if found is None:
+        return False
+    top, git_dir = found
+    try:
+        if "objectformat" in (git_dir / "config").read_text(encoding="utf-8").lower():
+            return False
+        parsed = read_index((git_dir / "index").read_bytes())
+    except OSError:
+        return False
+    if parsed is None:
+        return False
+    version, entries = parsed
+
+    tracked = {name for name, _, _ in entries}
+    added = []
+    for rel in paths:
+        path = research_root / rel
+        name = os.path.relpath(path, top).replace(os.sep, "/").encode("utf-8")
+        if name in tracked:
+            continue
+        if name.startswith(b"..") or path.is_symlink() or not path.is_file():
+            return False  # directories and other pathspecs are left to git add
+        mode = 0o100755 if os.access(path, os.X_OK) else 0o100644
+        entry = INDEX_ENTRY.pack(0, 0, 0, 0, 0, 0, mode, 0, 0, 0, EMPTY_BLOB,
+                                 FLAG_EXTENDED | min(len(name), NAME_MASK))
+        added.append((name, entry, struct.pack(">H", FLAG_INTENT_TO_ADD)))
+        tracked.add(name)
+    if not added:
+        return True
+
+    # Take the index lock the way git does, then rename the new index in
+    lock_path = git_dir / "index.lock"
+    try:
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(write_index(max(version, 3), entries + added))
+        os.replace(lock_path, git_dir / "index")
+    except BaseException:
+        os.unlink(lock_path)
+        raise
+    return True
+
+
+def rel_paths(research_root, paths):
+    """Paths relative to the notes root, deduplicated, in order."""
+    seen = {}
+    for path in paths:
+        seen.setdefault(os.path.relpath(path, research_root), None)
+    return list(seen)
+
+
+def message(prefix, summaries, override=None):
+    """One subject line with the prefix; the batch summaries as the body."""
+    if override:
+        subject = override
+    elif len(summaries) == 1:
+        subject = summaries[0]
+    else:
+        subject = f"{len(summaries)} changes"
+    subject = f"{prefix} {subject}" if prefix else subject
+
+    if len(summaries) < 2:
+        return subject
+    body = [f"- {summary}" for summary in summaries[:MAX_BODY_LINES]]
+    if len(summaries) > MAX_BODY_LINES:
+        body.append(f"- ... and {len(summaries) - MAX_BODY_LINES} more")
+    return subject + "\n\n" + "\n".join(body)
+
+
+def run_commit(research_root, config, entries, override=None):
+    """
+    Commit the paths of queued entries in one commit.
+
+    Returns (committed, error); error is None on success.
+    """
+    paths, new, summaries = [], [], []
+    for entry in entries:
+        paths.extend(entry["paths"])
+        new.extend(entry.get("new", []))
+        summaries.append(entry["summary"])
+    paths = list(dict.fromkeys(paths + new))
+
+    pathspec = "\0".join(paths)
+    if not intend_to_add(research_root, paths):
+        result = git(research_root, "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul", stdin=pathspec)
+        if result.returncode != 0:
+            return False, result.stderr.strip()
+
+    prefix = config.get("commit_message_prefix", DEFAULT_PREFIX)
+    result = git(research_root, "commit", "-q", "--only", "-m", message(prefix, summaries, override),
+                 "--pathspec-from-file=-", "--pathspec-file-nul", stdin=pathspec)
+    if result.returncode != 0:
+        output = (result.stdout + result.stderr).strip()
+        if "nothing to commit" in output or "no changes added" in output:
+            return False, None
+        return False, output
+
+    if config.get("auto_push"):
+        result = git(research_root, "push", "-q", config.get("remote", DEFAULT_REMOTE), "HEAD")
+        if result.returncode != 0:
+            return True, f"push failed: {result.stderr.strip()}"
+    return True, None
+
+
+def pending_lock(research_root):
+    """Open and lock the pending queue; the caller closes the returned file."""
+    f = open(research_root / PENDING_FILE, 'a+', encoding="utf-8")
+    fcntl.flock(f, fcntl.LOCK_EX)
+    f.seek(0)
+    return f
+
+
+def read_pending(f):
+    entries = []
+    for line in f:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def commit(research_root, paths, summary, new=()):
+    """
+    Commit the paths a batch wrote, if auto_commit is enabled.
+
+    `paths` are notes the batch changed and `new` the notes it created;
+    both are staged and committed the same way. Within a commit window
+    the batch is queued instead. Problems are reported as warnings, never
+    raised: a failed commit must not fail the batch that already wrote
+    its notes.
+    """
+    config = git_config(research_root)
+    if not config.get("auto_commit"):
+        return
+
+    entry = {
+        "time": time.time(),
+        "summary": summary,
+        "paths": rel_paths(research_root, paths),
+        "new": rel_paths(research_root, new),
+    }
+
+    window = config.get("commit_window") or 0
+    if window <= 0:
+        _, error = run_commit(research_root, config, [entry])
+    else:
+        with pending_lock(research_root) as f:
+            entries = read_pending(f) + [entry]
+            if entry["time"] - entries[0]["time"] < window:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                return
+            _, error = run_commit(research_root, config, entries)
+            if error is None or error.startswith("push failed"):
+                f.truncate(0)
+            else:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    if error:
+        print(f"⚠️  git auto-commit: {error}")
+
+
+def flush_due(research_root):
+    """
+    Commit queued batches once the commit window since the oldest has
+    passed. Called periodically by notes_daemon.py, so a last batch does
+    not wait for the next one. Returns True if a commit was made.
+    """
+    config = git_config(research_root)
+    window = config.get("commit_window") or 0
+    if not config.get("auto_commit") or window <= 0:
+        return False
+    try:
+        if not (research_root / PENDING_FILE).stat().st_size:
+            return False
+    except OSError:
+        return False
+
+    with pending_lock(research_root) as f:
+        entries = read_pending(f)
+        if not entries or time.time() - entries[0]["time"] < window:
+            return False
+        committed, error = run_commit(research_root, config, entries)
+        if error is None or error.startswith("push failed"):
+            f.truncate(0)
+
+    if error:
+        print(f"⚠️  git auto-commit: {error}")
+    return committed
+
+
+def init(research_root):
+    """Make the notes root a git repository and commit its current state."""
+    if not research_root.exists():
+        print(f"Error: {research_root} does not exist. Run init.py first.")
+        sys.exit(1)
+
+    if git(research_root, "rev-parse", "--is-inside-work-tree").returncode != 0:
+        result = git(research_root, "init", "-q")
+        if result.returncode != 0:
+            print(f"Error: git init failed: {result.stderr.strip()}")
+            sys.exit(1)
+        print(f"✓ Initialized git repository in {research_root}")
+
+    gitignore = research_root / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text(GITIGNORE, encoding="utf-8")
+
+    config = git_config(research_root)
+    prefix = config.get("commit_message_prefix", DEFAULT_PREFIX)
+    git(research_root, "add", "-A", ".")
+    result = git(research_root, "commit", "-q", "-m", message(prefix, ["Initialize research notes"]), "--", ".")
+    if result.returncode == 0:
+        print("✓ Committed research notes")
+    elif "nothing to commit" not in result.stdout + result.stderr:
+        print(f"Error: git commit failed: {(result.stdout + result.stderr).strip()}")
+        sys.exit(1)
+
+    if not config.get("auto_commit"):
+        print("\nEnable auto-commit with `git: auto_commit: true` in config.yaml")
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("init", "commit", "status"):
+        print("Usage: python3 autocommit.py init")
+        print("       python3 autocommit.py commit [--all] [--message <message>]")
+        print("       python3 autocommit.py status")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "init":
+        init(research_root)
+        return
+
+    manual = command == "commit" and "--all" in sys.argv
+    if not manual and not (research_root / PENDING_FILE).exists():
+        print("No pending changes")
+        return
+
+    with pending_lock(research_root) as f:
+        entries = read_pending(f)
+        if manual:
+            # Hand edits: stage everything under the notes root
+            entries.append({"time": time.time(), "summary": "Update notes", "paths": ["."], "new": ["."]})
+        if not entries:
+            print("No pending changes")
+            return
+
+        if command == "status":
+            age = time.time() - entries[0]["time"]
+            window = git_config(research_root).get("commit_window") or 0
+            print(f"Pending batches: {len(entries)} (oldest {age:.0f}s ago, window {window}s)")
+            for entry in entries[-20:]:
+                print(f"  {entry['summary']}")
+            return
+
+        override = None
+        for i, arg in enumerate(sys.argv):
+            if arg == "--message" and i + 1 < len(sys.argv):
+                override = sys.argv[i + 1]
+
+        committed, error = run_commit(research_root, git_config(research_root), entries, override)
+        if error is None or error.startswith("push failed"):
+            f.truncate(0)
+        if error:
+            print(f"Error: {error}")
+            sys.exit(1)
+
+    print(f"✓ Committed {len(entries)} change sets" if committed else "✓ Nothing to commit")
+
+
+if __name__ == "__main__":
+    main()
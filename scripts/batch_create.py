@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Create many projects, ideas and experiments from a manifest.
+
+The manifest is read from a file or from stdin (`-`), either as nested
+YAML:
+
+    projects:
+      - title: 3D Neural Rendering
+        type: academic
+        tags: [nerf]
+        ideas:
+          - title: Depth Prior
+            priority: high
+            experiments:
+              - lr-1e-3
+              - title: lr-1e-4
+
+or as flat records, one JSON object per line (JSONL) or a YAML list:
+
+    {"kind": "project", "title": "3D Neural Rendering", "type": "academic"}
+    {"kind": "idea", "project": "3D Neural Rendering", "title": "Depth Prior"}
+    {"kind": "experiment", "project": "3D Neural Rendering", "idea": "Depth Prior", "title": "lr-1e-3"}
+
+Projects and ideas that already exist are reused as parents; experiments
+that already exist are skipped. Every target is resolved once, all notes
+are rendered with the same templates as the create_* scripts, and the
+catalog, resolver cache and index.md/tags.md are updated once at the end.
+
+Usage:
+    python3 batch_create.py <manifest|-> [--format yaml|jsonl]
+"""
+
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+
+import autocommit
+import catalog
+import create_experiment
+import create_idea
+import create_project
+import locator
+import notewriter
+import resolver
+import update_index
+
+
+def parse_manifest(text, fmt=None):
+    """Parse manifest text into a list of flat records."""
+    if fmt is None:
+        first = text.lstrip()[:1]
+        fmt = "jsonl" if first == "{" else "yaml"
+
+    if fmt == "jsonl":
+        records = []
+        for number, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"line {number}: {e}")
+        return records
+
+    import yaml
+    data = yaml.safe_load(text) or []
+    if isinstance(data, dict):
+        data = data.get("projects") or []
+    if not isinstance(data, list):
+        raise ValueError("manifest must be a list of records or a `projects:` list")
+    return flatten(data)
+
+
+def as_record(item):
+    """Accept a bare title string in place of a record."""
+    return {"title": item} if isinstance(item, str) else dict(item)
+
+
+def flatten(items):
+    """Expand nested project -> ideas -> experiments entries into flat records."""
+    records = []
+    for item in items:
+        item = as_record(item)
+        if "kind" in item:
+            records.append(item)
+            continue
+
+        ideas = item.pop("ideas", None) or []
+        records.append(dict(item, kind="project"))
+        for idea in ideas:
+            idea = as_record(idea)
+            experiments = idea.pop("experiments", None) or []
+            records.append(dict(idea, kind="idea", project=item.get("title")))
+            for experiment in experiments:
+                records.append(dict(as_record(experiment), kind="experiment",
+                                    project=item.get("title"), idea=idea.get("title")))
+    return records
+
+
+def parse_tags(tags):
+    """Accept tags as a list or a comma-separated string."""
+    if isinstance(tags, str):
+        return [t.strip() for t in tags.split(",") if t.strip()]
+    return [str(t) for t in tags or []]
+
+
+class Batch:
+    """Creates notes for manifest records, resolving each target only once."""
+
+    def __init__(self, research_root, conn):
+        self.research_root = research_root
+        self.projects_dir = research_root / "projects"
+        self.conn = conn
+        self.now = datetime.now().isoformat()
+        self.projects = {}
+        self.ideas = {}
+        self.created = {"project": [], "idea": [], "experiment": []}
+        self.skipped = 0
+        self.touched = set()
+        self.errors = []
+
+    def project(self, title):
+        """Return the directory of a project, or None."""
+        key = title.casefold()
+        if key not in self.projects:
+            self.projects[key] = resolver.resolve_project(self.research_root, title, self.conn)
+        return self.projects[key]
+
+    def idea(self, project_dir, title):
+        """Return the directory of an idea, or None."""
+        key = (project_dir, title.casefold())
+        if key not in self.ideas:
+            self.ideas[key] = resolver.resolve_idea(self.research_root, project_dir, title, self.conn)
+        return self.ideas[key]
+
+    def add(self, record):
+        """Create the note for one record."""
+        kind = record.get("kind")
+        title = record.get("title")
+        if not title:
+            raise ValueError("missing title")
+        title = str(title)
+
+        if kind == "project":
+            self.add_project(record, title)
+        elif kind == "idea":
+            self.add_idea(record, title)
+        elif kind == "experiment":
+            self.add_experiment(record, title)
+        else:
+            raise ValueError(f"unknown kind '{kind}'")
+
+    def add_project(self, record, title):
+        if self.project(title):
+            return
+
+        project_type = record.get("type", "academic")
+        if project_type not in create_project.VALID_TYPES:
+            raise ValueError(f"invalid type '{project_type}'")
+
+        project_dir = self.projects_dir / create_project.slugify(title)
+        if project_dir.exists():
+            raise ValueError(f"directory {project_dir.name} already exists")
+
+        files = create_project.project_files(self.research_root, title, project_type, parse_tags(record.get("tags")), self.now)
+        create_project.write_project(project_dir, files)
+        resolver.remember_project(self.research_root, project_dir, title, save=False)
+        self.projects[title.casefold()] = project_dir
+        self.created["project"].append(project_dir)
+        self.touched.add(project_dir)
+
+    def parent_project(self, record):
+        name = record.get("project")
+        project_dir = self.project(str(name)) if name else None
+        if not project_dir:
+            raise ValueError(f"project '{name}' not found")
+        return str(name), project_dir
+
+    def add_idea(self, record, title):
+        project_name, project_dir = self.parent_project(record)
+        if self.idea(project_dir, title):
+            return
+
+        priority = record.get("priority", "medium")
+        if priority not in create_idea.VALID_PRIORITIES:
+            raise ValueError(f"invalid priority '{priority}'")
+
+        idea_dir = project_dir / "ideas" / create_idea.slugify(title)
+        if idea_dir.exists():
+            raise ValueError(f"directory {idea_dir.name} already exists")
+
+        files = create_idea.idea_files(self.research_root, title, project_name, priority, parse_tags(record.get("tags")), self.now)
+        create_idea.write_idea(idea_dir, files)
+        resolver.remember_idea(self.research_root, idea_dir, title, save=False)
+        self.ideas[(project_dir, title.casefold())] = idea_dir
+        self.created["idea"].append(idea_dir)
+        self.touched.add(project_dir)
+
+    def add_experiment(self, record, title):
+        project_name, project_dir = self.parent_project(record)
+        idea_title = record.get("idea")
+        idea_dir = self.idea(project_dir, str(idea_title)) if idea_title else None
+        if not idea_dir:
+            raise ValueError(f"idea '{idea_title}' not found in project '{project_name}'")
+
+        experiment_dir = idea_dir / "experiments" / create_experiment.slugify(title)
+        if experiment_dir.exists():
+            self.skipped += 1
+            return
+
+        files = create_experiment.experiment_files(self.research_root, title, str(idea_title), project_name, self.now)
+        create_experiment.write_experiment(experiment_dir, files)
+        self.created["experiment"].append(experiment_dir)
+        self.touched.add(project_dir)
+
+    def finish(self):
+        """Write the project timestamps, caches, catalog and index once."""
+        # Existing projects that received new ideas
+        updated = {idea_dir.parent.parent for idea_dir in self.created["idea"]}
+        updated.difference_update(self.created["project"])
+        with notewriter.Batch() as batch:
+            for project_dir in updated:
+                create_idea.touch_project(project_dir, self.now, batch)
+
+        resolver.save_cache(self.research_root)
+
+        if self.conn:
+            for project_dir in self.created["project"] + sorted(updated):
+                catalog.upsert_project(self.conn, self.research_root, project_dir)
+            for idea_dir in self.created["idea"]:
+                catalog.upsert_idea(self.conn, self.research_root, idea_dir)
+            for experiment_dir in self.created["experiment"]:
+                catalog.upsert_experiment(self.conn, self.research_root, experiment_dir)
+
+        written = []
+        if self.touched:
+            written = update_index.update_index(self.research_root, sorted(self.touched), self.conn)
+
+        created = [path for paths in self.created.values() for path in paths]
+        if created:
+            counts = ", ".join(f"{len(paths)} {kind}s" for kind, paths in self.created.items() if paths)
+            autocommit.commit(self.research_root,
+                              [project_dir / "project.md" for project_dir in sorted(updated)]
+                              + [self.research_root / name for name in written],
+                              f"Batch create {counts}", new=created)
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 batch_create.py <manifest|-> [--format yaml|jsonl]")
+        print("\nManifest: nested YAML (projects -> ideas -> experiments) or JSONL records")
+        print("Use - to read the manifest from stdin")
+        sys.exit(1)
+
+    source = sys.argv[1]
+
+    fmt = None
+    for i, arg in enumerate(sys.argv):
+        if arg == "--format" and i + 1 < len(sys.argv):
+            fmt = sys.argv[i + 1]
+    if fmt is None and source.endswith(".jsonl"):
+        fmt = "jsonl"
+    if fmt not in (None, "yaml", "jsonl"):
+        print(f"Error: Invalid format '{fmt}'. Valid formats: yaml, jsonl")
+        sys.exit(1)
+
+    if not (research_root / "projects").exists():
+        print("No projects directory found. Run init.py first.")
+        sys.exit(1)
+
+    try:
+        if source == "-":
+            text = sys.stdin.read()
+        else:
+            text = Path(source).read_text(encoding="utf-8")
+        records = parse_manifest(text, fmt)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read manifest: {e}")
+        sys.exit(1)
+
+    conn = catalog.open_catalog(research_root)
+    batch = Batch(research_root, conn)
+
+    for number, record in enumerate(records, 1):
+        try:
+            batch.add(record)
+        except (ValueError, AttributeError, TypeError) as e:
+            batch.errors.append(f"record {number}: {e}")
+
+    batch.finish()
+    catalog.close_catalog(conn, research_root)
+
+    print(f"✓ Batch complete")
+    print(f"\nProjects created: {len(batch.created['project'])}")
+    print(f"Ideas created: {len(batch.created['idea'])}")
+    print(f"Experiments created: {len(batch.created['experiment'])}")
+    if batch.skipped:
+        print(f"Experiments skipped (already exist): {batch.skipped}")
+
+    if batch.errors:
+        print(f"\n⚠️  {len(batch.errors)} records failed:")
+        for error in batch.errors[:20]:
+            print(f"  {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
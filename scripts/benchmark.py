@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Benchmarks on synthetic research notes corpora.
+
+`generate` writes a workspace of projects x ideas x experiments with the
+same note files, templates and directories as the create_* scripts, the
+experiment notes padded with filler text to about --note-size bytes and
+results.md holding a metrics table. About 1% of experiments mention the
+word "needle", the query the search benchmarks use.
+
+`run` times the CLI scripts against a workspace, each in a fresh process
+as a user would run them, `--repeat` times (cold runs delete the cache
+they rebuild first). The notes daemon is bypassed. `suite` generates the
+standard 1k, 10k and 100k note corpora (reusing ones generated before)
+and runs every benchmark on each. Results are written as JSON; `compare`
+reports the median change per benchmark between two result files and
+exits 1 when one slowed down by more than --threshold percent.
+
+Usage:
+    python3 benchmark.py generate <dir> [--projects <n>] [--ideas <n>] [--experiments <n>]
+                                        [--note-size <bytes>] [--seed <n>]
+    python3 benchmark.py run <dir> [--repeat <n>] [--output <file.json>]
+    python3 benchmark.py suite [--dir <dir>] [--sizes 1k,10k,100k] [--repeat <n>] [--output <file.json>]
+    python3 benchmark.py compare <baseline.json> <current.json> [--threshold <percent>]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import create_experiment
+import create_idea
+import create_project
+import resolver
+import search_index
+import update_index
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+CORPUS_FILE = ".benchmark-corpus.json"
+SEARCH_TERM = "needle"
+NEEDLE_RATE = 0.01
+DEFAULT_NOTE_SIZE = 2048
+DEFAULT_THRESHOLD = 10.0
+
+# Preset -> (projects, ideas per project, experiments per idea); notes
+# counts project, idea and experiment directories
+SIZES = {
+    "1k": (10, 10, 9),
+    "10k": (20, 25, 19),
+    "100k": (50, 50, 39),
+}
+
+TAGS = ["nerf", "3d-vision", "optimization", "diffusion", "robotics", "nlp", "rl", "graphs"]
+PRIORITIES = ["low", "medium", "high"]
+METRICS = ["accuracy", "loss", "psnr", "ssim", "latency_ms"]
+
+
+def vocabulary(rng, size=2000):
+    """Pseudo-words with a skewed frequency, like natural text."""
+    syllables = ["ka", "to", "ri", "men", "sa", "lo", "vi", "der", "ne", "pu", "shi", "ta", "mo", "ren"]
+    words = sorted({"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)})
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def filler(rng, words, weights, size, needle=False):
+    """About `size` bytes of paragraphs of vocabulary words."""
+    paragraphs = []
+    total = 0
+    while total < size:
+        paragraph = " ".join(rng.choices(words, weights, k=60)).capitalize() + "."
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    if needle:
+        paragraphs.insert(rng.randrange(len(paragraphs) + 1), f"Found the {SEARCH_TERM} in this run.")
+    return "\n\n".join(paragraphs) + "\n"
+
+
+def results_table(rng):
+    rows = "\n".join(f"| {metric} | {rng.uniform(0, 100):.4f} |" for metric in METRICS)
+    return f"## Metrics\n\n| Metric | Value |\n|--------|-------|\n{rows}\n"
+
+
+def generate(research_root, projects, ideas, experiments, note_size=DEFAULT_NOTE_SIZE, seed=0):
+    """Write a synthetic workspace. Returns its corpus description."""
+    rng = random.Random(seed)
+    words, weights = vocabulary(rng)
+    projects_dir = research_root / "projects"
+    projects_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now().isoformat()
+    start = time.perf_counter()
+    total_bytes = 0
+
+    for p in range(projects):
+        project_title = f"Project {p:03d}"
+        files = create_project.project_files(research_root, project_title, "academic",
+                                             rng.sample(TAGS, 2), now)
+        project_dir = projects_dir / create_project.slugify(project_title)
+        create_project.write_project(project_dir, files)
+        total_bytes += sum(len(content) for content in files.values())
+
+        for i in range(ideas):
+            idea_title = f"Idea {p:03d}-{i:03d}"
+            files = create_idea.idea_files(research_root, idea_title, project_title, rng.choice(PRIORITIES),
+                                           rng.sample(TAGS, 2), now)
+            idea_dir = project_dir / "ideas" / create_idea.slugify(idea_title)
+            create_idea.write_idea(idea_dir, files)
+            total_bytes += sum(len(content) for content in files.values())
+
+            for e in range(experiments):
+                experiment_title = f"exp-{e:03d}"
+                files = create_experiment.experiment_files(research_root, experiment_title, idea_title,
+                                                           project_title, now)
+                body = filler(rng, words, weights, note_size, rng.random() < NEEDLE_RATE)
+                files["experiment.md"] += "\n## Notes\n\n" + body
+                files["results.md"] = files["results.md"].replace(
+                    "## Metrics\n\n| Metric | Value |\n|--------|-------|\n|        |       |\n", results_table(rng))
+                create_experiment.write_experiment(idea_dir / "experiments" / experiment_title, files)
+                total_bytes += sum(len(content) for content in files.values())
+
+    update_index.update_index(research_root)
+
+    corpus = {
+        "projects": projects,
+        "ideas": projects * ideas,
+        "experiments": projects * ideas * experiments,
+        "notes": projects * (1 + ideas * (1 + experiments)),
+        "note_size": note_size,
+        "seed": seed,
+        "bytes": total_bytes,
+        "generate_seconds": round(time.perf_counter() - start, 3),
+    }
+    (research_root / CORPUS_FILE).write_text(json.dumps(corpus, indent=2) + "\n", encoding="utf-8")
+    return corpus
+
+
+def load_corpus(research_root):
+    try:
+        return json.loads((research_root / CORPUS_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def benchmarks():
+    """Benchmark name -> (script args, cache paths removed before each run)."""
+    project = "Project 000"
+    idea = "Idea 000-000"
+    experiment = "exp-000"
+    return {
+        "list-projects": (["list_projects.py"], []),
+        "search-cold": (["search.py", SEARCH_TERM], [search_index.INDEX_DIR, search_index.LEGACY_INDEX_FILE]),
+        "search": (["search.py", SEARCH_TERM], []),
+        "search-ranked": (["search.py", SEARCH_TERM, "--top", "10"], []),
+        "search-scan": (["search.py", SEARCH_TERM, "--no-index"], []),
+        "resolve-cold": (["artifacts.py", "list", project, idea, experiment], [resolver.CACHE_FILE]),
+        "resolve": (["artifacts.py", "list", project, idea, experiment], []),
+        "index-rebuild": (["update_index.py"], [update_index.CACHE_FILE]),
+    }
+
+
+def remove(path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def time_script(research_root, args, caches, repeat):
+    """Wall times in seconds of running a script `repeat` times."""
+    import subprocess
+
+    env = dict(os.environ, RESEARCH_NOTES_ROOT=str(research_root), RESEARCH_NOTES_NO_DAEMON="1")
+    argv = [sys.executable, str(SCRIPTS_DIR / args[0])] + args[1:]
+    runs = []
+    for _ in range(repeat):
+        for cache in caches:
+            remove(research_root / cache)
+        start = time.perf_counter()
+        result = subprocess.run(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        runs.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} exited with {result.returncode}: {result.stderr.strip()}")
+    return runs
+
+
+def run(research_root, repeat, name=None):
+    """Run every benchmark on a workspace. Returns its result entry."""
+    corpus = load_corpus(research_root)
+    if corpus is None:
+        raise RuntimeError(f"{research_root} has no {CORPUS_FILE}; generate it first")
+
+    results = {}
+    for bench, (args, caches) in benchmarks().items():
+        runs = time_script(research_root, args, caches, repeat)
+        results[bench] = {
+            "runs": [round(t, 4) for t in runs],
+            "min": round(min(runs), 4),
+            "median": round(statistics.median(runs), 4),
+        }
+        print(f"  {bench:<16}{results[bench]['median'] * 1000:10.1f} ms  (min {results[bench]['min'] * 1000:.1f} ms)")
+    return {"name": name or research_root.parent.name, "corpus": corpus, "results": results}
+
+
+def version():
+    """The git commit of the scripts, if they are in a repository."""
+    import subprocess
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=SCRIPTS_DIR,
+                               capture_output=True, text=True)
+    except OSError:
+        return None
+    if commit.returncode != 0:
+        return None
+    return {"commit": commit.stdout.strip(), "dirty": bool(dirty.stdout.strip())}
+
+
+def report(entries, repeat):
+    return {
+        "version": version(),
+        "time": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "corpora": entries,
+    }
+
+
+def write_report(data, output):
+    content = json.dumps(data, indent=2) + "\n"
+    if output:
+        Path(output).write_text(content, encoding="utf-8")
+        print(f"\n✓ Results written to {output}")
+    else:
+        print()
+        print(content, end="")
+
+
+def compare(baseline, current, threshold):
+    """Print median changes. Returns the number of regressions."""
+    old = {(c["name"], bench): r["median"] for c in baseline["corpora"] for bench, r in c["results"].items()}
+    regressions = 0
+    print(f"{'Corpus':<8}{'Benchmark':<18}{'Baseline':>12}{'Current':>12}{'Change':>10}")
+    for corpus in current["corpora"]:
+        for bench, result in corpus["results"].items():
+            before = old.get((corpus["name"], bench))
+            if before is None:
+                continue
+            change = (result["median"] - before) / before * 100 if before else 0.0
+            flag = ""
+            if change > threshold:
+                regressions += 1
+                flag = "  ⚠️  regression"
+            print(f"{corpus['name']:<8}{bench:<18}{before * 1000:10.1f}ms{result['median'] * 1000:10.1f}ms"
+                  f"{change:+9.1f}%{flag}")
+    return regressions
+
+
+def option(name, default=None, convert=str):
+    for i, arg in enumerate(sys.argv):
+        if arg == name and i + 1 < len(sys.argv):
+            try:
+                return convert(sys.argv[i + 1])
+            except ValueError:
+                print(f"Error: Invalid {name} value '{sys.argv[i + 1]}'")
+                sys.exit(1)
+    return default
+
+
+def print_usage():
+    print("Usage: python3 benchmark.py generate <dir> [--projects <n>] [--ideas <n>] [--experiments <n>]")
+    print("                                          [--note-size <bytes>] [--seed <n>]")
+    print("       python3 benchmark.py run <dir> [--repeat <n>] [--output <file.json>]")
+    print("       python3 benchmark.py suite [--dir <dir>] [--sizes 1k,10k,100k] [--repeat <n>] [--output <file.json>]")
+    print("       python3 benchmark.py compare <baseline.json> <current.json> [--threshold <percent>]")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("generate", "run", "suite", "compare"):
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+    repeat = max(1, option("--repeat", 3, int))
+    output = option("--output")
+
+    if command == "compare":
+        if len(sys.argv) < 4:
+            print_usage()
+            sys.exit(1)
+        try:
+            baseline, current = (json.loads(Path(p).read_text(encoding="utf-8")) for p in sys.argv[2:4])
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read results: {e}")
+            sys.exit(1)
+        if compare(baseline, current, option("--threshold", DEFAULT_THRESHOLD, float)):
+            sys.exit(1)
+        return
+
+    if command in ("generate", "run"):
+        if len(sys.argv) < 3 or sys.argv[2].startswith("--"):
+            print_usage()
+            sys.exit(1)
+        research_root = Path(sys.argv[2]).resolve() / "research-notes"
+
+    if command == "generate":
+        if (research_root / "projects").exists():
+            print(f"Error: {research_root} already has projects")
+            sys.exit(1)
+        corpus = generate(research_root, option("--projects", 10, int), option("--ideas", 10, int),
+                          option("--experiments", 9, int), option("--note-size", DEFAULT_NOTE_SIZE, int),
+                          option("--seed", 0, int))
+        print(f"✓ Generated {corpus['notes']} notes ({corpus['bytes'] / 1e6:.1f} MB) "
+              f"in {corpus['generate_seconds']:.1f}s at {research_root}")
+        return
+
+    try:
+        if command == "run":
+            print(f"{research_root}:")
+            entries = [run(research_root, repeat)]
+        else:
+            base = Path(option("--dir", str(Path(tempfile.gettempdir()) / "research-notes-benchmark")))
+            sizes = option("--sizes", ",".join(SIZES)).split(",")
+            unknown = [size for size in sizes if size not in SIZES]
+            if unknown:
+                print(f"Error: Unknown sizes {', '.join(unknown)}. Sizes: {', '.join(SIZES)}")
+                sys.exit(1)
+
+            note_size = option("--note-size", DEFAULT_NOTE_SIZE, int)
+            entries = []
+            for size in sizes:
+                research_root = base / size / "research-notes"
+                projects, ideas, experiments = SIZES[size]
+                corpus = load_corpus(research_root)
+                wanted = (projects, projects * ideas, projects * ideas * experiments, note_size)
+                if not corpus or (corpus["projects"], corpus["ideas"], corpus["experiments"],
+                                  corpus["note_size"]) != wanted:
+                    if research_root.exists():
+                        shutil.rmtree(research_root)
+                    print(f"Generating {size} corpus...")
+                    generate(research_root, projects, ideas, experiments, note_size)
+                print(f"{size} ({research_root}):")
+                entries.append(run(research_root, repeat, size))
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    write_report(report(entries, repeat), output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+SQLite metadata catalog for research notes.
+
+Backs the `database` section of config.yaml. When `database.enabled` is
+true, the create_*/update_validation scripts keep the catalog in sync and
+list_projects.py, search.py and the title lookups query it instead of
+walking and parsing the notes tree.
+
+Opening the catalog only stats projects/ and each project's ideas/
+directory; when one of them changed (a note directory was added or
+removed by hand) the tree is synced, re-parsing only notes whose mtime
+or size changed. Hand edits to existing notes are picked up by
+`catalog.py --sync`, by update_index.py and by a running notes_daemon.py.
+
+Usage:
+    python3 catalog.py [--sync] [--rebuild] [--query <sql>]
+"""
+
+import sys
+import os
+import json
+import time
+from pathlib import Path
+
+import frontmatter
+import locator
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    title TEXT,
+    title_key TEXT,
+    type TEXT,
+    status TEXT,
+    priority TEXT,
+    tags TEXT,
+    created TEXT,
+    updated TEXT,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS projects_title_key ON projects (title_key);
+CREATE INDEX IF NOT EXISTS projects_status ON projects (status);
+
+CREATE TABLE IF NOT EXISTS ideas (
+    path TEXT PRIMARY KEY,
+    project_path TEXT,
+    title TEXT,
+    title_key TEXT,
+    status TEXT,
+    priority TEXT,
+    tags TEXT,
+    created TEXT,
+    updated TEXT,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS ideas_project_title ON ideas (project_path, title_key);
+CREATE INDEX IF NOT EXISTS ideas_status ON ideas (status);
+
+CREATE TABLE IF NOT EXISTS experiments (
+    path TEXT PRIMARY KEY,
+    project_path TEXT,
+    idea_path TEXT,
+    title TEXT,
+    title_key TEXT,
+    status TEXT,
+    tags TEXT,
+    created TEXT,
+    updated TEXT,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS experiments_idea_title ON experiments (idea_path, title_key);
+CREATE INDEX IF NOT EXISTS experiments_project ON experiments (project_path);
+
+CREATE TABLE IF NOT EXISTS validations (
+    idea_path TEXT PRIMARY KEY,
+    status TEXT,
+    validated TEXT,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS validations_status ON validations (status);
+
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT,
+    tag TEXT,
+    PRIMARY KEY (path, tag)
+);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+
+CREATE TABLE IF NOT EXISTS catalog_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def load_config(research_root):
+    """Load config.yaml, or return an empty config."""
+    return locator.load_config(research_root)
+
+
+def open_catalog(research_root, config=None, refresh=True):
+    """
+    Open the catalog if `database.enabled` is set in config.yaml.
+
+    Returns a sqlite3 connection, or None when the catalog is disabled.
+    Unless refresh is False, a new catalog, or one whose projects/ and
+    ideas/ directories changed since the last sync, is synced with the
+    notes tree first.
+    """
+    if config is None:
+        config = load_config(research_root)
+
+    database = config.get("database") or {}
+    if not database.get("enabled", False):
+        return None
+
+    import sqlite3
+
+    db_path = research_root / database.get("path", ".research-notes.db")
+    is_new = not db_path.exists()
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+
+    if refresh and (is_new or tree_mtimes(research_root) != stored_tree_mtimes(conn)):
+        sync(conn, research_root)
+        conn.commit()
+
+    return conn
+
+
+def close_catalog(conn, research_root, config=None):
+    """Commit, back up if due, and close the catalog."""
+    if conn is None:
+        return
+
+    conn.commit()
+
+    if config is None:
+        config = load_config(research_root)
+    database = config.get("database") or {}
+    if database.get("auto_backup", False):
+        backup_if_due(conn, research_root, database)
+
+    conn.close()
+
+
+def backup_if_due(conn, research_root, database):
+    """Copy the catalog to <path>.bak once every `backup_interval` seconds."""
+    row = conn.execute("SELECT value FROM catalog_info WHERE key = 'last_backup'").fetchone()
+    last_backup = float(row["value"]) if row else 0.0
+    now = time.time()
+
+    if now - last_backup < database.get("backup_interval", 3600):
+        return
+
+    conn.execute(
+        "INSERT OR REPLACE INTO catalog_info (key, value) VALUES ('last_backup', ?)",
+        (str(now),)
+    )
+    conn.commit()
+
+    import sqlite3
+
+    db_path = research_root / database.get("path", ".research-notes.db")
+    backup = sqlite3.connect(db_path.with_name(db_path.name + ".bak"))
+    with backup:
+        conn.backup(backup)
+    backup.close()
+
+
+def rel_path(research_root, path):
+    """Return a path relative to the research root, as stored in the catalog."""
+    return Path(path).relative_to(research_root).as_posix()
+
+
+def set_tags(conn, rel, tags):
+    """Replace the tag rows of a note."""
+    conn.execute("DELETE FROM tags WHERE path = ?", (rel,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO tags (path, tag) VALUES (?, ?)",
+        [(rel, tag) for tag in tags or []]
+    )
+
+
+def upsert_project(conn, research_root, project_dir):
+    """Insert or update a project row from its project.md."""
+    project_md = project_dir / "project.md"
+    stat = project_md.stat()
+    meta = frontmatter.read(project_md)
+    rel = rel_path(research_root, project_dir)
+    title = meta.get("title") or project_dir.name
+
+    conn.execute(
+        "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (rel, title, title.casefold(), meta.get("type"), meta.get("status"),
+         meta.get("priority"), json.dumps(meta.get("tags") or []),
+         meta.get("created"), meta.get("updated"), stat.st_mtime_ns, stat.st_size)
+    )
+    set_tags(conn, rel, meta.get("tags"))
+
+
+def upsert_idea(conn, research_root, idea_dir):
+    """Insert or update an idea row (and its validation row)."""
+    idea_md = idea_dir / "idea.md"
+    stat = idea_md.stat()
+    meta = frontmatter.read(idea_md)
+    rel = rel_path(research_root, idea_dir)
+    title = meta.get("title") or idea_dir.name
+
+    conn.execute(
+        "INSERT OR REPLACE INTO ideas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (rel, rel_path(research_root, idea_dir.parent.parent), title, title.casefold(),
+         meta.get("status"), meta.get("priority"), json.dumps(meta.get("tags") or []),
+         meta.get("created"), meta.get("updated"), stat.st_mtime_ns, stat.st_size)
+    )
+    set_tags(conn, rel, meta.get("tags"))
+
+    upsert_validation(conn, research_root, idea_dir)
+
+
+def upsert_validation(conn, research_root, idea_dir):
+    """Insert or update the validation record of an idea."""
+    validation_md = idea_dir / "validation.md"
+    rel = rel_path(research_root, idea_dir)
+
+    if not validation_md.exists():
+        conn.execute("DELETE FROM validations WHERE idea_path = ?", (rel,))
+        return
+
+    stat = validation_md.stat()
+    meta = frontmatter.read(validation_md)
+    conn.execute(
+        "INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?, ?)",
+        (rel, meta.get("status"), meta.get("validated"), stat.st_mtime_ns, stat.st_size)
+    )
+
+
+def upsert_experiment(conn, research_root, experiment_dir):
+    """Insert or update an experiment row from its experiment.md."""
+    experiment_md = experiment_dir / "experiment.md"
+    stat = experiment_md.stat()
+    meta = frontmatter.read(experiment_md)
+    rel = rel_path(research_root, experiment_dir)
+    idea_dir = experiment_dir.parent.parent
+    title = meta.get("title") or experiment_dir.name
+
+    conn.execute(
+        "INSERT OR REPLACE INTO experiments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (rel, rel_path(research_root, idea_dir.parent.parent), rel_path(research_root, idea_dir),
+         title, title.casefold(), meta.get("status"), json.dumps(meta.get("tags") or []),
+         meta.get("created"), meta.get("updated"), stat.st_mtime_ns, stat.st_size)
+    )
+    set_tags(conn, rel, meta.get("tags"))
+
+
+def tree_mtimes(research_root):
+    """
+    Return {directory: mtime_ns} for projects/ and every project's ideas/.
+
+    Notes created or removed by hand change one of these; the scripts
+    that write notes update their own rows as they write.
+    """
+    projects_dir = research_root / "projects"
+    try:
+        mtimes = {"projects": projects_dir.stat().st_mtime_ns}
+        entries = list(os.scandir(projects_dir))
+    except OSError:
+        return {}
+
+    for entry in entries:
+        try:
+            mtimes[entry.name] = os.stat(os.path.join(entry.path, "ideas")).st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+def stored_tree_mtimes(conn):
+    """Return the tree_mtimes() recorded by the last sync."""
+    row = conn.execute("SELECT value FROM catalog_info WHERE key = 'tree_mtimes'").fetchone()
+    return json.loads(row["value"]) if row else None
+
+
+def is_current(row, path):
+    """Return True if a catalog row still matches the file on disk."""
+    if row is None:
+        return False
+    stat = path.stat()
+    return row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size
+
+
+def sync(conn, research_root):
+    """
+    Bring the catalog in line with the notes tree.
+
+    Only notes whose mtime or size changed are re-parsed. Rows for notes
+    that no longer exist are removed. Returns the number of changed rows.
+    """
+    projects_dir = research_root / "projects"
+    conn.execute(
+        "INSERT OR REPLACE INTO catalog_info (key, value) VALUES ('tree_mtimes', ?)",
+        (json.dumps(tree_mtimes(research_root)),)
+    )
+    existing = {
+        table: {row["path"]: row for row in conn.execute(f"SELECT path, mtime_ns, size FROM {table}")}
+        for table in ("projects", "ideas", "experiments")
+    }
+    validations = {
+        row["idea_path"]: row
+        for row in conn.execute("SELECT idea_path, mtime_ns, size FROM validations")
+    }
+    seen = {"projects": set(), "ideas": set(), "experiments": set()}
+    changed = 0
+
+    if projects_dir.exists():
+        for project_dir in projects_dir.iterdir():
+            project_md = project_dir / "project.md"
+            if not project_dir.is_dir() or not project_md.exists():
+                continue
+
+            rel = rel_path(research_root, project_dir)
+            seen["projects"].add(rel)
+            if not is_current(existing["projects"].get(rel), project_md):
+                upsert_project(conn, research_root, project_dir)
+                changed += 1
+
+            ideas_dir = project_dir / "ideas"
+            if not ideas_dir.exists():
+                continue
+
+            for idea_dir in ideas_dir.iterdir():
+                idea_md = idea_dir / "idea.md"
+                if not idea_dir.is_dir() or not idea_md.exists():
+                    continue
+
+                rel = rel_path(research_root, idea_dir)
+                seen["ideas"].add(rel)
+                validation_md = idea_dir / "validation.md"
+                if not is_current(existing["ideas"].get(rel), idea_md):
+                    upsert_idea(conn, research_root, idea_dir)
+                    changed += 1
+                elif validation_md.exists() and not is_current(validations.get(rel), validation_md):
+                    upsert_validation(conn, research_root, idea_dir)
+                    changed += 1
+
+                experiments_dir = idea_dir / "experiments"
+                if not experiments_dir.exists():
+                    continue
+
+                for experiment_dir in experiments_dir.iterdir():
+                    experiment_md = experiment_dir / "experiment.md"
+                    if not experiment_dir.is_dir() or not experiment_md.exists():
+                        continue
+
+                    rel = rel_path(research_root, experiment_dir)
+                    seen["experiments"].add(rel)
+                    if not is_current(existing["experiments"].get(rel), experiment_md):
+                        upsert_experiment(conn, research_root, experiment_dir)
+                        changed += 1
+
+    for table, rows in existing.items():
+        for rel in rows:
+            if rel in seen[table]:
+                continue
+            conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM tags WHERE path = ?", (rel,))
+            if table == "ideas":
+                conn.execute("DELETE FROM validations WHERE idea_path = ?", (rel,))
+            changed += 1
+
+    return changed
+
+
+def find_project(conn, research_root, title):
+    """Return the directory of the project with the given title, or None."""
+    row = conn.execute(
+        "SELECT path FROM projects WHERE title_key = ? LIMIT 1",
+        (title.casefold(),)
+    ).fetchone()
+    return research_root / row["path"] if row else None
+
+
+def find_idea(conn, research_root, project_dir, title):
+    """Return the directory of the idea with the given title, or None."""
+    row = conn.execute(
+        "SELECT path FROM ideas WHERE project_path = ? AND title_key = ? LIMIT 1",
+        (rel_path(research_root, project_dir), title.casefold())
+    ).fetchone()
+    return research_root / row["path"] if row else None
+
+
+def list_projects(conn):
+    """Return project rows with idea and experiment counts."""
+    return conn.execute("""
+        SELECT p.*,
+               (SELECT COUNT(*) FROM ideas i WHERE i.project_path = p.path) AS ideas_count,
+               (SELECT COUNT(*) FROM experiments e WHERE e.project_path = p.path) AS experiments_count
+        FROM projects p
+        ORDER BY p.path
+    """).fetchall()
+
+
+def owner(rel):
+    """
+    Return the catalog path of the note a file under projects/ belongs to.
+
+    Files in an experiment directory (results.md) belong to the
+    experiment, files in an idea directory to the idea, and everything
+    else in a project (papers/, engineering/) to the project.
+    """
+    parts = rel.split("/")
+    if len(parts) > 5 and parts[2] == "ideas" and parts[4] == "experiments":
+        return "/".join(parts[:6])
+    if len(parts) > 3 and parts[2] == "ideas":
+        return "/".join(parts[:4])
+    return "/".join(parts[:2])
+
+
+def filter_paths(conn, tag=None, status=None):
+    """
+    Return the set of project, idea and experiment paths matching a tag
+    and/or status filter. Match files against it with owner().
+    """
+    clauses = []
+    params = []
+    if tag:
+        clauses.append("path IN (SELECT path FROM tags WHERE tag = ?)")
+        params.append(tag)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+
+    where = " AND ".join(clauses) if clauses else "1"
+    paths = set()
+    for table in ("projects", "ideas", "experiments"):
+        for row in conn.execute(f"SELECT path FROM {table} WHERE {where}", params):
+            paths.add(row["path"])
+    return paths
+
+
+def main():
+    workspace, research_root = locator.locate()
+
+    config = load_config(research_root)
+    database = config.get("database") or {}
+    if not database.get("enabled", False):
+        print("Error: Database catalog is not enabled")
+        print("Edit config.yaml and set database.enabled: true")
+        sys.exit(1)
+
+    if "--rebuild" in sys.argv:
+        db_path = research_root / database.get("path", ".research-notes.db")
+        if db_path.exists():
+            db_path.unlink()
+
+    conn = open_catalog(research_root, config, refresh=False)
+    changed = sync(conn, research_root)
+
+    query = None
+    for i, arg in enumerate(sys.argv):
+        if arg == "--query" and i + 1 < len(sys.argv):
+            query = sys.argv[i + 1]
+
+    if query:
+        import sqlite3
+        try:
+            rows = conn.execute(query).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for row in rows:
+            print(" | ".join(str(value) for value in tuple(row)))
+        close_catalog(conn, research_root, config)
+        return
+
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("projects", "ideas", "experiments", "validations")
+    }
+    close_catalog(conn, research_root, config)
+
+    print(f"\n✓ Catalog synced")
+    print(f"\nProjects: {counts['projects']}")
+    print(f"Ideas: {counts['ideas']}")
+    print(f"Experiments: {counts['experiments']}")
+    print(f"Validation records: {counts['validations']}")
+    print(f"Updated: {changed}")
+
+
+if __name__ == "__main__":
+    main()
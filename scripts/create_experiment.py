@@ -8,7 +8,14 @@ Usage:
 
 import sys
 from datetime import datetime
-from pathlib import Path
+
+import autocommit
+import catalog
+import locator
+import notewriter
+import resolver
+import templates
+import update_index
 
 
 def slugify(text):
@@ -16,7 +23,27 @@ def slugify(text):
     return text.lower().replace(' ', '-').replace('_', '-')
 
 
+def experiment_files(research_root, experiment_title, idea_title, project_name, now):
+    """Return {file name: content} for a new experiment."""
+    experiment_content = templates.render(research_root, "experiment", title=experiment_title, idea=idea_title,
+                                          project=project_name, created=now, updated=now)
+    results_content = templates.render(research_root, "results", title=experiment_title, idea=idea_title,
+                                       project=project_name)
+    return {"experiment.md": experiment_content, "results.md": results_content}
+
+
+def write_experiment(experiment_dir, files):
+    """Create an experiment directory with its notes and artifacts directory."""
+    experiment_dir.mkdir()
+    for name, content in files.items():
+        notewriter.atomic_write(experiment_dir / name, content)
+    (experiment_dir / "artifacts").mkdir()
+
+
 def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
     if len(sys.argv) < 4:
         print("Usage: python3 create_experiment.py <project> <idea> <title>")
         sys.exit(1)
@@ -25,50 +52,12 @@ def main():
     idea_title = sys.argv[2]
     experiment_title = sys.argv[3]
 
-    # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
-    projects_dir = research_root / "projects"
-
     # Find project and idea directories
-    project_dir = None
     idea_dir = None
-
-    for p in projects_dir.iterdir():
-        if not p.is_dir():
-            continue
-
-        project_md = p / "project.md"
-        if not project_md.exists():
-            continue
-
-        content = project_md.read_text(encoding="utf-8")
-        # Check if project title matches
-        for line in content.split('\n'):
-            if line.startswith("title:"):
-                project_title = line.split(':', 1)[1].strip().strip('"\'')
-                if project_title.lower() == project_name.lower():
-                    project_dir = p
-                    break
-
-        if project_dir:
-            # Find idea
-            ideas_dir = project_dir / "ideas"
-            if ideas_dir.exists():
-                for i in ideas_dir.iterdir():
-                    if i.is_dir():
-                        idea_md = i / "idea.md"
-                        if idea_md.exists():
-                            idea_content = idea_md.read_text(encoding="utf-8")
-                            for line in idea_content.split('\n'):
-                                if line.startswith("title:"):
-                                    it = line.split(':', 1)[1].strip().strip('"\'')
-                                    if it.lower() == idea_title.lower():
-                                        idea_dir = i
-                                        break
-                            if idea_dir:
-                                break
-            break
+    conn = catalog.open_catalog(research_root)
+    project_dir = resolver.resolve_project(research_root, project_name, conn)
+    if project_dir:
+        idea_dir = resolver.resolve_idea(research_root, project_dir, idea_title, conn)
 
     if not project_dir:
         print(f"Error: Project '{project_name}' not found")
@@ -87,81 +76,20 @@ def main():
         print(f"Error: Experiment '{experiment_title}' already exists")
         sys.exit(1)
 
-    experiment_dir.mkdir()
-
-    # Create experiment.md
     now = datetime.now().isoformat()
+    write_experiment(experiment_dir, experiment_files(research_root, experiment_title, idea_title, project_name, now))
 
-    experiment_content = f"""---
-title: {experiment_title}
-idea: {idea_title}
-project: {project_name}
-created: {now}
-updated: {now}
-status: planned
-tags: []
----
-
-## Experiment Setup
-
-[Describe your experimental setup]
-
-- Dataset:
-- Parameters:
-- Metrics:
-- Baseline:
-
-## Hypothesis
-
-[Your hypothesis about what will happen]
-
-## Procedure
+    # Update catalog
+    if conn:
+        catalog.upsert_experiment(conn, research_root, experiment_dir)
 
-[Step-by-step procedure]
+    # Update index.md and tags.md
+    written = update_index.update_index(research_root, [project_dir], conn)
+    catalog.close_catalog(conn, research_root)
 
-1. [Step 1]
-2. [Step 2]
-3. [Step 3]
-
-## Expected Results
-
-[What you expect to happen]
-
-## Actual Results
-
-[Fill in after experiment completes]
-
-## Conclusion
-
-[Your conclusion from the experiment]
-"""
-
-    (experiment_dir / "experiment.md").write_text(experiment_content, encoding="utf-8")
-
-    # Create results.md
-    results_content = """# Experiment Results
-
-[Fill in after experiment completes]
-
-## Metrics
-
-| Metric | Value |
-|--------|-------|
-|        |       |
-
-## Visualizations
-
-[Add plots, charts, or images]
-
-## Raw Data
-
-[Add links to raw data files]
-"""
-
-    (experiment_dir / "results.md").write_text(results_content, encoding="utf-8")
-
-    # Create artifacts directory
-    (experiment_dir / "artifacts").mkdir()
+    autocommit.commit(research_root, [research_root / name for name in written],
+                      f"Create experiment '{experiment_title}' in {project_name}/{idea_title}",
+                      new=[experiment_dir])
 
     print(f"\n✓ Experiment created successfully!")
     print(f"\nTitle: {experiment_title}")
@@ -9,7 +9,17 @@ Usage:
 import sys
 import json
 from datetime import datetime
-from pathlib import Path
+
+import autocommit
+import catalog
+import locator
+import notewriter
+import resolver
+import templates
+import update_index
+
+
+VALID_PRIORITIES = ["low", "medium", "high"]
 
 
 def slugify(text):
@@ -17,7 +27,38 @@ def slugify(text):
     return text.lower().replace(' ', '-').replace('_', '-')
 
 
+def idea_files(research_root, title, project_name, priority, tags, now):
+    """Return {file name: content} for a new idea."""
+    idea_content = templates.render(research_root, "idea", title=title, project=project_name,
+                                    created=now, updated=now, tags=json.dumps(tags), priority=priority)
+    validation_content = templates.render(research_root, "validation", idea=title)
+    return {"idea.md": idea_content, "validation.md": validation_content}
+
+
+def write_idea(idea_dir, files):
+    """Create an idea directory with its notes and experiments directory."""
+    idea_dir.mkdir()
+    for name, content in files.items():
+        notewriter.atomic_write(idea_dir / name, content)
+    (idea_dir / "experiments").mkdir()
+
+
+def touch_project(project_dir, now, batch=None):
+    """
+    Set the `updated` field of a project's frontmatter, or queue the edit
+    in a notewriter.Batch.
+    """
+    project_md = project_dir / "project.md"
+    if batch is not None:
+        batch.set(project_md, updated=now)
+    else:
+        notewriter.update_frontmatter(project_md, updated=now)
+
+
 def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
     if len(sys.argv) < 3:
         print("Usage: python3 create_idea.py <project> <title> [--priority <priority>] [--tags <tags>]")
         print("\nPriorities: low, medium, high")
@@ -38,32 +79,15 @@ def main():
             tags = [t.strip() for t in sys.argv[i + 1].split(",")]
 
     # Validate priority
-    valid_priorities = ["low", "medium", "high"]
-    if priority not in valid_priorities:
-        print(f"Error: Invalid priority '{priority}'. Valid priorities: {', '.join(valid_priorities)}")
+    if priority not in VALID_PRIORITIES:
+        print(f"Error: Invalid priority '{priority}'. Valid priorities: {', '.join(VALID_PRIORITIES)}")
         sys.exit(1)
 
-    # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
     projects_dir = research_root / "projects"
 
     # Find project directory
-    project_dir = None
-    for p in projects_dir.iterdir():
-        if p.is_dir():
-            project_md = p / "project.md"
-            if project_md.exists():
-                content = project_md.read_text(encoding="utf-8")
-                # Check if title matches
-                for line in content.split('\n'):
-                    if line.startswith("title:"):
-                        project_title = line.split(':', 1)[1].strip().strip('"\'')
-                        if project_title.lower() == project_name.lower():
-                            project_dir = p
-                            break
-            if project_dir:
-                break
+    conn = catalog.open_catalog(research_root)
+    project_dir = resolver.resolve_project(research_root, project_name, conn)
 
     if not project_dir:
         print(f"Error: Project '{project_name}' not found")
@@ -79,84 +103,24 @@ def main():
         print(f"Error: Idea '{title}' already exists in this project")
         sys.exit(1)
 
-    idea_dir.mkdir()
-
-    # Create idea.md
     now = datetime.now().isoformat()
+    write_idea(idea_dir, idea_files(research_root, title, project_name, priority, tags, now))
+    resolver.remember_idea(research_root, idea_dir, title)
 
-    idea_content = f"""---
-title: {title}
-project: {project_name}
-created: {now}
-updated: {now}
-status: unverified
-tags: {json.dumps(tags)}
-priority: {priority}
----
-
-## Idea Description
-
-[Describe your idea]
-
-## Hypothesis
-
-[What do you think will happen?]
+    # Update project.md timestamp
+    touch_project(project_dir, now)
 
-## Approach
+    # Update catalog
+    if conn:
+        catalog.upsert_idea(conn, research_root, idea_dir)
+        catalog.upsert_project(conn, research_root, project_dir)
 
-[How will you test this idea?]
+    # Update index.md and tags.md
+    written = update_index.update_index(research_root, [project_dir], conn)
+    catalog.close_catalog(conn, research_root)
 
-## Related Work
-
-[Papers, projects, or previous experiments]
-
-## Next Steps
-
-- [ ] [Next action item]
-"""
-
-    (idea_dir / "idea.md").write_text(idea_content, encoding="utf-8")
-
-    # Create validation.md
-    validation_content = f"""---
-idea: {title}
-status: unverified
-validated: null
----
-
-## Validation Summary
-
-[Idea not yet validated]
-
-## Experiments Conducted
-
-[No experiments yet]
-
-## Key Findings
-
-[Fill in after validation]
-
-## Next Steps
-
-- [ ] Create experiment plan
-- [ ] Run experiment
-"""
-
-    (idea_dir / "validation.md").write_text(validation_content, encoding="utf-8")
-
-    # Create experiments directory
-    (idea_dir / "experiments").mkdir()
-
-    # Update project.md
-    project_md = project_dir / "project.md"
-    project_content = project_md.read_text(encoding="utf-8")
-
-    # Update timestamp
-    project_content = project_content.replace(
-        f"updated: {now[:10]}",
-        f"updated: {now}"
-    )
-    project_md.write_text(project_content, encoding="utf-8")
+    autocommit.commit(research_root, [project_dir / "project.md"] + [research_root / name for name in written],
+                      f"Create idea '{title}' in {project_name}", new=[idea_dir])
 
     print(f"\n✓ Idea created successfully!")
     print(f"\nTitle: {title}")
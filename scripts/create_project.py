@@ -7,11 +7,19 @@ Usage:
 """
 
 import sys
-import os
 import json
-import yaml
 from datetime import datetime
-from pathlib import Path
+
+import autocommit
+import catalog
+import locator
+import notewriter
+import resolver
+import templates
+import update_index
+
+
+VALID_TYPES = ["academic", "engineering", "direction"]
 
 
 def slugify(text):
@@ -19,7 +27,26 @@ def slugify(text):
     return text.lower().replace(' ', '-').replace('_', '-')
 
 
+def project_files(research_root, title, project_type, tags, now):
+    """Return {file name: content} for a new project."""
+    project_content = templates.render(research_root, "project", title=title, type=project_type,
+                                       created=now, updated=now, tags=json.dumps(tags))
+    return {"project.md": project_content}
+
+
+def write_project(project_dir, files):
+    """Create a project directory with its notes and subdirectories."""
+    project_dir.mkdir()
+    for name in ("ideas", "papers", "engineering"):
+        (project_dir / name).mkdir()
+    for name, content in files.items():
+        notewriter.atomic_write(project_dir / name, content)
+
+
 def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
     if len(sys.argv) < 2:
         print("Usage: python3 create_project.py <title> [--type <type>] [--tags <tags>]")
         print("\nTypes: academic, engineering, direction")
@@ -39,14 +66,10 @@ def main():
             tags = [t.strip() for t in sys.argv[i + 1].split(",")]
 
     # Validate type
-    valid_types = ["academic", "engineering", "direction"]
-    if project_type not in valid_types:
-        print(f"Error: Invalid type '{project_type}'. Valid types: {', '.join(valid_types)}")
+    if project_type not in VALID_TYPES:
+        print(f"Error: Invalid type '{project_type}'. Valid types: {', '.join(VALID_TYPES)}")
         sys.exit(1)
 
-    # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
     projects_dir = research_root / "projects"
 
     # Create project directory
@@ -57,61 +80,21 @@ def main():
         print(f"Error: Project '{title}' already exists")
         sys.exit(1)
 
-    project_dir.mkdir()
-
-    # Create subdirectories
-    (project_dir / "ideas").mkdir()
-    (project_dir / "papers").mkdir()
-    (project_dir / "engineering").mkdir()
-
-    # Create project.md
     now = datetime.now().isoformat()
+    write_project(project_dir, project_files(research_root, title, project_type, tags, now))
+    resolver.remember_project(research_root, project_dir, title)
 
-    project_content = f"""---
-title: {title}
-type: {project_type}
-created: {now}
-updated: {now}
-status: active
-tags: {json.dumps(tags)}
-priority: medium
----
-
-## Project Overview
-
-[Brief description of this project]
-
-## Goals
-
-1. [Goal 1]
-2. [Goal 2]
-3. [Goal 3]
-
-## Related Papers
-
-- [Paper Title]
-- [Paper Title]
-
-## Timeline
-
-- [ ] [Milestone 1]
-- [ ] [Milestone 2]
-- [ ] [Milestone 3]
-"""
-
-    (project_dir / "project.md").write_text(project_content, encoding="utf-8")
-
-    # Update index.md
-    index_path = research_root / "index.md"
-    index_content = index_path.read_text(encoding="utf-8")
+    # Update catalog
+    conn = catalog.open_catalog(research_root)
+    if conn:
+        catalog.upsert_project(conn, research_root, project_dir)
 
-    # Find projects section and add new project
-    if "## Projects" in index_content:
-        projects_section = "## Projects\n\n"
-        new_entry = f"- [{title}](projects/{project_slug}/project.md) - {project_type} - {now}\n"
-        index_content = index_content.replace(projects_section, projects_section + new_entry)
+    # Update index.md and tags.md
+    written = update_index.update_index(research_root, [project_dir], conn)
+    catalog.close_catalog(conn, research_root)
 
-    index_path.write_text(index_content, encoding="utf-8")
+    autocommit.commit(research_root, [research_root / name for name in written],
+                      f"Create project '{title}'", new=[project_dir])
 
     print(f"\n✓ Project created successfully!")
     print(f"\nTitle: {title}")
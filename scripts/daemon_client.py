@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Client side of the notes daemon (see notes_daemon.py).
+
+The CLI scripts call these helpers before doing any work themselves. Each
+returns None when no daemon is listening for the workspace, in which case
+the caller falls back to reading the notes directly. Set
+RESEARCH_NOTES_NO_DAEMON=1 to always bypass the daemon.
+
+socket is imported only once a daemon socket exists, so the common
+no-daemon path adds nothing to script startup.
+"""
+
+import os
+import json
+from pathlib import Path
+
+
+SOCKET_NAME = ".notes-daemon.sock"
+
+# AF_UNIX socket paths are limited to ~108 bytes
+MAX_SOCKET_PATH = 100
+
+
+def socket_path(research_root):
+    """Return the Unix socket path of the daemon for a workspace."""
+    path = research_root / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return path
+
+    import hashlib
+    import tempfile
+    digest = hashlib.sha1(str(research_root).encode("utf-8")).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"research-notes-{digest}.sock"
+
+
+def request(research_root, op, timeout=30.0, **args):
+    """Send one request to the daemon and return its result, or None."""
+    if os.environ.get("RESEARCH_NOTES_NO_DAEMON"):
+        return None
+
+    path = socket_path(research_root)
+    if not path.exists():
+        return None
+
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({"op": op, "args": args}).encode("utf-8") + b"\n")
+
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+    except OSError:
+        return None
+
+    try:
+        response = json.loads(data)
+    except ValueError:
+        return None
+
+    if not response.get("ok"):
+        return None
+    return response.get("result")
+
+
+def encode_hits(research_root, sections):
+    """Make search sections JSON-serializable (paths relative to the root)."""
+    return [
+        [section, [dict(hit, path=hit["path"].relative_to(research_root).as_posix()) for hit in hits]]
+        for section, hits in sections
+    ]
+
+
+def decode_hits(research_root, sections):
+    """Reverse encode_hits."""
+    return [
+        (section, [
+            dict(hit, path=research_root / hit["path"], matches=[tuple(m) for m in hit["matches"]])
+            for hit in hits
+        ])
+        for section, hits in sections
+    ]
+
+
+def search(research_root, scopes, query, options):
+    """Run a search in the daemon; returns [(section, hits)] or None."""
+    result = request(research_root, "search", scopes=scopes, query=query, **options)
+    if result is None:
+        return None
+    return decode_hits(research_root, result)
+
+
+def list_projects(research_root):
+    """Return the project listing from the daemon, or None."""
+    return request(research_root, "list_projects")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Frontmatter parsing for research notes.
+
+Notes start with a `---` delimited header of `key: value` lines. Only the
+header is read from disk; the body is never touched. Parsed headers are
+memoized per process, keyed by (path, mtime_ns, size), so every script
+and module that needs note metadata shares one cache.
+"""
+
+import json
+
+
+_cache = {}
+
+
+def parse_value(value):
+    """Convert a raw frontmatter value to a Python value."""
+    value = value.strip()
+
+    if value.startswith('[') and value.endswith(']'):
+        try:
+            items = json.loads(value)
+        except ValueError:
+            items = [t.strip().strip('"\'') for t in value[1:-1].split(',')]
+        return [str(item) for item in items if str(item).strip()]
+
+    value = value.strip('"\'')
+    if value in ("null", "~"):
+        return None
+    return value
+
+
+def parse_lines(lines):
+    """Parse frontmatter from an iterable of lines (including the opening ---)."""
+    metadata = {}
+    lines = iter(lines)
+
+    first = next(lines, None)
+    if first is None or first.strip() != "---":
+        return metadata
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.strip() == "---":
+            break
+        if ':' not in line or line.startswith((' ', '\t', '#')):
+            continue
+        key, value = line.split(':', 1)
+        metadata[key.strip()] = parse_value(value)
+
+    return metadata
+
+
+def parse(content):
+    """Parse the frontmatter of note content already in memory."""
+    return parse_lines(content.split('\n'))
+
+
+def read(path):
+    """
+    Return the parsed frontmatter of a note file.
+
+    Reads only up to the closing `---`. Results are cached by
+    (path, mtime_ns, size) and shared, so callers must not mutate them.
+    A missing file raises OSError.
+    """
+    key = str(path)
+    stat = path.stat()
+    cached = _cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(path, 'r', encoding="utf-8") as f:
+        metadata = parse_lines(f)
+
+    _cache[key] = (stat.st_mtime_ns, stat.st_size, metadata)
+    return metadata
+
+
+def read_title(path, default=None):
+    """Return the title of a note, or default if it has none or is missing."""
+    try:
+        return read(path).get("title") or default
+    except OSError:
+        return default
@@ -5,17 +5,15 @@ Initialize Research Notes structure.
 Creates base directory structure, index files, and config.
 """
 
-import os
-import json
-import yaml
 from datetime import datetime
-from pathlib import Path
+
+import locator
+import templates
 
 
 def main():
     # Get workspace root
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
+    workspace, research_root = locator.locate()
 
     if research_root.exists():
         print(f"✓ Research notes already exists at {research_root}")
@@ -39,17 +37,23 @@ Last updated: {date}
 
 ## Projects
 
+<!-- index:projects -->
 [Projects will be listed here automatically]
+<!-- /index:projects -->
 
 ## Tags
 
+<!-- index:tags -->
 [Tags will be listed here automatically]
+<!-- /index:tags -->
 
 ## Quick Stats
 
+<!-- index:stats -->
 - Total Projects: 0
 - Total Ideas: 0
 - Total Experiments: 0
+<!-- /index:stats -->
 """.format(date=datetime.now().isoformat())
 
     (research_root / "index.md").write_text(index_content, encoding="utf-8")
@@ -68,6 +72,12 @@ Use tags to organize your research across projects.
 - #neural-rendering - Neural rendering
 - #real-time - Real-time systems
 
+## All Tags
+
+<!-- index:all-tags -->
+[Tagged notes will be listed here automatically]
+<!-- /index:all-tags -->
+
 ## Tag Usage
 
 Add tags to any project, idea, or experiment:
@@ -102,132 +112,23 @@ tags: [3d-vision, nerf, optimization]
         "git": {
             "auto_commit": False,
             "auto_push": False,
-            "commit_message_prefix": "[Research Notes]"
+            "commit_message_prefix": "[Research Notes]",
+            "commit_window": 0,  # seconds
+            "remote": "origin"
         }
     }
 
+    import yaml
     with open(research_root / "config.yaml", 'w', encoding="utf-8") as f:
         yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
 
     # Create templates directory
-    templates_dir = research_root / "templates"
+    templates_dir = research_root / templates.TEMPLATES_DIR
     templates_dir.mkdir(exist_ok=True)
 
-    # Create experiment template
-    experiment_template = """---
-title: {title}
-idea: {idea}
-project: {project}
-created: {created}
-updated: {updated}
-status: planned
-tags: []
----
-
-## Experiment Setup
-
-[Describe your experimental setup]
-
-- Dataset:
-- Parameters:
-- Metrics:
-- Baseline:
-
-## Hypothesis
-
-[Your hypothesis about what will happen]
-
-## Procedure
-
-[Step-by-step procedure]
-
-1. [Step 1]
-2. [Step 2]
-3. [Step 3]
-
-## Expected Results
-
-[What you expect to happen]
-
-## Actual Results
-
-[Fill in after experiment completes]
-
-## Conclusion
-
-[Your conclusion from the experiment]
-"""
-
-    (templates_dir / "experiment-template.md").write_text(experiment_template, encoding="utf-8")
-
-    # Create idea template
-    idea_template = """---
-title: {title}
-project: {project}
-created: {created}
-updated: {updated}
-status: unverified
-tags: []
-priority: medium
----
-
-## Idea Description
-
-[Describe your idea]
-
-## Hypothesis
-
-[What do you think will happen?]
-
-## Approach
-
-[How will you test this idea?]
-
-## Related Work
-
-[Papers, projects, or previous experiments]
-
-## Next Steps
-
-- [ ] [Next action item]
-"""
-
-    (templates_dir / "idea-template.md").write_text(idea_template, encoding="utf-8")
-
-    # Create project template
-    project_template = """---
-title: {title}
-type: {type}
-created: {created}
-updated: {updated}
-status: active
-tags: []
-priority: medium
----
-
-## Project Overview
-
-[Brief description of this project]
-
-## Goals
-
-1. [Goal 1]
-2. [Goal 2]
-3. [Goal 3]
-
-## Related Papers
-
-- [Paper Title]
-- [Paper Title]
-
-## Timeline
-
-- [ ] [Milestone 1]
-- [ ] [Milestone 2]
-- [ ] [Milestone 3]
-"""
-
-    (templates_dir / "project-template.md").write_text(project_template, encoding="utf-8")
+    # Write the built-in note templates for editing
+    for name, content in templates.DEFAULTS.items():
+        templates.template_path(research_root, name).write_text(content, encoding="utf-8")
 
     print("\n✓ Research notes structure created successfully!")
     print(f"\nLocation: {research_root}")
@@ -238,7 +139,7 @@ priority: medium
     print("\nOptional:")
     print("- Configure Notion sync: Edit config.yaml")
     print("- Enable database: Edit config.yaml")
-    print("- Initialize git: python3 scripts/init_git.py")
+    print("- Initialize git: python3 scripts/autocommit.py init")
 
 
 if __name__ == "__main__":
@@ -3,19 +3,117 @@
 List all research projects.
 
 Usage:
-    python3 list_projects.py
+    python3 list_projects.py [--workers <n>]
 """
 
-import yaml
-from pathlib import Path
-from datetime import datetime
+import sys
+import json
+
+import catalog
+import daemon_client
+import frontmatter
+import locator
+import walker
+
+
+def collect_projects(research_root, workers=None):
+    """
+    Return a list of project entries with idea and experiment counts.
+
+    Each entry holds the project frontmatter fields plus `ideas_count`,
+    `experiments_count` and `path` (relative to the research root).
+    """
+    # Walk the tree once, counting ideas and experiments per project
+    projects = []
+    ideas_count = {}
+    experiments_count = {}
+
+    for note in walker.walk(research_root / "projects"):
+        if note.kind == "project":
+            if note.path is not None:
+                projects.append(note)
+        elif note.kind == "idea":
+            ideas_count[note.project_dir] = ideas_count.get(note.project_dir, 0) + 1
+        else:
+            experiments_count[note.project_dir] = experiments_count.get(note.project_dir, 0) + 1
+
+    # Read project metadata in parallel
+    metadata = walker.parallel_map(lambda n: frontmatter.read(n.path), projects, workers)
+
+    entries = []
+    for project, project_data in zip(projects, metadata):
+        if not project_data.get('title'):
+            continue
+
+        entry = dict(project_data)
+        entry['ideas_count'] = ideas_count.get(project.dir, 0)
+        entry['experiments_count'] = experiments_count.get(project.dir, 0)
+        entry['path'] = project.dir.relative_to(research_root).as_posix()
+        entries.append(entry)
+
+    return entries
+
+
+def project_entry(research_root, project_dir):
+    """
+    Return the entry of one project as collect_projects() builds it.
+
+    Returns None when the project has no project.md or no title.
+    """
+    subdirs, files = walker.scan(project_dir)
+    if "project.md" not in files:
+        return None
+    project_data = frontmatter.read(project_dir / "project.md")
+    if not project_data.get('title'):
+        return None
+
+    idea_dirs, _ = walker.scan(subdirs["ideas"]) if "ideas" in subdirs else ({}, set())
+    experiments = 0
+    for idea_dir in idea_dirs.values():
+        idea_subdirs, _ = walker.scan(idea_dir)
+        if "experiments" in idea_subdirs:
+            experiments += len(walker.scan(idea_subdirs["experiments"])[0])
+
+    entry = dict(project_data)
+    entry['ideas_count'] = len(idea_dirs)
+    entry['experiments_count'] = experiments
+    entry['path'] = project_dir.relative_to(research_root).as_posix()
+    return entry
+
+
+def catalog_projects(conn):
+    """Return project entries from the metadata catalog."""
+    entries = []
+    for row in catalog.list_projects(conn):
+        entry = dict(row)
+        entry['tags'] = json.loads(row['tags'] or "[]")
+        entries.append(entry)
+    return entries
+
+
+def print_project(project_data, ideas_count, experiments_count, location):
+    """Print a single project entry."""
+    print(f"\n📁 {project_data['title']}")
+    print(f"   Type: {project_data.get('type') or 'N/A'}")
+    print(f"   Status: {project_data.get('status') or 'N/A'}")
+    print(f"   Priority: {project_data.get('priority') or 'N/A'}")
+    print(f"   Ideas: {ideas_count}")
+    print(f"   Experiments: {experiments_count}")
+    print(f"   Updated: {project_data.get('updated') or 'N/A'}")
+
+    if project_data.get('tags'):
+        tags_str = ', '.join(project_data['tags'])
+        print(f"   Tags: {tags_str}")
+
+    print(f"   Location: {location}")
 
 
 def main():
     # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
+    workspace, research_root = locator.locate()
+
     projects_dir = research_root / "projects"
+    workers = walker.parse_workers(sys.argv)
 
     if not projects_dir.exists():
         print("No projects directory found. Run init.py first.")
@@ -29,64 +127,19 @@ def main():
         print("\nCreate a project: python3 scripts/create_project.py <title>")
         return
 
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
-
-        project_md = project_dir / "project.md"
-        if not project_md.exists():
-            continue
-
-        # Read project metadata
-        content = project_md.read_text(encoding="utf-8")
-
-        project_data = {}
-        for line in content.split('\n'):
-            if line.startswith("title:"):
-                project_data['title'] = line.split(':', 1)[1].strip().strip('"\'')
-            elif line.startswith("type:"):
-                project_data['type'] = line.split(':', 1)[1].strip().strip('"\'')
-            elif line.startswith("status:"):
-                project_data['status'] = line.split(':', 1)[1].strip().strip('"\'')
-            elif line.startswith("updated:"):
-                project_data['updated'] = line.split(':', 1)[1].strip().strip('"\'')
-            elif line.startswith("priority:"):
-                project_data['priority'] = line.split(':', 1)[1].strip().strip('"\'')
-            elif line.startswith("tags:"):
-                tags = line.split(':', 1)[1].strip().strip('"\'[]')
-                if tags:
-                    project_data['tags'] = [t.strip() for t in tags.split(',')]
-
-        if 'title' not in project_data:
-            continue
-
-        # Count ideas and experiments
-        ideas_count = 0
-        experiments_count = 0
-
-        ideas_dir = project_dir / "ideas"
-        if ideas_dir.exists():
-            ideas_count = sum(1 for i in ideas_dir.iterdir() if i.is_dir())
-            for idea_dir in ideas_dir.iterdir():
-                if idea_dir.is_dir():
-                    exp_dir = idea_dir / "experiments"
-                    if exp_dir.exists():
-                        experiments_count += sum(1 for e in exp_dir.iterdir() if e.is_dir())
-
-        # Print project info
-        print(f"\n📁 {project_data['title']}")
-        print(f"   Type: {project_data.get('type', 'N/A')}")
-        print(f"   Status: {project_data.get('status', 'N/A')}")
-        print(f"   Priority: {project_data.get('priority', 'N/A')}")
-        print(f"   Ideas: {ideas_count}")
-        print(f"   Experiments: {experiments_count}")
-        print(f"   Updated: {project_data.get('updated', 'N/A')}")
-
-        if 'tags' in project_data:
-            tags_str = ', '.join(project_data['tags'])
-            print(f"   Tags: {tags_str}")
-
-        print(f"   Location: {project_dir.relative_to(workspace)}")
+    # Prefer a running notes_daemon.py, then the catalog, then a tree walk
+    entries = daemon_client.list_projects(research_root)
+    if entries is None:
+        conn = catalog.open_catalog(research_root)
+        if conn:
+            entries = catalog_projects(conn)
+            catalog.close_catalog(conn, research_root)
+        else:
+            entries = collect_projects(research_root, workers)
+
+    for entry in entries:
+        print_project(entry, entry['ideas_count'], entry['experiments_count'],
+                      (research_root / entry['path']).relative_to(workspace))
 
     print("\n" + "=" * 70)
 
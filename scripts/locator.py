@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Locate the research-notes workspace and load its config.
+
+The notes root is taken from, in order:
+
+1. a `--root <path>` argument (removed from sys.argv so scripts never
+   see it as a positional argument, and exported as RESEARCH_NOTES_ROOT
+   so later lookups and child processes use the same root)
+2. the RESEARCH_NOTES_ROOT environment variable
+3. the nearest `research-notes/config.yaml` found walking up from the
+   current directory
+4. the workspace the scripts are installed in (five levels above this
+   file), as before
+
+`<path>` may name the research-notes directory itself or the workspace
+directory containing it. Resolved roots and parsed config.yaml files are
+cached for the life of the process, so batch jobs and the
+research_notes.py shell resolve each workspace and parse its config once.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+ENV_VAR = "RESEARCH_NOTES_ROOT"
+DIR_NAME = "research-notes"
+CONFIG_FILE = "config.yaml"
+
+_roots = {}
+_configs = {}
+
+
+def pop_root(argv):
+    """Remove `--root <path>` from argv and return the path, or None."""
+    for i, arg in enumerate(argv):
+        if arg == "--root" and i + 1 < len(argv):
+            root = argv[i + 1]
+            del argv[i:i + 2]
+            return root
+        if arg.startswith("--root="):
+            del argv[i]
+            return arg.split("=", 1)[1]
+    return None
+
+
+def as_research_root(path):
+    """Interpret a user-supplied path as a research-notes directory."""
+    path = Path(path).expanduser().absolute()
+    if path.name == DIR_NAME or (path / CONFIG_FILE).exists():
+        return path
+    return path / DIR_NAME
+
+
+def find_research_root(start):
+    """Walk up from start to the nearest research-notes/config.yaml, or None."""
+    start = Path(start).absolute()
+    for directory in (start, *start.parents):
+        if directory.name == DIR_NAME and (directory / CONFIG_FILE).exists():
+            return directory
+        if (directory / DIR_NAME / CONFIG_FILE).exists():
+            return directory / DIR_NAME
+    return None
+
+
+def default_research_root():
+    """Return the notes root of the workspace the scripts are installed in."""
+    return Path(__file__).parent.parent.parent.parent.parent / DIR_NAME
+
+
+def locate(argv=None):
+    """
+    Return (workspace, research_root) for this invocation.
+
+    `argv` defaults to sys.argv; a --root argument is removed from it.
+    """
+    if argv is None:
+        argv = sys.argv
+
+    root_arg = pop_root(argv)
+    if root_arg:
+        os.environ[ENV_VAR] = root_arg
+
+    explicit = os.environ.get(ENV_VAR) or None
+    cwd = os.getcwd()
+    key = (explicit, cwd)
+
+    research_root = _roots.get(key)
+    if research_root is None:
+        if explicit:
+            research_root = as_research_root(explicit)
+        else:
+            research_root = find_research_root(cwd) or default_research_root()
+        _roots[key] = research_root
+
+    return research_root.parent, research_root
+
+
+def load_config(research_root):
+    """
+    Return the parsed config.yaml of a notes root, or {} if there is none.
+
+    Parsed configs are cached by (mtime, size) and shared, so callers must
+    not mutate them.
+    """
+    config_path = research_root / CONFIG_FILE
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return {}
+
+    key = str(config_path)
+    cached = _configs.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    import yaml
+    with open(config_path, 'r', encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    _configs[key] = (stat.st_mtime_ns, stat.st_size, config)
+    return config
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Columnar metrics store built from the `| Metric | Value |` tables in
+results.md.
+
+Every experiment's results.md is parsed into (metric, value) rows and
+kept in `research-notes/.metrics.npz`, a set of NumPy arrays:
+
+- per experiment: `project`, `idea`, `experiment` (directory names),
+  `mtime_ns` and `size` of its results.md
+- per value: `row_experiment` and `row_metric` (indices into the
+  experiment arrays and `metric_names`) and `value` (float64)
+
+Each command refreshes the store first; only results.md files whose
+mtime or size changed are parsed again. Queries then work on whole
+columns at once, so "best PSNR per idea" over thousands of experiments
+is a sort and a mask rather than a loop over files.
+
+Values are the first number in the Value cell (`31.2 dB`, `92%` and
+`1,024` all parse); rows without a number are skipped. Metric names
+are matched case-insensitively.
+
+`compare` builds per-metric leaderboards for a project or idea.
+Repeated runs of one configuration (experiments whose names differ only
+in a `-seed1`/`-run2`/`-rep3`/`-trial4` suffix) are aggregated into
+runs, mean, std and best, and each configuration's mean is compared
+with its idea's baseline: the experiment whose experiment.md says
+`- Baseline: yes` (or names itself), otherwise the experiment most
+often named in other experiments' `Baseline:` lines.
+
+Requires numpy.
+
+Usage:
+    python3 metrics.py update
+    python3 metrics.py list [--project <project>]
+    python3 metrics.py best <metric> [--by project|idea|experiment] [--min] [--project <project>] [--top <n>]
+    python3 metrics.py compare <project> [<idea>] [--metric <metric>] [--min <m1,m2>] [--max <m1,m2>] [--top <n>]
+"""
+
+import sys
+import os
+import re
+import tempfile
+
+import catalog
+import locator
+import resolver
+import walker
+
+
+STORE_FILE = ".metrics.npz"
+STORE_VERSION = 2
+
+GROUPS = ("project", "idea", "experiment")
+
+TABLE_ROW = re.compile(r"^\s*\|(.*)\|\s*$")
+NUMBER = re.compile(r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?")
+SEPARATOR = set("-: ")
+
+BASELINE_LINE = re.compile(r"^[ \t]*[-*]?[ \t]*\**baseline\**[ \t]*:\**[ \t]*(.*?)[ \t]*$", re.IGNORECASE | re.MULTILINE)
+BASELINE_FLAGS = ("yes", "true", "x", "self", "this")
+RUN_SUFFIX = re.compile(r"[-_](?:seed|run|rep|trial)[-_]?\d+$", re.IGNORECASE)
+
+# Metrics ranked lowest first unless overridden with --max
+LOWER_IS_BETTER = ("loss", "error", "err", "mse", "mae", "rmse", "lpips", "fid", "perplexity", "time", "latency")
+
+
+def check_numpy_installed():
+    """Check if numpy is installed."""
+    try:
+        import numpy
+        return True
+    except ImportError:
+        return False
+
+
+def parse_metrics(content):
+    """Return [(metric, value)] from every `| Metric | Value |` table."""
+    rows = []
+    in_table = False
+    for line in content.splitlines():
+        match = TABLE_ROW.match(line)
+        if not match:
+            in_table = False
+            continue
+
+        cells = [cell.strip().strip("*`").strip() for cell in match.group(1).split("|")]
+        if not in_table:
+            in_table = len(cells) >= 2 and cells[0].lower() == "metric" and cells[1].lower() == "value"
+            continue
+        if len(cells) < 2 or not cells[0] or set(cells[0]) <= SEPARATOR:
+            continue
+
+        number = NUMBER.search(cells[1].replace(",", ""))
+        if number:
+            rows.append((cells[0], float(number.group())))
+    return rows
+
+
+def empty_store():
+    import numpy as np
+    return {
+        "project": np.array([], dtype=str),
+        "idea": np.array([], dtype=str),
+        "experiment": np.array([], dtype=str),
+        "config": np.array([], dtype=str),
+        "baseline": np.array([], dtype=str),
+        "mtime_ns": np.array([], dtype=np.int64),
+        "size": np.array([], dtype=np.int64),
+        "setup_mtime_ns": np.array([], dtype=np.int64),
+        "setup_size": np.array([], dtype=np.int64),
+        "metric_names": np.array([], dtype=str),
+        "row_experiment": np.array([], dtype=np.int32),
+        "row_metric": np.array([], dtype=np.int32),
+        "value": np.array([], dtype=np.float64),
+    }
+
+
+def load_store(research_root):
+    """Load the store, or return an empty one."""
+    import numpy as np
+    try:
+        with np.load(research_root / STORE_FILE, allow_pickle=False) as data:
+            if int(data["version"]) != STORE_VERSION:
+                return empty_store()
+            return {key: data[key] for key in empty_store()}
+    except (OSError, ValueError, KeyError):
+        return empty_store()
+
+
+def save_store(research_root, store):
+    """Write the store via a temp file and a rename."""
+    import numpy as np
+    fd, tmp_path = tempfile.mkstemp(dir=research_root, prefix=f".{STORE_FILE}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, version=np.int64(STORE_VERSION), **store)
+        os.replace(tmp_path, research_root / STORE_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def parse_baseline(content):
+    """Return the `Baseline:` entry of experiment.md content, or ""."""
+    match = BASELINE_LINE.search(content)
+    if not match:
+        return ""
+    value = match.group(1).strip("*`[] ")
+    return value if not value.startswith("[") else ""
+
+
+def config_name(experiment):
+    """Return the configuration an experiment is a repeated run of."""
+    return RUN_SUFFIX.sub("", experiment)
+
+
+def stat_results(note):
+    """
+    Return (key, results.md path, mtime_ns, size, experiment.md mtime_ns,
+    size) for an experiment, or None when it has no results.md.
+    """
+    if note.path is None:
+        return None
+    try:
+        st = note.path.stat()
+    except OSError:
+        return None
+    try:
+        setup = (note.dir / "experiment.md").stat()
+        setup_stat = (setup.st_mtime_ns, setup.st_size)
+    except OSError:
+        setup_stat = (0, 0)
+    experiment_dir = note.dir
+    key = (note.project_dir.name, experiment_dir.parent.parent.name, experiment_dir.name)
+    return (key, note.path, st.st_mtime_ns, st.st_size) + setup_stat
+
+
+def read_metrics(path):
+    """Return ([(metric, value)], baseline) for an experiment's results.md."""
+    try:
+        # A metric listed twice keeps its last value
+        rows = list(dict(parse_metrics(path.read_text(encoding="utf-8"))).items())
+    except (OSError, UnicodeDecodeError):
+        rows = []
+    try:
+        baseline = parse_baseline((path.parent / "experiment.md").read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        baseline = ""
+    return rows, baseline
+
+
+def refresh(research_root, workers=None):
+    """
+    Bring the store up to date with the results.md files on disk.
+
+    Returns (store, counts) where counts has parsed, unchanged and removed.
+    """
+    import numpy as np
+
+    old = load_store(research_root)
+    notes = [n for n in walker.walk_scope(research_root / "projects", "results") if n.kind == "results"]
+    stats = [s for s in walker.parallel_map(stat_results, notes, workers) if s]
+
+    old_index = {key: i for i, key in enumerate(zip(old["project"].tolist(), old["idea"].tolist(),
+                                                    old["experiment"].tolist()))}
+
+    # Experiments whose results.md and experiment.md are unchanged keep their rows
+    remap = np.full(len(old["project"]), -1, dtype=np.int32)
+    baselines = [""] * len(stats)
+    changed = []
+    for new_index, (key, path, mtime_ns, size, setup_mtime_ns, setup_size) in enumerate(stats):
+        i = old_index.get(key)
+        if (i is not None and old["mtime_ns"][i] == mtime_ns and old["size"][i] == size
+                and old["setup_mtime_ns"][i] == setup_mtime_ns and old["setup_size"][i] == setup_size):
+            remap[i] = new_index
+            baselines[new_index] = old["baseline"][i]
+        else:
+            changed.append((new_index, path))
+
+    still_present = sum(1 for s in stats if s[0] in old_index)
+    counts = {
+        "parsed": len(changed),
+        "unchanged": int((remap >= 0).sum()),
+        "removed": len(old_index) - still_present,
+    }
+    if not changed and not counts["removed"]:
+        return old, counts
+
+    keep = remap[old["row_experiment"]] >= 0
+    metric_names = old["metric_names"].tolist()
+    ids = {name: i for i, name in enumerate(metric_names)}
+
+    new_experiment, new_metric, new_value = [], [], []
+    parsed = walker.parallel_map(read_metrics, [path for _, path in changed], workers)
+    for (new_index, _), (rows, baseline) in zip(changed, parsed):
+        baselines[new_index] = baseline
+        for name, value in rows:
+            if name not in ids:
+                ids[name] = len(metric_names)
+                metric_names.append(name)
+            new_experiment.append(new_index)
+            new_metric.append(ids[name])
+            new_value.append(value)
+
+    store = {
+        "project": np.array([s[0][0] for s in stats], dtype=str),
+        "idea": np.array([s[0][1] for s in stats], dtype=str),
+        "experiment": np.array([s[0][2] for s in stats], dtype=str),
+        "config": np.array([config_name(s[0][2]) for s in stats], dtype=str),
+        "baseline": np.array(baselines, dtype=str),
+        "mtime_ns": np.array([s[2] for s in stats], dtype=np.int64),
+        "size": np.array([s[3] for s in stats], dtype=np.int64),
+        "setup_mtime_ns": np.array([s[4] for s in stats], dtype=np.int64),
+        "setup_size": np.array([s[5] for s in stats], dtype=np.int64),
+        "metric_names": np.array(metric_names, dtype=str),
+        "row_experiment": np.concatenate([remap[old["row_experiment"][keep]],
+                                          np.array(new_experiment, dtype=np.int32)]).astype(np.int32),
+        "row_metric": np.concatenate([old["row_metric"][keep],
+                                      np.array(new_metric, dtype=np.int32)]).astype(np.int32),
+        "value": np.concatenate([old["value"][keep], np.array(new_value, dtype=np.float64)]),
+    }
+    save_store(research_root, store)
+    return store, counts
+
+
+def metric_ids(store, metric):
+    """Return the ids of all metric names equal to `metric` ignoring case."""
+    import numpy as np
+    return np.flatnonzero(np.char.lower(store["metric_names"]) == metric.lower())
+
+
+def select(store, metric, project=None):
+    """
+    Return (experiment indices, values) of one metric, without NaNs.
+
+    `project` is a project directory name, as stored.
+    """
+    import numpy as np
+    mask = np.isin(store["row_metric"], metric_ids(store, metric)) & ~np.isnan(store["value"])
+    if project is not None:
+        mask &= store["project"][store["row_experiment"]] == project
+    return store["row_experiment"][mask], store["value"][mask]
+
+
+def group_ids(store, by):
+    """Return a group id per experiment for a grouping level."""
+    import numpy as np
+    if by == "experiment" or not len(store["project"]):
+        return np.arange(len(store["project"]))
+    keys = store["project"]
+    if by == "idea":
+        keys = np.char.add(np.char.add(keys, "/"), store["idea"])
+    return np.unique(keys, return_inverse=True)[1].reshape(-1)
+
+
+def best(store, metric, by="idea", minimize=False, project=None):
+    """
+    Return the best value of a metric per group.
+
+    Returns (experiment indices, values), one entry per group, ordered
+    best first.
+    """
+    import numpy as np
+    experiments, values = select(store, metric, project)
+    if not len(values):
+        return experiments, values
+    groups = group_ids(store, by)[experiments]
+
+    score = -values if minimize else values
+    # Sort by group, then score; the last row of each group is its best
+    order = np.lexsort((score, groups))
+    last = np.r_[groups[order][1:] != groups[order][:-1], True]
+    winners = order[last]
+
+    ranking = np.argsort(-score[winners], kind="stable")
+    winners = winners[ranking]
+    return experiments[winners], values[winners]
+
+
+def lower_is_better(metric, minimize=(), maximize=()):
+    """Return True if smaller values of a metric are better."""
+    name = metric.lower()
+    if name in minimize:
+        return True
+    if name in maximize:
+        return False
+    words = re.split(r"[^a-z0-9]+", name)
+    return any(word in LOWER_IS_BETTER for word in words)
+
+
+def slugs(names):
+    """Vectorized create_*.slugify over an array of names."""
+    import numpy as np
+    return np.char.replace(np.char.replace(np.char.lower(names), " ", "-"), "_", "-")
+
+
+def baseline_experiments(store, experiments):
+    """
+    Return {"project/idea": baseline experiment index} for the ideas of
+    the given experiment indices.
+    """
+    import numpy as np
+    idea_keys = np.char.add(np.char.add(store["project"][experiments], "/"), store["idea"][experiments])
+    baseline = np.char.lower(store["baseline"][experiments])
+    names = slugs(store["experiment"][experiments])
+    flagged = np.isin(baseline, BASELINE_FLAGS) | (slugs(baseline) == names)
+
+    # Ideas without a flagged baseline: the experiment named most often
+    # in the others' Baseline: lines
+    keys = np.char.add(np.char.add(idea_keys, "/"), names)
+    order = np.argsort(keys)
+    referenced = np.char.add(np.char.add(idea_keys, "/"), slugs(baseline))
+    position = np.minimum(np.searchsorted(keys[order], referenced), len(keys) - 1)
+    valid = ~flagged & (baseline != "") & (keys[order][position] == referenced)
+    targets, votes = np.unique(order[position][valid], return_counts=True)
+    # Most votes first, so the first target seen per idea wins
+    ranked = targets[np.argsort(-votes, kind="stable")]
+
+    baselines = {}
+    for t in ranked.tolist():
+        baselines.setdefault(idea_keys[t], int(experiments[t]))
+    for t in np.flatnonzero(flagged)[::-1].tolist():
+        baselines[idea_keys[t]] = int(experiments[t])
+    return baselines
+
+
+def compare(store, project, idea=None, metric=None, minimize=(), maximize=()):
+    """
+    Aggregate every metric of a project (or one idea) per configuration.
+
+    Returns a list of (metric name, lower is better, table) where table
+    is a dict of arrays, one entry per configuration, ranked best first:
+    idea, config, runs, mean, std, best, delta (mean minus the mean of
+    the idea's baseline configuration, NaN without a baseline) and
+    is_baseline.
+    """
+    import numpy as np
+
+    rows = store["project"][store["row_experiment"]] == project
+    if idea is not None:
+        rows &= store["idea"][store["row_experiment"]] == idea
+    rows &= ~np.isnan(store["value"])
+    if metric is not None:
+        rows &= np.isin(store["row_metric"], metric_ids(store, metric))
+
+    experiments = store["row_experiment"][rows]
+    values = store["value"][rows]
+    if not len(values):
+        return []
+
+    # Metric names that differ only in case are one metric
+    lowered = np.char.lower(store["metric_names"])
+    names, metric_of = np.unique(lowered, return_inverse=True)
+    metrics = metric_of.reshape(-1)[store["row_metric"][rows]]
+    display = {}
+    for i, name in zip(metric_of.reshape(-1).tolist(), store["metric_names"].tolist()):
+        display.setdefault(i, name)
+
+    # One group per (idea, configuration), as integer codes
+    idea_names, idea_code = np.unique(store["idea"][experiments], return_inverse=True)
+    config_names, config_code = np.unique(store["config"][experiments], return_inverse=True)
+    n_configs = len(config_names)
+    group_keys, groups = np.unique(idea_code.reshape(-1).astype(np.int64) * n_configs + config_code.reshape(-1),
+                                   return_inverse=True)
+    groups = groups.reshape(-1)
+
+    sign = np.array([-1.0 if lower_is_better(display[i], minimize, maximize) else 1.0
+                     for i in range(len(names))])
+
+    # Aggregate every (configuration, metric) cell in one pass
+    cells, cell_of = np.unique(groups * len(names) + metrics, return_inverse=True)
+    cell_of = cell_of.reshape(-1)
+    runs = np.bincount(cell_of)
+    total = np.bincount(cell_of, weights=values)
+    mean = total / runs
+    squares = np.bincount(cell_of, weights=(values - mean[cell_of]) ** 2)
+    std = np.sqrt(np.divide(squares, runs - 1, out=np.zeros_like(squares), where=runs > 1))
+    order = np.argsort(cell_of, kind="stable")
+    starts = np.r_[0, np.cumsum(runs)[:-1]]
+    best_score = np.maximum.reduceat((values * sign[metrics])[order], starts)
+    cell_group = cells // len(names)
+    cell_metric = cells % len(names)
+    best = best_score * sign[cell_metric]
+
+    # Baseline configuration per idea, then its mean for the same metric
+    group_idea = group_keys // n_configs
+    baselines = baseline_experiments(store, np.unique(experiments))
+    idea_baseline = np.full(len(idea_names), -1)
+    for i, name in enumerate(idea_names.tolist()):
+        e = baselines.get(f"{project}/{name}")
+        if e is None:
+            continue
+        key = i * n_configs + np.searchsorted(config_names, store["config"][e])
+        g = np.searchsorted(group_keys, key)
+        if g < len(group_keys) and group_keys[g] == key:
+            idea_baseline[i] = g
+    baseline_group = idea_baseline[group_idea]
+
+    baseline_cell = baseline_group[cell_group] * len(names) + cell_metric
+    position = np.searchsorted(cells, baseline_cell)
+    position = np.minimum(position, len(cells) - 1)
+    found = (baseline_group[cell_group] >= 0) & (cells[position] == baseline_cell)
+    delta = np.where(found, mean - mean[position], np.nan)
+
+    results = []
+    for m in np.unique(cell_metric).tolist():
+        selected = np.flatnonzero(cell_metric == m)
+        ranking = selected[np.argsort(-(mean[selected] * sign[m]), kind="stable")]
+        results.append((display[m], sign[m] < 0, {
+            "idea": idea_names[group_idea[cell_group[ranking]]],
+            "config": config_names[group_keys[cell_group[ranking]] % n_configs],
+            "runs": runs[ranking],
+            "mean": mean[ranking],
+            "std": std[ranking],
+            "best": best[ranking],
+            "delta": delta[ranking],
+            "is_baseline": baseline_group[cell_group[ranking]] == cell_group[ranking],
+        }))
+    return sorted(results, key=lambda r: r[0].lower())
+
+
+def format_value(value):
+    return f"{value:.6g}"
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(f"{h:<{w}}" for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(f"{str(c):<{w}}" for c, w in zip(row, widths)))
+
+
+def print_comparison(research_root, store, argv, top):
+    """Resolve the compare arguments and print one leaderboard per metric."""
+    positional = []
+    skip = False
+    for arg in argv[2:]:
+        if skip:
+            skip = False
+        elif arg in ("--metric", "--min", "--max", "--top", "--workers"):
+            skip = True
+        else:
+            positional.append(arg)
+
+    if not positional:
+        print("Error: compare requires a project")
+        sys.exit(1)
+    project_name = positional[0]
+    idea_title = positional[1] if len(positional) > 1 else None
+
+    conn = catalog.open_catalog(research_root)
+    idea_dir = None
+    project_dir = resolver.resolve_project(research_root, project_name, conn)
+    if project_dir and idea_title:
+        idea_dir = resolver.resolve_idea(research_root, project_dir, idea_title, conn)
+    catalog.close_catalog(conn, research_root)
+
+    if not project_dir:
+        print(f"Error: Project '{project_name}' not found")
+        sys.exit(1)
+    if idea_title and not idea_dir:
+        print(f"Error: Idea '{idea_title}' not found in project '{project_name}'")
+        sys.exit(1)
+
+    minimize = [m.strip().lower() for m in option(argv, "--min", "").split(",") if m.strip()]
+    maximize = [m.strip().lower() for m in option(argv, "--max", "").split(",") if m.strip()]
+    metric = option(argv, "--metric")
+
+    results = compare(store, project_dir.name, idea_dir.name if idea_dir else None, metric, minimize, maximize)
+    if not results:
+        print(f"No metrics recorded for {idea_title or project_name}")
+        sys.exit(1)
+
+    for name, lower, table in results:
+        shown = len(table["config"])
+        print(f"\n📊 {name} ({'lower' if lower else 'higher'} is better, {shown} configurations)\n")
+        rows = []
+        for i in range(min(top, shown)):
+            delta = table["delta"][i]
+            if table["is_baseline"][i]:
+                delta_text = "baseline"
+            elif delta != delta:
+                delta_text = "-"
+            else:
+                delta_text = f"{delta:+.4g}"
+            rows.append((i + 1, table["idea"][i], table["config"][i], table["runs"][i],
+                         format_value(table["mean"][i]), format_value(table["std"][i]),
+                         format_value(table["best"][i]), delta_text))
+        print_table(["#", "Idea", "Configuration", "Runs", "Mean", "Std", "Best", "Δ Baseline"], rows)
+        if shown > top:
+            print(f"... {shown - top} more (use --top)")
+
+
+def option(argv, name, default=None):
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if (len(sys.argv) < 2 or sys.argv[1] not in ("update", "list", "best", "compare")
+            or (sys.argv[1] in ("best", "compare") and len(sys.argv) < 3)):
+        print("Usage: python3 metrics.py update")
+        print("       python3 metrics.py list [--project <project>]")
+        print("       python3 metrics.py best <metric> [--by project|idea|experiment] [--min] [--project <project>] [--top <n>]")
+        print("       python3 metrics.py compare <project> [<idea>] [--metric <metric>] [--min <m1,m2>] [--max <m1,m2>] [--top <n>]")
+        sys.exit(1)
+
+    if not check_numpy_installed():
+        print("Error: numpy package not installed")
+        print("Install with: pip install numpy")
+        sys.exit(1)
+
+    if not (research_root / "projects").exists():
+        print("No projects directory found. Run init.py first.")
+        sys.exit(1)
+
+    import numpy as np
+
+    command = sys.argv[1]
+    project = option(sys.argv, "--project")
+    by = option(sys.argv, "--by", "idea")
+    if by not in GROUPS:
+        print(f"Error: Invalid grouping '{by}'. Valid groupings: {', '.join(GROUPS)}")
+        sys.exit(1)
+    try:
+        top = int(option(sys.argv, "--top", 0))
+    except ValueError:
+        print(f"Error: Invalid count '{option(sys.argv, '--top')}'")
+        sys.exit(1)
+
+    if project is not None and command in ("list", "best"):
+        # The store holds directory names; resolve titles and slugs like compare does
+        conn = catalog.open_catalog(research_root)
+        project_dir = resolver.resolve_project(research_root, project, conn)
+        catalog.close_catalog(conn, research_root)
+        if not project_dir:
+            print(f"Error: Project '{project}' not found")
+            sys.exit(1)
+        project = project_dir.name
+
+    store, counts = refresh(research_root, walker.parse_workers(sys.argv))
+
+    if command == "update":
+        print(f"✓ Metrics store updated: {research_root / STORE_FILE}")
+        print(f"\nExperiments: {len(store['project'])}")
+        print(f"Values: {len(store['value'])}")
+        print(f"Parsed: {counts['parsed']}, unchanged: {counts['unchanged']}, removed: {counts['removed']}")
+        return
+
+    if command == "list":
+        mask = np.ones(len(store["value"]), dtype=bool)
+        if project is not None:
+            mask = store["project"][store["row_experiment"]] == project
+        ids, occurrences = np.unique(store["row_metric"][mask], return_counts=True)
+        if not len(ids):
+            print("No metrics recorded")
+            return
+        rows = [(store["metric_names"][i], n) for i, n in zip(ids, occurrences)]
+        print_table(["Metric", "Experiments"], sorted(rows, key=lambda r: str(r[0]).lower()))
+        return
+
+    if command == "compare":
+        print_comparison(research_root, store, sys.argv, top or 10)
+        return
+
+    metric = sys.argv[2]
+    experiments, values = best(store, metric, by, "--min" in sys.argv, project)
+    if not len(values):
+        print(f"No values recorded for metric '{metric}'")
+        sys.exit(1)
+    if top:
+        experiments, values = experiments[:top], values[:top]
+
+    goal = "min" if "--min" in sys.argv else "max"
+    print(f"🏆 Best {metric} per {by} ({goal})\n")
+    headers = [c.capitalize() for c in GROUPS] + [metric]
+    rows = [(store["project"][e], store["idea"][e], store["experiment"][e], format_value(v))
+            for e, v in zip(experiments.tolist(), values.tolist())]
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
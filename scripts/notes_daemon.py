@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Long-running daemon that keeps the notes index warm.
+
+Loads every search index shard and the project listing once, then
+watches research-notes/projects for changes (inotify on Linux, periodic
+polling elsewhere) and refreshes only the affected shards and project
+listing entries, syncing the metadata catalog too when it is enabled.
+search.py and list_projects.py query it over a Unix socket whenever it
+is running and fall back to reading the notes themselves when it is not.
+Each client is served on its own thread, so a slow search does not hold
+up other clients; refreshes wait for running requests to finish.
+It also commits queued git auto-commit batches once their commit window
+has passed (see autocommit.py).
+
+Usage:
+    python3 notes_daemon.py start [--background] [--poll <seconds>] [--workers <n>]
+    python3 notes_daemon.py stop
+    python3 notes_daemon.py status
+"""
+
+import sys
+import os
+import json
+import time
+import errno
+import signal
+import socket
+import struct
+import selectors
+import threading
+import ctypes
+import ctypes.util
+from contextlib import contextmanager
+from pathlib import Path
+
+import autocommit
+import catalog
+import daemon_client
+import list_projects
+import locator
+import search
+import search_index
+import walker
+
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+DEBOUNCE = 0.2  # seconds of quiet before refreshing after a change
+DEFAULT_POLL_INTERVAL = 5.0
+COMMIT_CHECK_INTERVAL = 5.0  # seconds between checks for an expired git commit window
+
+
+class SharedLock:
+    """Lock held either by any number of readers or by one writer."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writing = False
+
+    @contextmanager
+    def shared(self):
+        with self.condition:
+            while self.writing:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                self.condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self.condition:
+            while self.writing or self.readers:
+                self.condition.wait()
+            self.writing = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over a directory tree."""
+
+    def __init__(self, root):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.root = root
+        self.watches = {}
+        self.add_tree(root)
+
+    def fileno(self):
+        return self.fd
+
+    def add_tree(self, directory):
+        """
+        Watch a directory and everything below it.
+
+        Directories that are already watched keep their watch descriptor.
+        """
+        for dirpath, _, _ in os.walk(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = Path(dirpath)
+
+    def read_events(self):
+        """
+        Return the paths touched since the last call.
+
+        Returns None if the kernel queue overflowed and events were lost.
+        The whole tree is then watched again, as directories created while
+        events were dropped have no watch yet.
+        """
+        paths = []
+        overflowed = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+
+                directory = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                if directory is None:
+                    continue
+
+                path = directory / os.fsdecode(name) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                paths.append(path)
+
+        if overflowed:
+            self.add_tree(self.root)
+            return None
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+def scopes_for(projects_dir, path):
+    """Return the search scopes whose shards a changed path can affect."""
+    try:
+        parts = path.relative_to(projects_dir).parts
+    except ValueError:
+        return set()
+
+    # projects/, a project directory, project.md or a top-level subdirectory
+    if len(parts) <= 2:
+        return set(walker.SCOPES)
+
+    area = parts[1]
+    if area in ("papers", "engineering"):
+        return {area}
+    if area != "ideas":
+        return set()
+
+    name = parts[-1]
+    if name == "idea.md":
+        return {"ideas"}
+    if name == "experiment.md":
+        return {"experiments", "results"}
+    if name == "results.md":
+        return {"results"}
+    if len(parts) <= 5:
+        # idea, experiments/ or experiment directories came or went
+        return {"ideas", "experiments", "results"}
+    return set()
+
+
+def project_for(projects_dir, path):
+    """
+    Return the name of the project whose listing entry a changed path can
+    affect, "" when the projects directory itself changed, or None.
+
+    An entry depends on project.md and on the idea and experiment
+    directories, not on the notes inside them.
+    """
+    try:
+        parts = path.relative_to(projects_dir).parts
+    except ValueError:
+        return None
+
+    if not parts:
+        return ""
+    if len(parts) <= 2:
+        return parts[0]
+    if parts[1] == "ideas" and (len(parts) == 3 or (len(parts) <= 5 and parts[3] == "experiments")):
+        return parts[0]
+    return None
+
+
+class NotesDaemon:
+    """In-memory search shards and project listing kept in sync with disk."""
+
+    def __init__(self, research_root, workers=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.research_root = research_root
+        self.projects_dir = research_root / "projects"
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.indexes = {}
+        self.projects = None  # project name -> listing entry or None
+        self.dirty = set()
+        self.dirty_projects = set()
+        self.listing_stale = False
+        self.last_event = 0.0
+        self.last_poll = time.monotonic()
+        self.last_commit_check = self.last_poll
+        self.running = False
+        self.wakeup = None
+        # Held shared while a request reads the shards and listing, and
+        # exclusively to refresh them; events_lock guards the dirty sets
+        self.lock = SharedLock()
+        self.events_lock = threading.Lock()
+
+        for scope in walker.SCOPES:
+            self.indexes[scope], _ = search_index.refresh_index(research_root, scope, workers=workers)
+
+        try:
+            self.watcher = InotifyWatcher(self.projects_dir)
+            self.watch_mode = "inotify"
+        except OSError:
+            self.watcher = None
+            self.watch_mode = "polling"
+
+    def mark_dirty(self, scopes, project=None):
+        """
+        Schedule shards and a project's listing entry for a refresh.
+
+        A project of "" drops the whole listing, to be collected again.
+        """
+        with self.events_lock:
+            self.dirty.update(scopes)
+            if project == "":
+                self.listing_stale = True
+            elif project is not None:
+                self.dirty_projects.add(project)
+            self.last_event = time.monotonic()
+
+    def pending(self):
+        """Return True if a shard or the project listing awaits a refresh."""
+        return bool(self.dirty or self.dirty_projects or self.listing_stale)
+
+    def flush(self):
+        """
+        Refresh every dirty shard and project listing entry, and the catalog.
+
+        Callers hold the shared lock exclusively.
+        """
+        with self.events_lock:
+            dirty, self.dirty = self.dirty, set()
+            dirty_projects, self.dirty_projects = self.dirty_projects, set()
+            if self.listing_stale:
+                self.listing_stale = False
+                self.projects = None
+
+        if dirty or dirty_projects:
+            self.sync_catalog()
+
+        for scope in sorted(dirty):
+            self.indexes[scope], _ = search_index.refresh_index(
+                self.research_root, scope, self.indexes[scope], self.workers
+            )
+
+        if self.projects is not None:
+            for name in dirty_projects:
+                self.projects[name] = list_projects.project_entry(self.research_root, self.projects_dir / name)
+
+    def sync_catalog(self):
+        """Bring the metadata catalog in line with hand edits, if it is enabled."""
+        conn = catalog.open_catalog(self.research_root, refresh=False)
+        if conn:
+            catalog.sync(conn, self.research_root)
+            catalog.close_catalog(conn, self.research_root)
+
+    def list_projects(self):
+        """Return the project listing, collecting it on first use."""
+        if self.projects is None:
+            entries = list_projects.collect_projects(self.research_root, self.workers)
+            self.projects = {entry['path'].rsplit('/', 1)[-1]: entry for entry in entries}
+        return [entry for _, entry in sorted(self.projects.items()) if entry is not None]
+
+    def handle_events(self):
+        """Consume watcher events and mark affected shards and projects dirty."""
+        with self.events_lock:
+            paths = self.watcher.read_events()
+        if paths is None:
+            self.mark_dirty(walker.SCOPES, "")
+            return
+
+        for path in paths:
+            self.mark_dirty(scopes_for(self.projects_dir, path), project_for(self.projects_dir, path))
+
+    def handle_request(self, request):
+        """Dispatch one client request and return its result."""
+        op = request.get("op")
+        args = request.get("args") or {}
+
+        if op == "ping":
+            return {
+                "pid": os.getpid(),
+                "watch": self.watch_mode,
+                "files": {scope: len(index["files"]) for scope, index in self.indexes.items()},
+            }
+
+        if op == "shutdown":
+            self.stop()
+            return {}
+
+        if op not in ("search", "list_projects"):
+            raise ValueError(f"Unknown op '{op}'")
+
+        # Changes made just before the request may not have been read yet;
+        # without inotify, poll what the request is about to read
+        if self.watcher is not None:
+            self.handle_events()
+        elif op == "search":
+            self.mark_dirty([scope for scope in args.get("scopes", ()) if scope in self.indexes])
+        else:
+            self.mark_dirty((), "")
+
+        if op == "list_projects":
+            with self.lock.shared():
+                if not self.pending() and self.projects is not None:
+                    return self.list_projects()
+            with self.lock.exclusive():
+                self.flush()
+                return self.list_projects()
+
+        if self.pending():
+            with self.lock.exclusive():
+                self.flush()
+
+        with self.lock.shared():
+            allowed = args.pop("allowed", None)
+            sections = search.search(
+                self.research_root, args.pop("scopes"), args.pop("query"),
+                allowed=set(allowed) if allowed is not None else None,
+                workers=self.workers, indexes=self.indexes, **args
+            )
+        return daemon_client.encode_hits(self.research_root, sections)
+
+    def serve_client(self, conn):
+        """Read one request line from a client and write the response."""
+        with conn:
+            conn.settimeout(5.0)
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+
+            try:
+                response = {"ok": True, "result": self.handle_request(json.loads(data))}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+
+            conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+
+    def stop(self):
+        """Make the event loop exit."""
+        self.running = False
+        if self.wakeup is not None:
+            try:
+                self.wakeup.send(b"\0")
+            except OSError:
+                pass
+
+    def timeout(self):
+        """Return how long the event loop may block."""
+        deadline = self.last_commit_check + COMMIT_CHECK_INTERVAL
+        if self.pending():
+            deadline = min(deadline, self.last_event + DEBOUNCE)
+        elif self.watcher is None:
+            deadline = min(deadline, self.last_poll + self.poll_interval)
+        return max(0.0, deadline - time.monotonic())
+
+    def serve(self, sock_path):
+        """Run the event loop until a shutdown request or signal."""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen(16)
+        server.setblocking(False)
+
+        # Written to by stop() so a shutdown request ends select() at once
+        wakeup, self.wakeup = socket.socketpair()
+        wakeup.setblocking(False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ, "client")
+        selector.register(wakeup, selectors.EVENT_READ, "wakeup")
+        if self.watcher is not None:
+            selector.register(self.watcher, selectors.EVENT_READ, "watch")
+
+        self.running = True
+        try:
+            while self.running:
+                for key, _ in selector.select(self.timeout()):
+                    if key.data == "watch":
+                        self.handle_events()
+                    elif key.data == "wakeup":
+                        wakeup.recv(64)
+                    else:
+                        try:
+                            conn, _ = server.accept()
+                        except BlockingIOError:
+                            continue
+                        threading.Thread(target=self.serve_client, args=(conn,), daemon=True).start()
+
+                now = time.monotonic()
+                if self.watcher is None and now - self.last_poll >= self.poll_interval:
+                    # Polling fallback: the stat-based refresh is incremental
+                    self.last_poll = now
+                    with self.lock.exclusive():
+                        self.mark_dirty(walker.SCOPES, "")
+                        self.flush()
+                elif self.pending() and now - self.last_event >= DEBOUNCE:
+                    with self.lock.exclusive():
+                        self.flush()
+
+                if now - self.last_commit_check >= COMMIT_CHECK_INTERVAL:
+                    # Commit a last queued batch once its commit window has passed
+                    self.last_commit_check = now
+                    autocommit.flush_due(self.research_root)
+        finally:
+            selector.close()
+            server.close()
+            self.wakeup = None
+            wakeup.close()
+            with self.events_lock:
+                if self.watcher is not None:
+                    self.watcher.close()
+            try:
+                sock_path.unlink()
+            except OSError:
+                pass
+
+
+def detach():
+    """Fork into the background, detached from the terminal."""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("start", "stop", "status"):
+        print("Usage: python3 notes_daemon.py start [--background] [--poll <seconds>] [--workers <n>]")
+        print("       python3 notes_daemon.py stop")
+        print("       python3 notes_daemon.py status")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    sock_path = daemon_client.socket_path(research_root)
+
+    status = daemon_client.request(research_root, "ping", timeout=2.0)
+
+    if command == "status":
+        if status is None:
+            print("Notes daemon is not running")
+            sys.exit(1)
+        print(f"✓ Notes daemon running (pid {status['pid']}, {status['watch']})")
+        print(f"\nSocket: {sock_path}")
+        for scope, count in status["files"].items():
+            print(f"  {scope}: {count} files")
+        return
+
+    if command == "stop":
+        if status is None:
+            print("Notes daemon is not running")
+            return
+        daemon_client.request(research_root, "shutdown", timeout=2.0)
+        print("✓ Notes daemon stopped")
+        return
+
+    if status is not None:
+        print(f"Notes daemon already running (pid {status['pid']})")
+        return
+
+    if not (research_root / "projects").exists():
+        print("No projects directory found. Run init.py first.")
+        sys.exit(1)
+
+    poll_interval = DEFAULT_POLL_INTERVAL
+    for i, arg in enumerate(sys.argv):
+        if arg == "--poll" and i + 1 < len(sys.argv):
+            try:
+                poll_interval = float(sys.argv[i + 1])
+            except ValueError:
+                print(f"Error: Invalid poll interval '{sys.argv[i + 1]}'")
+                sys.exit(1)
+
+    # A socket left behind by a crashed daemon
+    if sock_path.exists():
+        sock_path.unlink()
+
+    daemon = NotesDaemon(research_root, walker.parse_workers(sys.argv), poll_interval)
+
+    print(f"✓ Notes daemon listening on {sock_path} ({daemon.watch_mode})")
+    sys.stdout.flush()
+
+    if "--background" in sys.argv:
+        detach()
+
+    def stop(signum, frame):
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    daemon.serve(sock_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Concurrency-safe writes to note files.
+
+Scripts that change an existing note (a status, an `updated` timestamp)
+must not lose each other's edits when a sweep runs many of them in
+parallel. Every read-modify-write here happens under an exclusive
+fcntl lock on the file itself, and the new content is written to a temp
+file in the same directory and renamed over the old one, so readers see
+either the old or the new note, never a torn one.
+
+Because the rename replaces the inode that was locked, a writer that
+was waiting for the lock re-checks that it locked the file currently at
+the path and starts over otherwise.
+
+`Batch` groups edits: every edit queued for one file is applied in a
+single locked read and a single write when the batch is committed.
+
+    with notewriter.Batch() as batch:
+        batch.set(idea_dir / "idea.md", status="validated", updated=now)
+        batch.set(project_dir / "project.md", updated=now)
+"""
+
+import os
+import json
+import fcntl
+import tempfile
+from contextlib import contextmanager
+
+
+NEW_FILE_MODE = 0o644
+
+
+def atomic_write(path, content):
+    """Write a file via a temp file in the same directory and a rename."""
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = NEW_FILE_MODE
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock on an existing file.
+
+    A missing file raises FileNotFoundError.
+    """
+    while True:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            held = os.fstat(fd)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+        except BaseException:
+            os.close(fd)
+            raise
+
+        if current is not None and (current.st_dev, current.st_ino) == (held.st_dev, held.st_ino):
+            break
+        # Replaced while we waited; lock the new file instead
+        os.close(fd)
+
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def edit(path, *changes):
+    """
+    Apply changes to a file in one locked read-modify-write.
+
+    Each change is a function from the old content to the new content.
+    Returns True if the file changed.
+    """
+    with locked(path):
+        with open(path, 'r', encoding="utf-8") as f:
+            old = f.read()
+        content = old
+        for change in changes:
+            content = change(content)
+        if content == old:
+            return False
+        atomic_write(path, content)
+        return True
+
+
+def format_value(value):
+    """Format a Python value as a frontmatter value."""
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), ensure_ascii=False)
+    return str(value)
+
+
+def set_frontmatter(content, fields):
+    """
+    Return content with frontmatter fields set.
+
+    Existing `key:` lines are replaced in place; new keys are added at
+    the end of the frontmatter. Content without frontmatter is returned
+    unchanged.
+    """
+    lines = content.split("\n")
+    if not lines or lines[0].strip() != "---":
+        return content
+
+    end = None
+    remaining = dict(fields)
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip() == "---":
+            end = i
+            break
+        if ':' not in line or line.startswith((' ', '\t', '#')):
+            continue
+        key = line.split(':', 1)[0].strip()
+        if key in remaining:
+            lines[i] = f"{key}: {format_value(remaining.pop(key))}"
+
+    if end is None:
+        return content
+    if remaining:
+        lines[end:end] = [f"{key}: {format_value(value)}" for key, value in remaining.items()]
+    return "\n".join(lines)
+
+
+def update_frontmatter(path, **fields):
+    """Set frontmatter fields of a note under its lock."""
+    return edit(path, lambda content: set_frontmatter(content, fields))
+
+
+class Batch:
+    """
+    Queue edits to note files and write each file once on commit.
+
+    Edits to one file are applied in the order they were queued, in a
+    single locked read-modify-write. Used as a context manager the batch
+    commits when the block exits without an exception.
+    """
+
+    def __init__(self):
+        self.changes = {}
+
+    def edit(self, path, change):
+        """Queue a content -> content function for a file."""
+        self.changes.setdefault(path, []).append(change)
+
+    def set(self, path, **fields):
+        """Queue frontmatter fields to set in a file."""
+        self.edit(path, lambda content: set_frontmatter(content, fields))
+
+    def commit(self):
+        """Write every queued file. Returns the number of files changed."""
+        changed = 0
+        changes, self.changes = self.changes, {}
+        for path in sorted(changes):
+            if edit(path, *changes[path]):
+                changed += 1
+        return changed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
@@ -2,19 +2,59 @@
 """
 Sync research notes to Notion.
 
+Every project, idea and experiment note becomes one page in the Notion
+database. A local state file (.notion-sync-state.json) remembers, per
+note, the remote page ID and a hash of its frontmatter and body, so an
+incremental sync only pushes notes that actually changed:
+
+- frontmatter changed: one properties update
+- body changed: the page is recreated with the new content and the old
+  page archived (Notion has no single-call way to replace page content),
+  so the note gets a new page ID and links to the old page break
+- note deleted: its page is archived
+
+Pages are pushed by the asyncio transport in notion_transport.py
+(bounded in-flight requests, token-bucket rate limit, jittered retries).
+Every finished push is appended to a checkpoint journal
+(.notion-sync-checkpoint.jsonl), so an interrupted sync resumes where it
+stopped instead of starting over. Set notion.base_url in config.yaml to
+point the sync at a local stub of the Notion API.
+
 Usage:
     python3 notion_sync.py [--project <project>] [--all] [--incremental]
 """
 
 import sys
-import yaml
-from pathlib import Path
+import json
+import hashlib
+from datetime import datetime
+
+import frontmatter
+import locator
+import notewriter
+import resolver
+import walker
+
+
+STATE_FILE = ".notion-sync-state.json"
+STATE_VERSION = 1
+CHECKPOINT_FILE = ".notion-sync-checkpoint.jsonl"
+
+DEFAULT_BATCH_SIZE = 50  # pushes between state file saves
+
+# Notion API limits
+MAX_TEXT = 2000
+
+NOTE_TYPES = {
+    "project": None,  # taken from the project's `type` field
+    "idea": "Idea",
+    "experiment": "Experiment",
+}
 
 
 def load_config():
     """Load configuration."""
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
+    _, research_root = locator.locate()
     config_path = research_root / "config.yaml"
 
     if not config_path.exists():
@@ -22,8 +62,7 @@ def load_config():
         print("Run init.py first to create config")
         sys.exit(1)
 
-    with open(config_path, 'r', encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return locator.load_config(research_root)
 
 
 def check_notion_installed():
@@ -35,6 +74,269 @@ def check_notion_installed():
         return False
 
 
+def load_state(research_root, database_id):
+    """Load the sync state; a state for another database starts over."""
+    try:
+        with open(research_root / STATE_FILE, 'r', encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = None
+
+    if (not state or state.get("version") != STATE_VERSION
+            or state.get("database_id") != database_id):
+        state = {"version": STATE_VERSION, "database_id": database_id, "pages": {}}
+    return state
+
+
+def save_state(research_root, state):
+    """Write the sync state atomically."""
+    notewriter.atomic_write(research_root / STATE_FILE, json.dumps(state, separators=(",", ":")))
+
+
+def split_note(content):
+    """Split note content into (frontmatter text, body)."""
+    if content.startswith("---"):
+        end = content.find("\n---", 3)
+        if end != -1:
+            body_start = content.find("\n", end + 4)
+            body_start = len(content) if body_start == -1 else body_start + 1
+            return content[:body_start], content[body_start:]
+    return "", content
+
+
+def content_hash(text):
+    """Return a short stable hash of note text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def parse_date(value):
+    """Return value as an ISO date for Notion, or None if it is not one."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        return None
+
+
+def note_properties(kind, metadata):
+    """Build Notion database properties from note frontmatter."""
+    properties = {
+        "Name": {"title": [{"text": {"content": (metadata.get("title") or "Untitled")[:MAX_TEXT]}}]},
+    }
+
+    note_type = NOTE_TYPES[kind] or (metadata.get("type") or "project").title()
+    properties["Type"] = {"select": {"name": note_type}}
+
+    for name, key in (("Status", "status"), ("Priority", "priority")):
+        value = metadata.get(key)
+        if value:
+            properties[name] = {"select": {"name": value.replace("-", " ").title()}}
+
+    tags = metadata.get("tags")
+    if isinstance(tags, list):
+        properties["Tags"] = {"multi_select": [{"name": tag[:100]} for tag in tags if "," not in tag]}
+
+    for name, key in (("Created", "created"), ("Updated", "updated")):
+        date = parse_date(metadata.get(key))
+        if date:
+            properties[name] = {"date": {"start": date}}
+
+    return properties
+
+
+def rich_text(text):
+    """Split text into Notion rich text items within the length limit."""
+    return [{"type": "text", "text": {"content": text[i:i + MAX_TEXT]}}
+            for i in range(0, len(text), MAX_TEXT)]
+
+
+def markdown_blocks(body):
+    """Convert a markdown note body into Notion blocks."""
+    blocks = []
+    paragraph = []
+
+    def flush():
+        if paragraph:
+            blocks.append(block("paragraph", "\n".join(paragraph)))
+            paragraph.clear()
+
+    for line in body.split("\n"):
+        stripped = line.strip()
+        if not stripped:
+            flush()
+        elif stripped.startswith("### "):
+            flush()
+            blocks.append(block("heading_3", stripped[4:]))
+        elif stripped.startswith("## "):
+            flush()
+            blocks.append(block("heading_2", stripped[3:]))
+        elif stripped.startswith("# "):
+            flush()
+            blocks.append(block("heading_1", stripped[2:]))
+        elif stripped.startswith(("- [ ] ", "- [x] ")):
+            flush()
+            item = block("to_do", stripped[6:])
+            item["to_do"]["checked"] = stripped[3] == "x"
+            blocks.append(item)
+        elif stripped.startswith(("- ", "* ")):
+            flush()
+            blocks.append(block("bulleted_list_item", stripped[2:]))
+        else:
+            paragraph.append(line)
+
+    flush()
+    return blocks
+
+
+def block(block_type, text):
+    """Build one Notion block of the given type."""
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text(text)}}
+
+
+def collect_notes(research_root, project_dir=None):
+    """Return the Notes to sync, optionally limited to one project."""
+    notes = []
+    for note in walker.walk(research_root / "projects"):
+        if note.path is None:
+            continue
+        if project_dir is not None and note.project_dir != project_dir:
+            continue
+        notes.append(note)
+    return notes
+
+
+def plan_sync(research_root, notes, state, incremental=True, project_dir=None, done=(), workers=None):
+    """
+    Compare notes against the sync state and return (ops, unchanged).
+
+    Each op is a dict with an `action` (create, update, replace or
+    archive) and the note's new state entry. Every sync compares hashes,
+    so only changed notes are pushed and touched-but-identical notes only
+    get their stat refreshed in state. With incremental, notes whose
+    (mtime, size) match the state are skipped without being read; a full
+    sync reads them all. Notes in `done` were already pushed by the
+    interrupted run being resumed and are treated as incremental even in
+    a full sync.
+    """
+    pages = state["pages"]
+    ops = []
+    unchanged = 0
+
+    def inspect(note):
+        rel = note.path.relative_to(research_root).as_posix()
+        entry = pages.get(rel)
+        try:
+            stat = note.path.stat()
+        except OSError:
+            return rel, None, None
+
+        if ((incremental or rel in done) and entry and entry.get("mtime_ns") == stat.st_mtime_ns
+                and entry.get("size") == stat.st_size):
+            return rel, entry, None
+
+        try:
+            content = note.path.read_text(encoding="utf-8")
+        except OSError:
+            return rel, None, None
+        return rel, entry, (stat, content)
+
+    seen = set()
+    for note, (rel, entry, read) in zip(notes, walker.parallel_map(inspect, notes, workers)):
+        seen.add(rel)
+        if read is None:
+            unchanged += entry is not None
+            continue
+
+        stat, content = read
+        header, body = split_note(content)
+        new_entry = {
+            "page_id": entry.get("page_id") if entry else None,
+            "meta_hash": content_hash(header),
+            "body_hash": content_hash(body),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+        if not entry or not entry.get("page_id"):
+            action = "create"
+        elif entry.get("body_hash") != new_entry["body_hash"]:
+            action = "replace"
+        elif entry.get("meta_hash") != new_entry["meta_hash"]:
+            action = "update"
+        else:
+            pages[rel] = new_entry
+            unchanged += 1
+            continue
+
+        metadata = frontmatter.parse(header)
+        ops.append({
+            "action": action,
+            "rel": rel,
+            "entry": new_entry,
+            "properties": note_properties(note.kind, metadata),
+            "children": markdown_blocks(body) if action != "update" else None,
+        })
+
+    prefix = None
+    if project_dir is not None:
+        prefix = project_dir.relative_to(research_root).as_posix() + "/"
+
+    for rel, entry in pages.items():
+        if rel in seen or (prefix and not rel.startswith(prefix)):
+            continue
+        ops.append({"action": "archive", "rel": rel, "entry": entry})
+
+    return ops, unchanged
+
+
+def apply_push(state, op, page_id):
+    """Record a finished push in the sync state."""
+    if op["action"] == "archive":
+        state["pages"].pop(op["rel"], None)
+    else:
+        state["pages"][op["rel"]] = dict(op["entry"], page_id=page_id)
+
+
+def load_checkpoint(research_root, state, run):
+    """
+    Replay the checkpoint of an interrupted sync into the state.
+
+    Returns the notes that run already pushed if it was the same kind of
+    run (same project, same incremental flag), else an empty set.
+    """
+    try:
+        with open(research_root / CHECKPOINT_FILE, 'r', encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return set()
+
+    done = set()
+    header = None
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            break  # torn final write
+        if header is None:
+            header = record
+            continue
+        op = {"action": record["action"], "rel": record["rel"], "entry": record["entry"]}
+        apply_push(state, op, record["page_id"])
+        done.add(record["rel"])
+
+    return done if header and header.get("run") == run else set()
+
+
+def open_checkpoint(research_root, run, resume):
+    """Open the checkpoint journal, starting a new one unless resuming."""
+    f = open(research_root / CHECKPOINT_FILE, 'a' if resume else 'w', encoding="utf-8")
+    if not resume:
+        f.write(json.dumps({"run": run}) + "\n")
+        f.flush()
+    return f
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 notion_sync.py [--project <project>] [--all] [--incremental]")
@@ -44,8 +346,9 @@ def main():
 
     # Load config
     config = load_config()
+    notion_config = config.get('notion', {})
 
-    if not config.get('notion', {}).get('enabled', False):
+    if not notion_config.get('enabled', False):
         print("Error: Notion sync is not enabled")
         print("Edit config.yaml and set notion.enabled: true")
         print("Add your Notion integration token and database ID")
@@ -57,10 +360,7 @@ def main():
         print("Install with: pip install notion-client")
         sys.exit(1)
 
-    from notion_client import Client
-
-    notion = Client(auth=config['notion']['token'])
-    database_id = config['notion']['database_id']
+    database_id = notion_config['database_id']
 
     # Parse arguments
     project_name = None
@@ -75,29 +375,88 @@ def main():
         elif arg == "--incremental":
             incremental = True
 
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    project_dir = None
+    if project_name and not sync_all:
+        project_dir = resolver.resolve_project(research_root, project_name)
+        if not project_dir:
+            print(f"Error: Project '{project_name}' not found")
+            sys.exit(1)
+
     print("✓ Notion sync initialized")
     print(f"\nConfiguration:")
     print(f"  Database ID: {database_id}")
-    print(f"  Sync All: {sync_all}")
+    print(f"  Sync All: {project_dir is None}")
     print(f"  Incremental: {incremental}")
-    if project_name:
+    if project_dir:
         print(f"  Project: {project_name}")
 
-    # For now, just show sync status
-    print("\n🔄 Sync would happen here (notion-client integration)")
-    print("\nTo complete Notion integration:")
-    print("1. Create a Notion integration at https://www.notion.so/my-integrations")
-    print("2. Create a database with required properties")
-    print("3. Share the database with your integration")
-    print("4. Add the token and database ID to config.yaml")
-    print("\nRequired database properties:")
-    print("  - Name (Title)")
-    print("  - Type (Select)")
-    print("  - Status (Select)")
-    print("  - Tags (Multi-select)")
-    print("  - Created (Date)")
-    print("  - Updated (Date)")
-    print("  - Priority (Select)")
+    run = {"incremental": incremental, "project": project_dir.name if project_dir else None}
+    state = load_state(research_root, database_id)
+    done = load_checkpoint(research_root, state, run)
+    if done:
+        print(f"\n↻ Resuming interrupted sync ({len(done)} notes already pushed)")
+
+    notes = collect_notes(research_root, project_dir)
+    ops, unchanged = plan_sync(research_root, notes, state, incremental, project_dir, done)
+
+    counts = {}
+    for op in ops:
+        counts[op["action"]] = counts.get(op["action"], 0) + 1
+
+    print(f"\n🔄 {len(notes)} notes, {unchanged} unchanged")
+    for action in ("create", "update", "replace", "archive"):
+        if counts.get(action):
+            print(f"  {action}: {counts[action]}")
+
+    failures = []
+    if ops:
+        import notion_transport
+
+        batch_size = notion_config.get('batch_size', DEFAULT_BATCH_SIZE)
+        checkpoint = open_checkpoint(research_root, run, resume=bool(done))
+        pushed = 0
+
+        def on_done(op, page_id, error):
+            nonlocal pushed
+            if error is not None:
+                return
+            apply_push(state, op, page_id)
+            checkpoint.write(json.dumps({
+                "action": op["action"], "rel": op["rel"], "entry": op["entry"], "page_id": page_id,
+            }) + "\n")
+            checkpoint.flush()
+            pushed += 1
+            if pushed % batch_size == 0:
+                save_state(research_root, state)
+                print(f"  {pushed}/{len(ops)} pushed")
+
+        try:
+            failures, transport = notion_transport.run_push(notion_config, database_id, ops, on_done)
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Sync interrupted after {pushed}/{len(ops)} pushes")
+            print("Run the same command again to resume")
+            sys.exit(130)
+        finally:
+            checkpoint.close()
+            save_state(research_root, state)
+
+        print(f"  {pushed}/{len(ops)} pushed ({transport.requests} requests, {transport.retries} retries)")
+    else:
+        save_state(research_root, state)
+
+    # The state now holds everything the checkpoint recorded
+    (research_root / CHECKPOINT_FILE).unlink(missing_ok=True)
+
+    if failures:
+        print(f"\n⚠️  {len(failures)} notes failed to sync:")
+        for op, error in failures[:10]:
+            print(f"  {op['rel']}: {error}")
+        sys.exit(1)
+
+    print("\n✓ Notion sync complete")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Asynchronous transport for pushing notes to Notion.
+
+Sync ops (see notion_sync.plan_sync) are executed by a fixed number of
+worker coroutines sharing one notion_client.AsyncClient, which bounds the
+number of requests in flight. Every request first takes a token from a
+shared token bucket so the integration stays within Notion's rate limit,
+and 429/5xx responses and timeouts are retried with jittered exponential
+backoff (honouring Retry-After when the API sends it).
+
+Requires: pip install notion-client
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+
+DEFAULT_IN_FLIGHT = 3
+DEFAULT_RATE_LIMIT = 3.0  # requests per second, Notion's documented average
+DEFAULT_BURST = 3
+MAX_RETRIES = 6
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30.0
+
+# Notion API limits
+MAX_BLOCKS = 100
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for and take one token."""
+        if self.rate <= 0:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Hold every request back, e.g. after a 429 response."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+def is_retryable(error):
+    """Return True for rate-limit, server and timeout errors."""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("RequestTimeoutError", "ConnectError", "ReadError",
+                                    "WriteError", "RemoteProtocolError", "PoolTimeout")
+
+
+def retry_after(error):
+    """Return the Retry-After delay of an error response in seconds, or None."""
+    headers = getattr(error, "headers", None)
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt):
+    """Full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class Transport:
+    """Rate-limited, retrying caller for AsyncClient endpoints."""
+
+    def __init__(self, notion, rate=DEFAULT_RATE_LIMIT, burst=DEFAULT_BURST):
+        self.notion = notion
+        self.bucket = TokenBucket(rate, burst)
+        self.requests = 0
+        self.retries = 0
+
+    async def call(self, endpoint, **kwargs):
+        """Call an endpoint, retrying on 429, 5xx and timeouts."""
+        for attempt in range(MAX_RETRIES + 1):
+            await self.bucket.acquire()
+            self.requests += 1
+            try:
+                return await endpoint(**kwargs)
+            except Exception as e:
+                if attempt == MAX_RETRIES or not is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = retry_after(e)
+                if getattr(e, "status", None) == 429:
+                    self.bucket.pause(delay if delay is not None else backoff(attempt + 1))
+                else:
+                    await asyncio.sleep(delay if delay is not None else backoff(attempt))
+
+    async def run_op(self, database_id, op):
+        """
+        Execute one sync op and return the note's new page ID.
+
+        When a call after creating a page fails, the new page is archived
+        again before the error is raised, so a failed create or replace
+        leaves no orphaned page behind.
+        """
+        pages = self.notion.pages
+        action = op["action"]
+        page_id = op["entry"].get("page_id")
+
+        if action == "archive":
+            if page_id:
+                await self.call(pages.update, page_id=page_id, archived=True)
+            return None
+
+        if action == "update":
+            await self.call(pages.update, page_id=page_id, properties=op["properties"])
+            return page_id
+
+        children = op["children"]
+        page = await self.call(
+            pages.create,
+            parent={"database_id": database_id},
+            properties=op["properties"],
+            children=children[:MAX_BLOCKS],
+        )
+        try:
+            for i in range(MAX_BLOCKS, len(children), MAX_BLOCKS):
+                await self.call(self.notion.blocks.children.append,
+                                block_id=page["id"], children=children[i:i + MAX_BLOCKS])
+
+            if action == "replace" and page_id:
+                await self.call(pages.update, page_id=page_id, archived=True)
+        except Exception:
+            # The op fails and the state keeps the old page, so the new
+            # page must not outlive it; the next sync creates it again
+            try:
+                await self.call(pages.update, page_id=page["id"], archived=True)
+            except Exception:
+                pass
+            raise
+        return page["id"]
+
+
+async def push(transport, database_id, ops, on_done, in_flight=DEFAULT_IN_FLIGHT):
+    """
+    Execute ops with at most `in_flight` running at once.
+
+    on_done(op, page_id, error) is called as each op finishes. Returns
+    the list of (op, error) failures.
+    """
+    queue = asyncio.Queue()
+    for op in ops:
+        queue.put_nowait(op)
+
+    failures = []
+
+    async def worker():
+        while True:
+            try:
+                op = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                page_id = await transport.run_op(database_id, op)
+            except Exception as e:
+                failures.append((op, e))
+                on_done(op, None, e)
+            else:
+                on_done(op, page_id, None)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(in_flight, len(ops))))))
+    return failures
+
+
+def make_client(notion_config):
+    """Create an AsyncClient from the config['notion'] settings."""
+    from notion_client import AsyncClient
+    from notion_client.client import ClientOptions
+
+    # Failed requests are reported by notion_sync, not logged per attempt
+    options = {"auth": notion_config['token'], "log_level": logging.ERROR}
+    if notion_config.get('base_url'):
+        options["base_url"] = notion_config['base_url']
+    if "retry" in getattr(ClientOptions, "__dataclass_fields__", {}):
+        # Retries are handled by Transport so they share the rate limit
+        options["retry"] = False
+    return AsyncClient(**options)
+
+
+def run_push(notion_config, database_id, ops, on_done):
+    """Push ops using the config['notion'] settings; returns (failures, transport)."""
+
+    async def main():
+        notion = make_client(notion_config)
+        transport = Transport(
+            notion,
+            rate=notion_config.get('rate_limit', DEFAULT_RATE_LIMIT),
+            burst=notion_config.get('burst', DEFAULT_BURST),
+        )
+        try:
+            failures = await push(transport, database_id, ops, on_done,
+                                  notion_config.get('in_flight', DEFAULT_IN_FLIGHT))
+        finally:
+            await notion.aclose()
+        return failures, transport
+
+    return asyncio.run(main())
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Static HTML report of the research notes.
+
+Writes to `research-notes/report/` (or --out):
+
+- `index.html` - every project with its status, idea and experiment counts
+- `projects/<project>.html` - one page per project: ideas with their
+  validation status, and a table of experiments with their metrics
+- `validation.html` - all ideas grouped by validation status
+- `tags/<tag>.html` - one page per tag, listing the notes that carry it
+
+Rebuilds are incremental. Every page has a list of the source notes it
+is rendered from (a project page depends on that project's project.md,
+idea.md, validation.md, experiment.md and results.md files, a tag page
+on the notes with that tag and on their projects' project.md for the
+project titles, and so on). `.report-state.json` in the
+output directory keeps each page's source fingerprints (mtime and size)
+from the last render and the data extracted from each note, so a run
+parses only changed notes and re-renders only pages whose sources
+changed: editing one results.md re-renders just its project page.
+index.html shows only project fields, idea statuses and experiment
+counts, so it is keyed on that data instead of on every note's
+fingerprint and editing an idea or experiment note leaves it alone.
+Pages are rendered in a process pool when many are out of date; pages
+of deleted projects and unused tags are removed.
+
+Usage:
+    python3 report.py [--out <dir>] [--full] [--workers <n>]
+"""
+
+import sys
+import os
+import json
+import hashlib
+import tempfile
+from html import escape
+from pathlib import Path
+
+import frontmatter
+import locator
+import metrics
+import walker
+
+
+REPORT_DIR = "report"
+STATE_FILE = ".report-state.json"
+STATE_VERSION = 1
+# Bump when the page layout changes, so every page is rendered again
+RENDER_VERSION = 1
+
+# Below this many pages to render, a process pool costs more than it saves
+POOL_MIN_PAGES = 32
+
+STATUSES = ["unverified", "planned", "in-progress", "validated", "rejected", "on-hold"]
+
+FIELDS = {
+    "project": ("title", "type", "status", "priority", "tags", "created", "updated"),
+    "idea": ("title", "status", "priority", "tags", "updated"),
+    "validation": ("status", "validated"),
+    "experiment": ("title", "status", "tags", "updated"),
+}
+
+STYLE = """body { font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; margin: 2rem auto; max-width: 72rem; padding: 0 1rem; color: #222; }
+a { color: #0b5cad; text-decoration: none; }
+a:hover { text-decoration: underline; }
+table { border-collapse: collapse; margin: 1rem 0; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.35rem 0.6rem; text-align: left; vertical-align: top; }
+th { background: #f5f5f5; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+.status { border-radius: 0.6rem; font-size: 0.85em; padding: 0.05rem 0.5rem; background: #eee; }
+.status-validated { background: #d4f4dd; }
+.status-rejected { background: #f8d7da; }
+.status-in-progress { background: #fff3cd; }
+.status-planned { background: #dbe9ff; }
+.tag { margin-right: 0.4rem; }
+nav { margin-bottom: 1.5rem; }
+"""
+
+
+def fingerprint(path):
+    """Return [mtime_ns, size] of a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def read_record(item):
+    """Extract the data the report shows from one source note."""
+    kind, path = item
+    try:
+        if kind == "results":
+            return {"metrics": metrics.parse_metrics(Path(path).read_text(encoding="utf-8"))}
+        meta = frontmatter.read(Path(path))
+    except (OSError, UnicodeDecodeError):
+        return {}
+    return {field: meta.get(field) for field in FIELDS[kind]}
+
+
+def collect(research_root):
+    """
+    Walk the notes tree.
+
+    Returns (projects, sources): projects is a list of
+    {"slug", "source", "ideas": [{"slug", "source", "validation",
+    "experiments": [{"slug", "source", "results"}]}]} with source paths
+    relative to the notes root, and sources maps each path to its kind.
+    """
+    projects = []
+    sources = {}
+
+    def add(kind, rel):
+        sources[rel] = kind
+        return rel
+
+    for note in walker.walk(research_root / "projects"):
+        slug = note.dir.name
+        if note.kind == "project":
+            project_rel = f"projects/{slug}"
+            project = {"slug": slug, "source": add("project", f"{project_rel}/project.md"), "ideas": []}
+            projects.append(project)
+        elif note.kind == "idea":
+            idea_rel = f"{project_rel}/ideas/{slug}"
+            idea = {
+                "slug": slug,
+                "source": add("idea", f"{idea_rel}/idea.md"),
+                "validation": add("validation", f"{idea_rel}/validation.md"),
+                "experiments": [],
+            }
+            project["ideas"].append(idea)
+        else:
+            experiment_rel = f"{idea_rel}/experiments/{slug}"
+            idea["experiments"].append({
+                "slug": slug,
+                "source": add("experiment", f"{experiment_rel}/experiment.md"),
+                "results": add("results", f"{experiment_rel}/results.md"),
+            })
+    return projects, sources
+
+
+def load_state(out_dir, full=False):
+    if not full:
+        try:
+            with open(out_dir / STATE_FILE, 'r', encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION and state.get("render") == RENDER_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+    return {"version": STATE_VERSION, "render": RENDER_VERSION, "sources": {}, "pages": {}}
+
+
+def save_state(out_dir, state):
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=f"{STATE_FILE}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(json.dumps(state, separators=(",", ":"), ensure_ascii=False))
+        os.replace(tmp_path, out_dir / STATE_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def refresh_records(research_root, sources, state, workers):
+    """
+    Return {path: (fingerprint, record)} for every existing source,
+    parsing only notes whose fingerprint changed since the last run.
+    """
+    paths = sorted(sources)
+    root = str(research_root)
+    prints = walker.parallel_map(fingerprint, [os.path.join(root, p) for p in paths], workers)
+
+    records = {}
+    changed = []
+    for path, current in zip(paths, prints):
+        if current is None:
+            continue
+        cached = state["sources"].get(path)
+        if cached and cached[0] == current:
+            records[path] = (current, cached[1])
+        else:
+            changed.append((path, current))
+
+    parsed = walker.parallel_map(read_record, [(sources[p], os.path.join(root, p)) for p, _ in changed], workers)
+    for (path, current), record in zip(changed, parsed):
+        records[path] = (current, record)
+    return records, len(changed)
+
+
+def tag_slug(tag):
+    return "".join(c if c.isalnum() or c in "-_." else "-" for c in tag.lower()) or "-"
+
+
+def project_sources(project):
+    paths = [project["source"]]
+    for idea in project["ideas"]:
+        paths += [idea["source"], idea["validation"]]
+        for experiment in idea["experiments"]:
+            paths += [experiment["source"], experiment["results"]]
+    return paths
+
+
+def note_tags(records, path):
+    record = records.get(path)
+    tags = record[1].get("tags") if record else None
+    return tags if isinstance(tags, list) else []
+
+
+def build_graph(projects, records):
+    """
+    Return {page: (kind, key, source paths)} for every page of the report.
+
+    `key` identifies what the page is about: a project slug, or for a tag
+    page the tag and its notes. Pages that show project titles (tag pages
+    and validation.html) also depend on those projects' project.md.
+    index.html has no source list; build_report() keys it on its data.
+    """
+    pages = {"style.css": ("style", None, [])}
+
+    ideas = []
+    tagged = {}
+    for project in projects:
+        pages[f"projects/{project['slug']}.html"] = ("project", project["slug"], project_sources(project))
+        for tag in note_tags(records, project["source"]):
+            tagged.setdefault(tag, []).append(project["source"])
+        for idea in project["ideas"]:
+            ideas += [idea["source"], idea["validation"]]
+            for tag in note_tags(records, idea["source"]):
+                tagged.setdefault(tag, []).append(idea["source"])
+            for experiment in idea["experiments"]:
+                for tag in note_tags(records, experiment["source"]):
+                    tagged.setdefault(tag, []).append(experiment["source"])
+
+    pages["index.html"] = ("index", None, [])
+    pages["validation.html"] = ("validation", None, ideas + [p["source"] for p in projects if p["ideas"]])
+
+    # Tags that differ only in case share a page
+    by_slug = {}
+    for tag in sorted(tagged):
+        by_slug.setdefault(tag_slug(tag), []).append(tag)
+    for slug, tags in by_slug.items():
+        paths = sorted({p for tag in tags for p in tagged[tag]})
+        project_paths = sorted({"/".join(p.split("/")[:2]) + "/project.md" for p in paths} - set(paths))
+        pages[f"tags/{slug}.html"] = ("tag", (tags[0], paths), paths + project_paths)
+
+    return pages
+
+
+def page_digest(sources, records):
+    """Hash the fingerprints of a page's sources; any change re-renders it."""
+    h = hashlib.sha1()
+    for path in sources:
+        record = records.get(path)
+        h.update(f"{path}\0{record[0] if record else None}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def payload_digest(payload):
+    """Hash the data a page shows; only a change to it re-renders the page."""
+    content = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def data(records, path):
+    record = records.get(path)
+    return record[1] if record else {}
+
+
+def project_payload(project, records):
+    ideas = []
+    for idea in project["ideas"]:
+        experiments = [dict(data(records, e["source"]), slug=e["slug"], source=e["source"],
+                            metrics=data(records, e["results"]).get("metrics") or [])
+                       for e in idea["experiments"]]
+        ideas.append(dict(data(records, idea["source"]), slug=idea["slug"], source=idea["source"],
+                          validated=data(records, idea["validation"]).get("validated"),
+                          experiments=experiments))
+    return dict(data(records, project["source"]), slug=project["slug"], source=project["source"], ideas=ideas)
+
+
+def index_payload(projects, records):
+    rows = []
+    for project in projects:
+        statuses = [data(records, idea["source"]).get("status") for idea in project["ideas"]]
+        rows.append(dict(data(records, project["source"]), slug=project["slug"],
+                         ideas=len(project["ideas"]),
+                         validated=statuses.count("validated"),
+                         experiments=sum(len(idea["experiments"]) for idea in project["ideas"])))
+    return {"projects": rows}
+
+
+def validation_payload(projects, records):
+    ideas = []
+    for project in projects:
+        project_title = data(records, project["source"]).get("title") or project["slug"]
+        for idea in project["ideas"]:
+            record = data(records, idea["source"])
+            ideas.append({
+                "title": record.get("title") or idea["slug"],
+                "status": record.get("status") or "unverified",
+                "priority": record.get("priority"),
+                "validated": data(records, idea["validation"]).get("validated"),
+                "project": project_title,
+                "project_slug": project["slug"],
+            })
+    return {"ideas": ideas}
+
+
+def tag_payload(tag, sources, records, titles):
+    notes = []
+    for path in sources:
+        record = data(records, path)
+        parts = path.split("/")
+        notes.append({
+            "title": record.get("title") or parts[-2],
+            "kind": Path(path).stem,
+            "status": record.get("status"),
+            "project": titles.get(parts[1], parts[1]),
+            "project_slug": parts[1],
+        })
+    return {"tag": tag, "notes": notes}
+
+
+def esc(value):
+    return escape("" if value is None else str(value))
+
+
+def status_badge(status):
+    status = status or "unverified"
+    return f'<span class="status status-{esc(status)}">{esc(status)}</span>'
+
+
+def tag_links(tags, prefix):
+    if not isinstance(tags, list):
+        return ""
+    return "".join(f'<a class="tag" href="{prefix}tags/{esc(tag_slug(t))}.html">#{esc(t)}</a>' for t in tags)
+
+
+def page(title, body, prefix):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{esc(title)}</title>
+<link rel="stylesheet" href="{prefix}style.css">
+</head>
+<body>
+<nav><a href="{prefix}index.html">Projects</a> · <a href="{prefix}validation.html">Validation</a></nav>
+{body}
+</body>
+</html>
+"""
+
+
+def render_index(payload, notes_link):
+    rows = []
+    for p in payload["projects"]:
+        rows.append(
+            f'<tr><td><a href="projects/{esc(p["slug"])}.html">{esc(p.get("title") or p["slug"])}</a></td>'
+            f'<td>{esc(p.get("type"))}</td><td>{status_badge(p.get("status"))}</td>'
+            f'<td class="num">{p["ideas"]}</td><td class="num">{p["validated"]}</td>'
+            f'<td class="num">{p["experiments"]}</td><td>{tag_links(p.get("tags"), "")}</td>'
+            f'<td>{esc(p.get("updated"))}</td></tr>')
+    body = (f"<h1>Research Projects</h1>\n<p>{len(rows)} projects</p>\n"
+            "<table>\n<tr><th>Project</th><th>Type</th><th>Status</th><th>Ideas</th><th>Validated</th>"
+            "<th>Experiments</th><th>Tags</th><th>Updated</th></tr>\n" + "\n".join(rows) + "\n</table>")
+    return page("Research Projects", body, "")
+
+
+def render_project(payload, notes_link):
+    prefix = "../"
+    title = payload.get("title") or payload["slug"]
+    parts = [
+        f"<h1>{esc(title)}</h1>",
+        f"<p>{status_badge(payload.get('status'))} {esc(payload.get('type'))} · "
+        f"created {esc(payload.get('created'))} · updated {esc(payload.get('updated'))} · "
+        f'<a href="{esc(notes_link(payload["source"]))}">project.md</a></p>',
+        f"<p>{tag_links(payload.get('tags'), prefix)}</p>",
+        "<h2>Ideas</h2>",
+    ]
+
+    if not payload["ideas"]:
+        parts.append("<p>No ideas yet.</p>")
+    else:
+        rows = []
+        for idea in payload["ideas"]:
+            rows.append(
+                f'<tr><td><a href="#{esc(idea["slug"])}">{esc(idea.get("title") or idea["slug"])}</a></td>'
+                f'<td>{status_badge(idea.get("status"))}</td><td>{esc(idea.get("priority"))}</td>'
+                f'<td class="num">{len(idea["experiments"])}</td><td>{esc(idea.get("validated"))}</td>'
+                f'<td>{tag_links(idea.get("tags"), prefix)}</td></tr>')
+        parts.append("<table>\n<tr><th>Idea</th><th>Status</th><th>Priority</th><th>Experiments</th>"
+                     "<th>Validated</th><th>Tags</th></tr>\n" + "\n".join(rows) + "\n</table>")
+
+    for idea in payload["ideas"]:
+        parts.append(f'<h3 id="{esc(idea["slug"])}">{esc(idea.get("title") or idea["slug"])} '
+                     f'{status_badge(idea.get("status"))}</h3>')
+        if not idea["experiments"]:
+            parts.append("<p>No experiments yet.</p>")
+            continue
+
+        names = []
+        for experiment in idea["experiments"]:
+            for name, _ in experiment["metrics"]:
+                if name not in names:
+                    names.append(name)
+
+        header = "".join(f"<th>{esc(n)}</th>" for n in names)
+        rows = []
+        for experiment in idea["experiments"]:
+            values = dict(experiment["metrics"])
+            cells = "".join(f'<td class="num">{values[n]:g}</td>' if n in values else "<td></td>" for n in names)
+            rows.append(
+                f'<tr><td><a href="{esc(notes_link(experiment["source"]))}">'
+                f'{esc(experiment.get("title") or experiment["slug"])}</a></td>'
+                f'<td>{status_badge(experiment.get("status"))}</td>{cells}</tr>')
+        parts.append(f"<table>\n<tr><th>Experiment</th><th>Status</th>{header}</tr>\n"
+                     + "\n".join(rows) + "\n</table>")
+
+    return page(title, "\n".join(parts), prefix)
+
+
+def render_validation(payload, notes_link):
+    parts = ["<h1>Idea Validation</h1>"]
+    for status in STATUSES + sorted({i["status"] for i in payload["ideas"]} - set(STATUSES)):
+        ideas = [i for i in payload["ideas"] if i["status"] == status]
+        if not ideas:
+            continue
+        rows = [f'<tr><td>{esc(i["title"])}</td>'
+                f'<td><a href="projects/{esc(i["project_slug"])}.html">{esc(i["project"])}</a></td>'
+                f'<td>{esc(i["priority"])}</td><td>{esc(i["validated"])}</td></tr>' for i in ideas]
+        parts.append(f"<h2>{status_badge(status)} {len(ideas)}</h2>")
+        parts.append("<table>\n<tr><th>Idea</th><th>Project</th><th>Priority</th><th>Validated</th></tr>\n"
+                     + "\n".join(rows) + "\n</table>")
+    return page("Idea Validation", "\n".join(parts), "")
+
+
+def render_tag(payload, notes_link):
+    rows = [f'<tr><td>{esc(n["title"])}</td><td>{esc(n["kind"])}</td><td>{status_badge(n["status"])}</td>'
+            f'<td><a href="../projects/{esc(n["project_slug"])}.html">{esc(n["project"])}</a></td></tr>'
+            for n in payload["notes"]]
+    body = (f"<h1>#{esc(payload['tag'])}</h1>\n<p>{len(rows)} notes</p>\n"
+            "<table>\n<tr><th>Note</th><th>Kind</th><th>Status</th><th>Project</th></tr>\n"
+            + "\n".join(rows) + "\n</table>")
+    return page(f"#{payload['tag']}", body, "../")
+
+
+RENDERERS = {
+    "index": render_index,
+    "project": render_project,
+    "validation": render_validation,
+    "tag": render_tag,
+}
+
+
+def write_page(task):
+    """Render one page and write it atomically. Runs in pool workers."""
+    out_dir, name, kind, payload, notes_root = task
+    path = Path(out_dir) / name
+    if kind == "style":
+        content = STYLE
+    else:
+        def notes_link(source):
+            return os.path.relpath(Path(notes_root) / source, path.parent).replace(os.sep, "/")
+
+        content = RENDERERS[kind](payload, notes_link)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return name
+
+
+def render(tasks, workers):
+    """Write pages, in a process pool when there are enough of them."""
+    if workers <= 1 or len(tasks) < POOL_MIN_PAGES:
+        return [write_page(task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(write_page, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def build_report(research_root, out_dir, workers=None, full=False):
+    """
+    Bring the report in out_dir up to date.
+
+    Returns counts: pages, rendered, removed and parsed (source notes).
+    """
+    if workers is None:
+        workers = walker.default_workers()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    state = load_state(out_dir, full)
+    projects, sources = collect(research_root)
+    records, parsed = refresh_records(research_root, sources, state, workers)
+    pages = build_graph(projects, records)
+
+    by_slug = {p["slug"]: p for p in projects}
+    titles = {p["slug"]: data(records, p["source"]).get("title") or p["slug"] for p in projects}
+
+    tasks = []
+    digests = {}
+    for name, (kind, key, page_sources) in sorted(pages.items()):
+        payload = None
+        if kind == "index":
+            payload = index_payload(projects, records)
+            digest = payload_digest(payload)
+        else:
+            digest = page_digest(page_sources, records)
+        digests[name] = digest
+        if state["pages"].get(name) == digest and (out_dir / name).exists():
+            continue
+
+        if kind == "project":
+            payload = project_payload(by_slug[key], records)
+        elif kind == "validation":
+            payload = validation_payload(projects, records)
+        elif kind == "tag":
+            tag, notes = key
+            payload = tag_payload(tag, notes, records, titles)
+        tasks.append((str(out_dir), name, kind, payload, str(research_root)))
+
+    render(tasks, workers)
+
+    removed = 0
+    for name in set(state["pages"]) - set(pages):
+        try:
+            (out_dir / name).unlink()
+            removed += 1
+        except OSError:
+            pass
+
+    if parsed or tasks or removed or len(records) != len(state["sources"]):
+        state["sources"] = {path: [current, record] for path, (current, record) in records.items()}
+        state["pages"] = digests
+        save_state(out_dir, state)
+
+    return {"pages": len(pages), "rendered": len(tasks), "removed": removed, "parsed": parsed}
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    out_dir = research_root / REPORT_DIR
+    for i, arg in enumerate(sys.argv):
+        if arg == "--out" and i + 1 < len(sys.argv):
+            out_dir = Path(sys.argv[i + 1]).expanduser().absolute()
+
+    if not (research_root / "projects").exists():
+        print("No projects directory found. Run init.py first.")
+        sys.exit(1)
+
+    counts = build_report(research_root, out_dir, walker.parse_workers(sys.argv), "--full" in sys.argv)
+
+    print(f"✓ Report updated: {out_dir / 'index.html'}")
+    print(f"\nPages: {counts['pages']}")
+    print(f"Rendered: {counts['rendered']}, unchanged: {counts['pages'] - counts['rendered']}, removed: {counts['removed']}")
+    print(f"Notes parsed: {counts['parsed']}")
+
+
+if __name__ == "__main__":
+    main()
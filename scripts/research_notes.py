@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Single entry point for all research notes commands.
+
+Each subcommand is one of the existing scripts; its module is imported
+only when the subcommand runs, so `research_notes.py <command>` costs no
+more than running the script directly and `help` imports nothing at
+all. `shell` starts an interactive session that keeps modules, parsed
+frontmatter, resolver lookups and search index shards loaded between
+commands.
+
+`--root <path>` (or RESEARCH_NOTES_ROOT) selects the notes workspace;
+given before the command it applies to every command of a shell session.
+
+Usage:
+    python3 research_notes.py [--root <path>] <command> [args...]
+    python3 research_notes.py [--root <path>] shell
+    python3 research_notes.py startup [--runs <n>]
+"""
+
+import os
+import sys
+
+
+# Subcommand -> (module, description)
+COMMANDS = {
+    "init": ("init", "Initialize research notes structure"),
+    "create-project": ("create_project", "Create new project"),
+    "create-idea": ("create_idea", "Create new idea"),
+    "create-experiment": ("create_experiment", "Create new experiment"),
+    "batch-create": ("batch_create", "Create notes from a YAML/JSONL manifest"),
+    "artifacts": ("artifacts", "Ingest/list experiment artifacts"),
+    "metrics": ("metrics", "Query metrics from results.md tables"),
+    "update-validation": ("update_validation", "Update validation status"),
+    "validation-log": ("validation_log", "Reports from the status transition log"),
+    "list-projects": ("list_projects", "List all projects"),
+    "search": ("search", "Full-text search"),
+    "search-index": ("search_index", "Build/refresh the search index shards"),
+    "index": ("update_index", "Regenerate index.md and tags.md"),
+    "report": ("report", "Build the static HTML report"),
+    "templates": ("templates", "List/show note templates"),
+    "catalog": ("catalog", "SQLite metadata catalog"),
+    "git": ("autocommit", "Git repository and batched auto-commits"),
+    "daemon": ("notes_daemon", "Start/stop the notes daemon"),
+    "notion-sync": ("notion_sync", "Sync notes to Notion"),
+    "benchmark": ("benchmark", "Benchmarks on synthetic corpora"),
+}
+
+# Cold start budget for `research_notes.py help`, on top of a bare interpreter
+STARTUP_BUDGET_MS = 50
+# Timing noise tolerated before `startup` fails a command for its budget
+STARTUP_NOISE_MS = 5
+
+
+def print_help():
+    print("Usage: python3 research_notes.py [--root <path>] <command> [args...]")
+    print("\nCommands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<20}{description}")
+    print(f"  {'shell':<20}Interactive session with the workspace kept loaded")
+    print(f"  {'startup':<20}Measure startup time against the {STARTUP_BUDGET_MS} ms budget")
+    print("\nRun a command without arguments to see its usage.")
+
+
+def run(command, args):
+    """Run one subcommand in this process. Returns its exit status."""
+    if command not in COMMANDS:
+        print(f"Error: Unknown command '{command}'")
+        print("Run 'python3 research_notes.py help' to list commands")
+        return 1
+
+    import importlib
+    module_name = COMMANDS[command][0]
+    module = importlib.import_module(module_name)
+
+    # A --root given to this command must not leak into the next one
+    saved_argv = sys.argv
+    saved_root = os.environ.get("RESEARCH_NOTES_ROOT")
+    sys.argv = [f"{module_name}.py"] + list(args)
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    finally:
+        sys.argv = saved_argv
+        if saved_root is None:
+            os.environ.pop("RESEARCH_NOTES_ROOT", None)
+        else:
+            os.environ["RESEARCH_NOTES_ROOT"] = saved_root
+    return 0
+
+
+def shell():
+    """Read and run commands until EOF or `exit`."""
+    import shlex
+    try:
+        import readline  # noqa: F401  (line editing and history for input())
+    except ImportError:
+        pass
+
+    print("Research notes shell. Type 'help' for commands, 'exit' to quit.")
+    while True:
+        try:
+            line = input("research-notes> ")
+        except EOFError:
+            print()
+            return
+        except KeyboardInterrupt:
+            print()
+            continue
+
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}")
+            continue
+
+        if not argv:
+            continue
+        if argv[0] in ("exit", "quit"):
+            return
+        if argv[0] in ("help", "--help", "-h"):
+            print_help()
+            continue
+        if argv[0] in ("shell", "startup"):
+            print(f"Error: '{argv[0]}' is not available inside the shell")
+            continue
+
+        try:
+            run(argv[0], argv[1:])
+        except KeyboardInterrupt:
+            print("\nInterrupted")
+        except Exception as e:
+            print(f"Error: {type(e).__name__}: {e}")
+
+
+def measure(argvs, runs):
+    """
+    Return the fastest wall time in ms of each argv over `runs` rounds.
+
+    The commands run interleaved, one of each per round, so a machine
+    that slows down during the measurement slows them all alike.
+    """
+    import subprocess
+    import time
+
+    best = [None] * len(argvs)
+    for _ in range(runs):
+        for i, argv in enumerate(argvs):
+            start = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            elapsed = (time.perf_counter() - start) * 1000
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return best
+
+
+def over_budget(cost):
+    """Return the warning for an import cost, and whether it fails the check."""
+    if cost <= STARTUP_BUDGET_MS:
+        return "", False
+    if cost <= STARTUP_BUDGET_MS + STARTUP_NOISE_MS:
+        return "  (over budget within timing noise)", False
+    return "  ⚠️  over budget", True
+
+
+def startup(args):
+    """
+    Report CLI and per-subcommand import overhead against the budget.
+
+    Each cost is the best of several runs measured against bare
+    interpreter runs interleaved with it; the check fails only for a cost
+    more than STARTUP_NOISE_MS over the budget.
+    """
+    runs = 10
+    for i, arg in enumerate(args):
+        if arg == "--runs" and i + 1 < len(args):
+            try:
+                runs = max(1, int(args[i + 1]))
+            except ValueError:
+                print(f"Error: Invalid run count '{args[i + 1]}'")
+                return 1
+
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    python = sys.executable
+
+    bare_argv = [python, "-c", "pass"]
+    bare, cli = measure([bare_argv, [python, os.path.abspath(__file__), "help"]], runs)
+    overhead = cli - bare
+    flag, failed = over_budget(overhead)
+
+    print(f"Interpreter startup: {bare:.1f} ms")
+    print(f"research_notes.py help: {cli:.1f} ms ({overhead:+.1f} ms, budget {STARTUP_BUDGET_MS} ms){flag}")
+
+    print("\nSubcommand import cost:")
+    for name, (module_name, _) in COMMANDS.items():
+        code = f"import sys; sys.path.insert(0, {scripts_dir!r}); import {module_name}"
+        bare, total = measure([bare_argv, [python, "-c", code]], runs)
+        flag, over = over_budget(total - bare)
+        failed = failed or over
+        print(f"  {name:<20}{total - bare:6.1f} ms{flag}")
+
+    return 1 if failed else 0
+
+
+def main():
+    if any(arg == "--root" or arg.startswith("--root=") for arg in sys.argv[1:2]):
+        import locator
+        root = locator.pop_root(sys.argv)
+        if not root:
+            print("Error: --root requires a path")
+            sys.exit(1)
+        os.environ[locator.ENV_VAR] = root
+
+    if len(sys.argv) < 2 or sys.argv[1] in ("help", "--help", "-h"):
+        print_help()
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+
+    command = sys.argv[1]
+    if command == "shell":
+        shell()
+        return
+    if command == "startup":
+        sys.exit(startup(sys.argv[2:]))
+
+    sys.exit(run(command, sys.argv[2:]))
+
+
+if __name__ == "__main__":
+    main()
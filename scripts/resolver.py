@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Resolve project and idea titles to their directories.
+
+Keeps a persistent map of case-folded titles to slugs in
+research-notes/.resolver-cache.json, plus an in-process copy so a batch
+of lookups in one interpreter never rescans. A cached hit costs a single
+stat of the note it points at; the directory is only rescanned (and only
+changed notes re-read) when that stat no longer matches or the title is
+unknown. When the metadata catalog is enabled it is queried instead.
+"""
+
+import json
+
+import catalog
+import frontmatter
+import notewriter
+
+
+CACHE_FILE = ".resolver-cache.json"
+CACHE_VERSION = 1
+
+_caches = {}
+
+
+def load_cache(research_root):
+    """Return the resolver cache for a workspace, loading it once per process."""
+    key = str(research_root)
+    if key in _caches:
+        return _caches[key]
+
+    cache = {"version": CACHE_VERSION, "levels": {}}
+    cache_path = research_root / CACHE_FILE
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding="utf-8") as f:
+                loaded = json.load(f)
+            if loaded.get("version") == CACHE_VERSION:
+                cache = loaded
+        except (OSError, ValueError):
+            pass
+
+    _caches[key] = cache
+    return cache
+
+
+def save_cache(research_root):
+    """Write the resolver cache to disk."""
+    cache = _caches.get(str(research_root))
+    if cache is None:
+        return
+
+    notewriter.atomic_write(research_root / CACHE_FILE, json.dumps(cache, separators=(',', ':')))
+
+
+def is_current(entry, path):
+    """Return True if a cached entry still matches the note on disk."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size
+
+
+def scan_level(level, parent_dir, note_name):
+    """Re-read changed notes under parent_dir and rebuild the title map."""
+    files = {}
+    if parent_dir.exists():
+        for child in parent_dir.iterdir():
+            note = child / note_name
+            try:
+                stat = note.stat()
+            except OSError:
+                continue
+
+            cached = level["files"].get(child.name)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                files[child.name] = cached
+                continue
+
+            title = frontmatter.read_title(note, child.name)
+            files[child.name] = [stat.st_mtime_ns, stat.st_size, title]
+
+    level["files"] = files
+    level["titles"] = {}
+    for slug in sorted(files):
+        level["titles"].setdefault(files[slug][2].casefold(), slug)
+
+
+def resolve(research_root, level_key, parent_dir, note_name, title):
+    """Resolve a title to a directory under parent_dir, or return None."""
+    cache = load_cache(research_root)
+    level = cache["levels"].setdefault(level_key, {"files": {}, "titles": {}})
+    key = title.casefold()
+
+    slug = level["titles"].get(key)
+    if slug is not None:
+        note = parent_dir / slug / note_name
+        if is_current(level["files"][slug], note):
+            return parent_dir / slug
+
+        # The note changed; re-read just that one before rescanning
+        try:
+            stat = note.stat()
+            note_title = frontmatter.read(note).get("title") or slug
+        except OSError:
+            note_title = None
+        if note_title is not None and note_title.casefold() == key:
+            level["files"][slug] = [stat.st_mtime_ns, stat.st_size, note_title]
+            save_cache(research_root)
+            return parent_dir / slug
+
+    scan_level(level, parent_dir, note_name)
+    save_cache(research_root)
+
+    slug = level["titles"].get(key)
+    return parent_dir / slug if slug is not None else None
+
+
+def remember(research_root, level_key, directory, note_name, title, save=True):
+    """
+    Record a newly created note so the next lookup is a cache hit.
+
+    Pass save=False when recording many notes and call save_cache once.
+    """
+    cache = load_cache(research_root)
+    level = cache["levels"].setdefault(level_key, {"files": {}, "titles": {}})
+    stat = (directory / note_name).stat()
+
+    level["files"][directory.name] = [stat.st_mtime_ns, stat.st_size, title]
+    level["titles"].setdefault(title.casefold(), directory.name)
+    if save:
+        save_cache(research_root)
+
+
+def ideas_level(research_root, project_dir):
+    """Return the cache level key for the ideas of a project."""
+    return "ideas:" + project_dir.relative_to(research_root).as_posix()
+
+
+def resolve_project(research_root, title, conn=None):
+    """Return the directory of the project with the given title, or None."""
+    if conn:
+        return catalog.find_project(conn, research_root, title)
+    return resolve(research_root, "projects", research_root / "projects", "project.md", title)
+
+
+def resolve_idea(research_root, project_dir, title, conn=None):
+    """Return the directory of the idea with the given title, or None."""
+    if conn:
+        return catalog.find_idea(conn, research_root, project_dir, title)
+    return resolve(research_root, ideas_level(research_root, project_dir),
+                   project_dir / "ideas", "idea.md", title)
+
+
+def remember_project(research_root, project_dir, title, save=True):
+    """Record a newly created project."""
+    remember(research_root, "projects", project_dir, "project.md", title, save)
+
+
+def remember_idea(research_root, idea_dir, title, save=True):
+    """Record a newly created idea."""
+    project_dir = idea_dir.parent.parent
+    remember(research_root, ideas_level(research_root, project_dir), idea_dir, "idea.md", title, save)
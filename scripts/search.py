@@ -2,13 +2,41 @@
 """
 Search across research notes.
 
+Every content area is searchable: ideas, experiments, experiment results
+(results.md), papers/ and engineering/. Each scope has its own index
+shard, so --scope papers only touches the papers shard and never walks
+the ideas or experiments trees.
+
+Queries are answered from the persistent inverted index
+(see search_index.py), which is refreshed incrementally before each
+search, or by notes_daemon.py when it is running. Pass --no-index to
+scan every note instead. The --tag and --status filters are answered
+from the metadata catalog (catalog.py).
+
+With --rank (or --top N) results are ordered by BM25 relevance over
+titles, tags and section bodies instead of directory order. Ranking needs
+the index, so it cannot be combined with --no-index or --count-only.
+
+Notes are streamed in chunks, and reading a note stops once more than
+--max-per-file matches (default 3) were found. --count-only counts every
+matching line without keeping any of them.
+
 Usage:
-    python3 search.py <query> [--scope <scope>]
+    python3 search.py <query> [--scope <scope>] [--tag <tag>] [--status <status>]
+                      [--rank] [--top <n>] [--max-per-file <n>] [--count-only]
+                      [--no-index] [--workers <n>]
 """
 
 import sys
 import re
-from pathlib import Path
+import heapq
+
+import catalog
+import daemon_client
+import frontmatter
+import locator
+import search_index
+import walker
 
 
 def slugify(text):
@@ -16,158 +44,428 @@ def slugify(text):
     return text.lower().replace(' ', '-').replace('_', '-')
 
 
-def search_in_file(filepath, query):
-    """Search for query in a file."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-        lines = content.split('\n')
-        matches = []
-
-        for i, line in enumerate(lines, 1):
-            if query.lower() in line.lower():
-                matches.append((i, line.strip()))
+CHUNK_SIZE = 64 * 1024
+ANY_LINE = re.compile("")
+
+SECTIONS = {
+    "ideas": "📝 IDEAS",
+    "experiments": "🧪 EXPERIMENTS",
+    "results": "📊 RESULTS",
+    "papers": "📄 PAPERS",
+    "engineering": "🔧 ENGINEERING",
+}
+
+
+def compile_query(query):
+    """Compile a query into a case-insensitive literal pattern."""
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+
+def search_in_file(filepath, pattern, limit=None, count_only=False, line_numbers=None):
+    """
+    Stream a file in chunks and return (matches, count, complete).
+
+    Chunks without a match are skipped after a single regex pre-filter, so
+    only matching lines are ever split out. `matches` holds at most `limit`
+    (line number, line) pairs; scanning stops once more than `limit`
+    matches were seen, in which case `complete` is False and `count` is a
+    lower bound. With count_only no lines are kept and the whole file is
+    counted. `line_numbers` restricts matching to candidate lines.
+    """
+    matches = []
+    count = 0
+    line_num = 0
+    carry = ""
+    candidates = sorted(line_numbers) if line_numbers is not None else None
+    next_candidate = 0
+    last_line = candidates[-1] if candidates else None
+
+    def check(line):
+        nonlocal count, next_candidate
+        if candidates is not None:
+            while next_candidate < len(candidates) and candidates[next_candidate] < line_num:
+                next_candidate += 1
+            if next_candidate >= len(candidates) or candidates[next_candidate] != line_num:
+                return True
+        if not pattern.search(line):
+            return True
+        count += 1
+        if count_only:
+            return True
+        if limit is not None and count > limit:
+            return False
+        matches.append((line_num, line.strip()))
+        return True
 
-        return matches
-    except:
+    try:
+        with open(filepath, 'r', encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                data = carry + chunk
+                end = data.rfind('\n')
+                if end < 0:
+                    carry = data
+                    continue
+                carry = data[end + 1:]
+                block = data[:end]
+
+                if not pattern.search(block):
+                    line_num += block.count('\n') + 1
+                else:
+                    for line in block.split('\n'):
+                        line_num += 1
+                        if not check(line):
+                            return matches, count, False
+
+                if last_line is not None and line_num >= last_line:
+                    return matches, count, True
+
+            if carry:
+                line_num += 1
+                if not check(carry):
+                    return matches, count, False
+    except OSError:
+        return [], 0, True
+
+    return matches, count, True
+
+
+def load_shard(research_root, scope, indexes=None, workers=None):
+    """Return an up-to-date index shard, preferring an already loaded one."""
+    if indexes is not None and scope in indexes:
+        return indexes[scope]
+    index, _ = search_index.refresh_index(research_root, scope, workers=workers)
+    return index
+
+
+def indexed_hits(research_root, scope, query, limit=None, count_only=False, workers=None,
+                 indexes=None):
+    """
+    Return search hits in one scope from its index shard.
+
+    Returns None when the query cannot be answered from the index.
+    """
+    index = load_shard(research_root, scope, indexes, workers)
+    candidates = search_index.lookup(index, query)
+    if candidates is None:
+        return None
+
+    pattern = compile_query(query)
+    rels = sorted(candidates)
+    results = walker.parallel_map(
+        lambda rel: search_in_file(research_root / rel, pattern, limit, count_only, candidates[rel]),
+        rels, workers
+    )
+
+    hits = []
+    for rel, (matches, count, complete) in zip(rels, results):
+        if not count:
+            continue
+
+        entry = index["files"][rel]
+        hits.append({
+            "kind": entry["kind"],
+            "path": research_root / rel,
+            "project": search_index.project_title(index, rel),
+            "idea": entry["idea"],
+            "title": entry["title"],
+            "matches": matches,
+            "count": count,
+            "complete": complete,
+        })
+
+    return hits
+
+
+def scanned_hits(research_root, scope, query, limit=None, count_only=False, workers=None):
+    """Return search hits in one scope by reading its notes in one parallel pass."""
+    notes = [n for n in walker.walk_scope(research_root / "projects", scope) if n.path is not None]
+    pattern = compile_query(query)
+
+    def scan_note(note):
+        if note.kind == "project":
+            return None, frontmatter.read(note.path)
+        result = search_in_file(note.path, pattern, limit, count_only)
+        if not result[1]:
+            return result, None
+        return result, search_index.read_note(note)[1] if note.kind == "results" else frontmatter.read(note.path)
+
+    results = walker.parallel_map(scan_note, notes, workers)
+
+    project_titles = {
+        note.dir: metadata.get("title")
+        for note, (_, metadata) in zip(notes, results)
+        if note.kind == "project"
+    }
+
+    hits = []
+    for note, (result, metadata) in zip(notes, results):
+        if note.kind == "project" or not result[1]:
+            continue
+
+        matches, count, complete = result
+        hits.append({
+            "kind": note.kind,
+            "path": note.path,
+            "project": project_titles.get(note.project_dir),
+            "idea": metadata.get("idea"),
+            "title": metadata.get("title"),
+            "matches": matches,
+            "count": count,
+            "complete": complete,
+        })
+
+    return hits
+
+
+def read_lines(filepath, line_numbers):
+    """
+    Return [(line number, stripped line)] for the given lines of a file,
+    streamed like search_in_file and read no further than the last one.
+    """
+    if not line_numbers:
         return []
+    return search_in_file(filepath, ANY_LINE, line_numbers=line_numbers)[0]
+
+
+def ranked_hits(research_root, scopes, query, top, allowed=None, workers=None, indexes=None):
+    """
+    Return the top BM25-ranked hits across the index shards of the given scopes.
+
+    Every shard is scored with document counts, lengths and term
+    frequencies of all selected shards together, so scores from different
+    scopes are on one scale and can be merged.
+    """
+    shards = [load_shard(research_root, scope, indexes, workers) for scope in scopes]
+    stats = search_index.collection_stats(shards, query)
+
+    def accept(rel):
+        return allowed is None or catalog.owner(rel) in allowed
+
+    ranked = []
+    for index in shards:
+        ranked.extend(
+            (score, rel, lines, index)
+            for score, rel, lines in search_index.rank(index, query, top, accept, stats)
+        )
+
+    ranked = heapq.nlargest(top, ranked, key=lambda item: item[0])
+    all_lines = walker.parallel_map(
+        lambda item: read_lines(research_root / item[1], item[2]), ranked, workers
+    )
+
+    hits = []
+    for (score, rel, _, index), lines in zip(ranked, all_lines):
+        entry = index["files"][rel]
+        hits.append({
+            "kind": entry["kind"],
+            "path": research_root / rel,
+            "project": search_index.project_title(index, rel),
+            "idea": entry["idea"],
+            "title": entry["title"],
+            "matches": lines,
+            "count": len(lines),
+            "complete": True,
+            "score": score,
+        })
+
+    return hits
+
+
+def search(research_root, scopes, query, ranked=False, top=10, max_per_file=3,
+           count_only=False, use_index=True, allowed=None, workers=None, indexes=None):
+    """
+    Run a search and return [(section, hits)].
+
+    Sections are scope names, or a single "ranked" section in ranked mode.
+    `allowed` restricts hits to files owned by the given project, idea and
+    experiment directories (see catalog.owner); `indexes` supplies already
+    loaded shards (as kept warm by notes_daemon.py). Ranked mode needs the
+    index and reports matching lines, so it rejects `use_index=False` and
+    `count_only`.
+    """
+    if ranked:
+        if count_only or not use_index:
+            raise ValueError("ranked search cannot be combined with --no-index or --count-only")
+        return [("ranked", ranked_hits(research_root, scopes, query, top, allowed, workers, indexes))]
+
+    sections = []
+    for scope in scopes:
+        hits = None
+        if use_index:
+            hits = indexed_hits(research_root, scope, query, max_per_file, count_only, workers, indexes)
+        if hits is None:
+            hits = scanned_hits(research_root, scope, query, max_per_file, count_only, workers)
+
+        if allowed is not None:
+            hits = [
+                hit for hit in hits
+                if catalog.owner(catalog.rel_path(research_root, hit["path"])) in allowed
+            ]
+
+        sections.append((scope, hits))
+
+    return sections
+
+
+def print_hit(hit, workspace, max_per_file=3, count_only=False):
+    """Print a single search hit."""
+    print()
+    if "score" in hit:
+        print(f"  Score: {hit['score']:.2f}")
+    print(f"  Project: {hit['project']}")
+    if hit["kind"] == "idea":
+        print(f"  Idea: {hit['title']}")
+    elif hit["kind"] in ("experiment", "results"):
+        print(f"  Idea: {hit['idea']}")
+        print(f"  Experiment: {hit['title']}")
+    elif hit["kind"] == "paper":
+        print(f"  Paper: {hit['title'] or hit['path'].parent.name}")
+    else:
+        print(f"  Component: {hit['title'] or hit['path'].parent.name}")
+
+    if hit["kind"] in ("idea", "experiment"):
+        print(f"  Location: {hit['path'].parent.relative_to(workspace)}")
+    else:
+        print(f"  Location: {hit['path'].relative_to(workspace)}")
+
+    if count_only:
+        print(f"    {hit['count']} matches")
+        return
+
+    for line_num, line in hit["matches"][:max_per_file]:
+        print(f"    L{line_num}: {line[:80]}...")
+
+    if not hit["complete"]:
+        print(f"    ... (more matches)")
+    elif hit["count"] > max_per_file:
+        print(f"    ... ({hit['count']} total matches)")
 
 
 def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
     if len(sys.argv) < 2:
-        print("Usage: python3 search.py <query> [--scope <scope>]")
-        print("\nScopes: ideas, experiments, papers, all")
+        print("Usage: python3 search.py <query> [--scope <scope>] [--tag <tag>] [--status <status>]")
+        print("                         [--rank] [--top <n>] [--max-per-file <n>] [--count-only]")
+        print("                         [--no-index] [--workers <n>]")
+        print(f"\nScopes: {', '.join(walker.SCOPES)}, all")
         sys.exit(1)
 
     query = sys.argv[1]
 
     # Parse optional arguments
     scope = "all"  # default
+    use_index = True
+    ranked = False
+    top = 10
+    max_per_file = 3
+    count_only = False
+    tag = None
+    status = None
     for i, arg in enumerate(sys.argv):
         if arg == "--scope" and i + 1 < len(sys.argv):
             scope = sys.argv[i + 1]
+        elif arg == "--tag" and i + 1 < len(sys.argv):
+            tag = sys.argv[i + 1]
+        elif arg == "--status" and i + 1 < len(sys.argv):
+            status = sys.argv[i + 1]
+        elif arg == "--no-index":
+            use_index = False
+        elif arg == "--count-only":
+            count_only = True
+        elif arg == "--max-per-file" and i + 1 < len(sys.argv):
+            try:
+                max_per_file = int(sys.argv[i + 1])
+            except ValueError:
+                print(f"Error: Invalid --max-per-file value '{sys.argv[i + 1]}'")
+                sys.exit(1)
+        elif arg == "--rank":
+            ranked = True
+        elif arg == "--top" and i + 1 < len(sys.argv):
+            ranked = True
+            try:
+                top = int(sys.argv[i + 1])
+            except ValueError:
+                print(f"Error: Invalid --top value '{sys.argv[i + 1]}'")
+                sys.exit(1)
+
+    if ranked and (count_only or not use_index):
+        print("Error: --rank cannot be combined with --no-index or --count-only")
+        sys.exit(1)
 
-    # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
-    projects_dir = research_root / "projects"
+    if scope == "all":
+        scopes = list(walker.SCOPES)
+    elif scope in walker.SCOPES:
+        scopes = [scope]
+    else:
+        print(f"Error: Invalid scope '{scope}'. Valid scopes: {', '.join(walker.SCOPES)}, all")
+        sys.exit(1)
+
+    workers = walker.parse_workers(sys.argv)
+
+    # Tag and status filters come from the catalog
+    allowed = None
+    if tag or status:
+        conn = catalog.open_catalog(research_root)
+        if not conn:
+            print("Error: --tag and --status require the database catalog")
+            print("Edit config.yaml and set database.enabled: true")
+            sys.exit(1)
+        allowed = catalog.filter_paths(conn, tag, status)
+        catalog.close_catalog(conn, research_root)
 
     print(f"\n🔍 Searching for: '{query}' (scope: {scope})\n")
     print("=" * 70)
 
-    total_matches = 0
-
-    # Search in projects
-    if scope in ["all", "ideas"]:
-        print("\n📝 IDEAS")
+    options = {
+        "ranked": ranked,
+        "top": top,
+        "max_per_file": max_per_file,
+        "count_only": count_only,
+        "use_index": use_index,
+        "allowed": sorted(allowed) if allowed is not None else None,
+    }
+
+    # Ask a running notes_daemon.py first; it keeps the shards warm
+    sections = daemon_client.search(research_root, scopes, query, options)
+    if sections is None:
+        options["allowed"] = allowed
+        sections = search(research_root, scopes, query, workers=workers, **options)
+
+    if ranked:
+        hits = sections[0][1]
+
+        print(f"\n🏆 TOP {top} BY RELEVANCE")
         print("-" * 70)
+        for hit in hits:
+            print_hit(hit, workspace, max_per_file)
 
-        for project_dir in projects_dir.iterdir():
-            if not project_dir.is_dir():
-                continue
-
-            ideas_dir = project_dir / "ideas"
-            if not ideas_dir.exists():
-                continue
-
-            # Get project name
-            project_md = project_dir / "project.md"
-            if project_md.exists():
-                project_content = project_md.read_text(encoding="utf-8")
-                for line in project_content.split('\n'):
-                    if line.startswith("title:"):
-                        project_name = line.split(':', 1)[1].strip().strip('"\'')
-                        break
-
-            for idea_dir in ideas_dir.iterdir():
-                if not idea_dir.is_dir():
-                    continue
-
-                idea_md = idea_dir / "idea.md"
-                if idea_md.exists():
-                    matches = search_in_file(idea_md, query)
-                    if matches:
-                        # Get idea title
-                        idea_content = idea_md.read_text(encoding="utf-8")
-                        for line in idea_content.split('\n'):
-                            if line.startswith("title:"):
-                                idea_title = line.split(':', 1)[1].strip().strip('"\'')
-                                break
-
-                        print(f"\n  Project: {project_name}")
-                        print(f"  Idea: {idea_title}")
-                        print(f"  Location: {idea_dir.relative_to(workspace)}")
+        print("\n" + "=" * 70)
+        print(f"\n✓ Showing {len(hits)} ranked results")
+        return
 
-                        for line_num, line in matches[:3]:  # Show first 3 matches
-                            print(f"    L{line_num}: {line[:80]}...")
-
-                        if len(matches) > 3:
-                            print(f"    ... ({len(matches)} total matches)")
-
-                        total_matches += len(matches)
+    total_matches = 0
+    complete = True
 
-    # Search in experiments
-    if scope in ["all", "experiments"]:
-        print("\n\n🧪 EXPERIMENTS")
+    for section, hits in sections:
+        print(f"\n{SECTIONS[section]}")
         print("-" * 70)
 
-        for project_dir in projects_dir.iterdir():
-            if not project_dir.is_dir():
-                continue
-
-            ideas_dir = project_dir / "ideas"
-            if not ideas_dir.exists():
-                continue
-
-            # Get project name
-            project_md = project_dir / "project.md"
-            if project_md.exists():
-                project_content = project_md.read_text(encoding="utf-8")
-                for line in project_content.split('\n'):
-                    if line.startswith("title:"):
-                        project_name = line.split(':', 1)[1].strip().strip('"\'')
-                        break
-
-            for idea_dir in ideas_dir.iterdir():
-                if not idea_dir.is_dir():
-                    continue
-
-                experiments_dir = idea_dir / "experiments"
-                if not experiments_dir.exists():
-                    continue
-
-                for experiment_dir in experiments_dir.iterdir():
-                    if not experiment_dir.is_dir():
-                        continue
-
-                    experiment_md = experiment_dir / "experiment.md"
-                    if experiment_md.exists():
-                        matches = search_in_file(experiment_md, query)
-                        if matches:
-                            # Get experiment title
-                            experiment_content = experiment_md.read_text(encoding="utf-8")
-                            for line in experiment_content.split('\n'):
-                                if line.startswith("title:"):
-                                    experiment_title = line.split(':', 1)[1].strip().strip('"\'')
-                                    break
-                                if line.startswith("idea:"):
-                                    idea_title = line.split(':', 1)[1].strip().strip('"\'')
-                                    break
-
-                            print(f"\n  Project: {project_name}")
-                            print(f"  Idea: {idea_title}")
-                            print(f"  Experiment: {experiment_title}")
-                            print(f"  Location: {experiment_dir.relative_to(workspace)}")
-
-                            for line_num, line in matches[:3]:
-                                print(f"    L{line_num}: {line[:80]}...")
-
-                            if len(matches) > 3:
-                                print(f"    ... ({len(matches)} total matches)")
-
-                            total_matches += len(matches)
+        for hit in hits:
+            print_hit(hit, workspace, max_per_file, count_only)
+            total_matches += hit["count"]
+            complete = complete and hit["complete"]
 
     print("\n" + "=" * 70)
-    print(f"\n✓ Found {total_matches} matches total")
+    if complete:
+        print(f"\n✓ Found {total_matches} matches total")
+    else:
+        print(f"\n✓ Found at least {total_matches} matches total (use --count-only for exact counts)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+Persistent inverted index for research notes search.
+
+Maps tokens to (file, line) postings for every searchable note under
+research-notes/projects; a line is listed once per occurrence of the
+token in it. There is one index shard per search scope
+(ideas, experiments, results, papers, engineering) in
+research-notes/.search-index/<scope>.json, so a query limited to one
+scope only refreshes and loads that shard. Shards are refreshed
+incrementally: only files whose mtime or size changed since the last run
+are re-read.
+
+A query token matches every indexed word containing it, so the index's
+candidate lines are a superset of what a plain scan finds. Words that
+begin with it are found by bisection in the sorted vocabulary, the rest
+by a scan of the vocabulary (not of the notes). Ranked queries expand
+their terms the same way.
+
+Each file also records its length and the field (title, tags or body
+section) of every line, so BM25 relevance ranking can be computed from
+the stored term statistics without reading any note.
+
+Usage:
+    python3 search_index.py [--scope <scope>] [--rebuild] [--workers <n>]
+"""
+
+import sys
+import json
+import math
+import re
+import heapq
+from bisect import bisect_left, bisect_right
+
+import frontmatter
+import locator
+import notewriter
+import walker
+
+
+INDEX_DIR = ".search-index"
+LEGACY_INDEX_FILE = ".search-index.json"
+INDEX_VERSION = 3
+
+TOKEN_RE = re.compile(r"\w+")
+HEADING_RE = re.compile(r"^#+\s*(.*?)\s*$")
+
+# BM25 parameters and per-field weights. Frontmatter lines other than
+# title and tags (dates, status, ...) do not contribute to ranking.
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "frontmatter": 0.0,
+}
+SECTION_WEIGHT = 1.0
+
+# Shards loaded by this process: path -> (mtime_ns, size, index)
+_loaded = {}
+
+# Sorted tokens of an index: id(postings) -> (postings, generation, tokens)
+_vocabularies = {}
+MAX_VOCABULARIES = 16
+
+
+def tokenize(text):
+    """Split text into case-folded tokens."""
+    return TOKEN_RE.findall(text.casefold())
+
+
+def empty_index():
+    """Return an empty index structure."""
+    return {
+        "version": INDEX_VERSION,
+        "projects": {},
+        "files": {},
+        "postings": {},
+        "total_length": 0,
+    }
+
+
+def shard_path(research_root, scope):
+    """Return the path of the index shard for a scope."""
+    return research_root / INDEX_DIR / f"{scope}.json"
+
+
+def load_index(research_root, scope):
+    """
+    Load the index shard of a scope from disk, or return an empty one.
+
+    Shards stay loaded for the life of the process: a shard whose file is
+    unchanged since it was last loaded or saved is returned from memory,
+    so long-running sessions (the research_notes.py shell) parse it once.
+    """
+    index_path = shard_path(research_root, scope)
+    stat = stat_file(index_path)
+    if stat is None:
+        return empty_index()
+
+    loaded = _loaded.get(str(index_path))
+    if loaded and loaded[0] == stat.st_mtime_ns and loaded[1] == stat.st_size:
+        return loaded[2]
+
+    try:
+        with open(index_path, 'r', encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return empty_index()
+
+    if index.get("version") != INDEX_VERSION:
+        return empty_index()
+
+    _loaded[str(index_path)] = (stat.st_mtime_ns, stat.st_size, index)
+    return index
+
+
+def save_index(research_root, scope, index):
+    """
+    Write the index shard of a scope to disk.
+
+    Postings are written in token order, so a loaded shard's vocabulary
+    is already sorted (see vocabulary()).
+    """
+    index_path = shard_path(research_root, scope)
+    index_path.parent.mkdir(exist_ok=True)
+    content = dict(index, postings=dict(sorted(index["postings"].items())))
+    notewriter.atomic_write(index_path, json.dumps(content, separators=(',', ':')))
+
+    stat = index_path.stat()
+    _loaded[str(index_path)] = (stat.st_mtime_ns, stat.st_size, index)
+
+    # Superseded by the per-scope shards
+    legacy_path = research_root / LEGACY_INDEX_FILE
+    if legacy_path.exists():
+        legacy_path.unlink()
+
+
+def stat_file(path):
+    """Return os.stat_result for a path, or None if it vanished."""
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def read_note(note):
+    """
+    Return (content, metadata) for a note, or (None, None) if unreadable.
+
+    results.md has no frontmatter of its own, so it takes its title and
+    idea from the sibling experiment.md.
+    """
+    try:
+        content = note.path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None, None
+
+    if note.kind == "results":
+        try:
+            metadata = frontmatter.read(note.dir / "experiment.md")
+        except OSError:
+            metadata = {}
+    else:
+        metadata = frontmatter.parse(content)
+
+    return content, metadata
+
+
+def remove_file(index, rel):
+    """Drop a file and its postings from the index."""
+    entry = index["files"].pop(rel, None)
+    if not entry:
+        return
+
+    index["total_length"] -= entry["length"]
+    index["generation"] = index.get("generation", 0) + 1
+    postings = index["postings"]
+    for token in entry["tokens"]:
+        token_postings = postings.get(token)
+        if token_postings is None:
+            continue
+        token_postings.pop(rel, None)
+        if not token_postings:
+            del postings[token]
+
+
+def line_fields(lines):
+    """
+    Return [[first_line, field], ...] describing which field each line is in.
+
+    Frontmatter title/tags lines are their own fields; body lines belong to
+    the section named by the closest preceding markdown heading.
+    """
+    fields = []
+    in_frontmatter = bool(lines) and lines[0].strip() == "---"
+    current = "frontmatter" if in_frontmatter else ""
+
+    def set_field(line_num, field):
+        if not fields or fields[-1][1] != field:
+            fields.append([line_num, field])
+
+    for line_num, line in enumerate(lines, 1):
+        if in_frontmatter:
+            if line_num > 1 and line.strip() == "---":
+                in_frontmatter = False
+                current = ""
+                set_field(line_num, "frontmatter")
+            elif line.startswith("title:"):
+                set_field(line_num, "title")
+            elif line.startswith("tags:"):
+                set_field(line_num, "tags")
+            else:
+                set_field(line_num, "frontmatter")
+            continue
+
+        heading = HEADING_RE.match(line)
+        if heading:
+            current = heading.group(1).casefold()
+        set_field(line_num, current)
+
+    return fields
+
+
+def field_weight(field):
+    """Return the ranking weight of a field."""
+    return FIELD_WEIGHTS.get(field, SECTION_WEIGHT)
+
+
+def add_file(index, rel, kind, content, stat, metadata, meta=None):
+    """
+    Add the postings and term statistics of a note's content to the index.
+
+    `meta` is the metadata key from stat_note(), kept so the entry goes
+    stale when the file its title and idea came from changes.
+    """
+    lines = content.split('\n')
+    fields = line_fields(lines)
+    field_starts = [start for start, _ in fields]
+    postings = index["postings"]
+    tokens = set()
+    length = 0
+
+    for line_num, line in enumerate(lines, 1):
+        line_tokens = tokenize(line)
+        if not line_tokens:
+            continue
+
+        field = fields[bisect_right(field_starts, line_num) - 1][1]
+        if field_weight(field) > 0:
+            length += len(line_tokens)
+
+        for token in line_tokens:
+            tokens.add(token)
+            postings.setdefault(token, {}).setdefault(rel, []).append(line_num)
+
+    index["files"][rel] = {
+        "kind": kind,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "meta": meta,
+        "title": metadata.get("title"),
+        "idea": metadata.get("idea"),
+        "tokens": sorted(tokens),
+        "length": length,
+        "fields": fields,
+    }
+    index["total_length"] += length
+    index["generation"] = index.get("generation", 0) + 1
+
+
+def stat_note(note):
+    """
+    Return (stat, metadata key) of a note; stat is None if it vanished.
+
+    results.md takes its title and idea from the sibling experiment.md
+    (see read_note()), so its metadata key is that file's mtime and size.
+    """
+    stat = stat_file(note.path)
+    if note.kind != "results" or stat is None:
+        return stat, None
+    meta = stat_file(note.dir / "experiment.md")
+    return stat, meta and [meta.st_mtime_ns, meta.st_size]
+
+
+def is_current(cached, stat, meta=None):
+    """Return True if a cached entry matches a stat result and metadata key."""
+    return (bool(cached) and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size
+            and cached.get("meta") == meta)
+
+
+def refresh_index(research_root, scope, index=None, workers=None):
+    """
+    Bring the index shard of a scope up to date with the notes on disk.
+
+    Only the part of the tree holding the scope is walked; stats and reads
+    of changed notes run on a thread pool. Only files whose mtime or size
+    (or, for results.md, that of its experiment.md) changed are re-read. Returns the shard and the number of files that
+    were (re)indexed or removed.
+    """
+    if index is None:
+        index = load_index(research_root, scope)
+
+    notes = [n for n in walker.walk_scope(research_root / "projects", scope) if n.path is not None]
+    stats = walker.parallel_map(stat_note, notes, workers)
+
+    seen = set()
+    seen_projects = set()
+    changed_projects = []
+    changed_files = []
+
+    for note, (stat, meta) in zip(notes, stats):
+        if stat is None:
+            continue
+
+        if note.kind == "project":
+            rel = note.dir.relative_to(research_root).as_posix()
+            seen_projects.add(rel)
+            if not is_current(index["projects"].get(rel), stat):
+                changed_projects.append((rel, note.path, stat))
+        else:
+            rel = note.path.relative_to(research_root).as_posix()
+            seen.add(rel)
+            if not is_current(index["files"].get(rel), stat, meta):
+                changed_files.append((rel, note, stat, meta))
+
+    titles = walker.parallel_map(
+        lambda item: frontmatter.read_title(item[1]), changed_projects, workers
+    )
+    for (rel, _, stat), title in zip(changed_projects, titles):
+        index["projects"][rel] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "title": title,
+        }
+
+    contents = walker.parallel_map(lambda item: read_note(item[1]), changed_files, workers)
+    for (rel, note, stat, meta), (content, metadata) in zip(changed_files, contents):
+        remove_file(index, rel)
+        if content is not None:
+            add_file(index, rel, note.kind, content, stat, metadata, meta)
+
+    changed = len(changed_projects) + len(changed_files)
+
+    for rel in [rel for rel in index["files"] if rel not in seen]:
+        remove_file(index, rel)
+        changed += 1
+
+    for rel in [rel for rel in index["projects"] if rel not in seen_projects]:
+        del index["projects"][rel]
+        changed += 1
+
+    if changed or not shard_path(research_root, scope).exists():
+        save_index(research_root, scope, index)
+
+    return index, changed
+
+
+def project_title(index, rel):
+    """Return the title of the project that owns an indexed file."""
+    project_rel = '/'.join(rel.split('/')[:2])
+    project = index["projects"].get(project_rel)
+    return project["title"] if project else None
+
+
+def vocabulary(index):
+    """
+    Return the sorted list of an index's tokens.
+
+    The list is kept until add_file() or remove_file() bumps the index's
+    generation. Shards are saved in token order, so sorting a freshly
+    loaded one is linear.
+    """
+    postings = index["postings"]
+    generation = index.get("generation", 0)
+    cached = _vocabularies.get(id(postings))
+    if cached and cached[0] is postings and cached[1] == generation:
+        return cached[2]
+    tokens = sorted(postings)
+    if len(_vocabularies) >= MAX_VOCABULARIES:
+        _vocabularies.clear()
+    _vocabularies[id(postings)] = (postings, generation, tokens)
+    return tokens
+
+
+def matching_tokens(index, query_token):
+    """
+    Return the indexed tokens a query token matches.
+
+    Tokens starting with the query token (including an exact match) are
+    found by bisection in the sorted vocabulary; tokens containing it
+    elsewhere are added by a scan of the rest of the vocabulary. Every
+    token a line scan would match is returned.
+    """
+    tokens = vocabulary(index)
+    start = bisect_left(tokens, query_token)
+    end = start
+    while end < len(tokens) and tokens[end].startswith(query_token):
+        end += 1
+    infix = [token for token in tokens[:start] if query_token in token]
+    infix += [token for token in tokens[end:] if query_token in token]
+    return tokens[start:end] + infix
+
+
+def lookup(index, query):
+    """
+    Return {rel: sorted line numbers} of lines containing every query token.
+
+    A query token matches every indexed token that contains it (see
+    matching_tokens()). Returns None when the query has no indexable
+    tokens and the caller must scan instead.
+    """
+    query_tokens = set(tokenize(query))
+    if not query_tokens:
+        return None
+
+    postings = index["postings"]
+    result = None
+
+    for query_token in query_tokens:
+        candidates = {}
+        for token in matching_tokens(index, query_token):
+            for rel, lines in postings.get(token, {}).items():
+                candidates.setdefault(rel, set()).update(lines)
+
+        if result is None:
+            result = candidates
+        else:
+            result = {
+                rel: result[rel] & lines
+                for rel, lines in candidates.items()
+                if rel in result and result[rel] & lines
+            }
+
+        if not result:
+            return {}
+
+    return {rel: sorted(lines) for rel, lines in result.items()}
+
+
+def term_postings(index, term):
+    """
+    Return {rel: line numbers} for a query term, merged over every indexed
+    token it matches (see matching_tokens()).
+    """
+    postings = index["postings"]
+    tokens = matching_tokens(index, term)
+    if len(tokens) == 1:
+        return postings[tokens[0]]
+
+    merged = {}
+    for token in tokens:
+        for rel, lines in postings[token].items():
+            merged.setdefault(rel, []).extend(lines)
+    return merged
+
+
+def weighted_tf(entry, lines):
+    """
+    Return the field-weighted term frequency of a term in one file.
+
+    `lines` lists a line once per occurrence of the term, so every
+    occurrence counts with the weight of the field it is in.
+    """
+    starts = [start for start, _ in entry["fields"]]
+    return sum(
+        field_weight(entry["fields"][bisect_right(starts, line_num) - 1][1])
+        for line_num in lines
+    )
+
+
+def collection_stats(indexes, query):
+    """
+    Return BM25 collection statistics over several shards.
+
+    Scores from rank() calls given the same statistics are comparable, so
+    hits from different shards can be merged into one ranking.
+    """
+    terms = set(tokenize(query))
+    return {
+        "docs": sum(len(index["files"]) for index in indexes),
+        "total_length": sum(index["total_length"] for index in indexes),
+        "df": {term: sum(len(term_postings(index, term)) for index in indexes) for term in terms},
+    }
+
+
+def rank(index, query, top=10, accept=None, stats=None):
+    """
+    Return the top BM25 hits for a query as [(score, rel, line numbers)].
+
+    Scores are computed from the stored postings, file lengths and field
+    weights. A query term matches every indexed token containing it, as in
+    lookup(), and its frequency counts each of their occurrences. Terms are processed in decreasing order of their maximum
+    possible contribution; once the current top-N threshold exceeds what
+    the remaining terms could add, files not yet seen are skipped, and once
+    no other file can overtake the top N only those are scored further.
+    `accept` optionally filters rels (e.g. by scope or tag). `stats` from
+    collection_stats() replaces this shard's document count, lengths and
+    document frequencies when several shards are ranked together.
+    """
+    files = index["files"]
+    if not files:
+        return []
+
+    postings = {term: term_postings(index, term) for term in set(tokenize(query))}
+    terms = [term for term, term_files in postings.items() if term_files]
+    if not terms:
+        return []
+
+    if stats is None:
+        stats = {
+            "docs": len(files),
+            "total_length": index["total_length"],
+            "df": {term: len(postings[term]) for term in terms},
+        }
+    n_docs = stats["docs"]
+    avg_length = max(stats["total_length"] / n_docs, 1.0)
+
+    def idf(term):
+        df = stats["df"][term]
+        return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    bounds = {term: idf(term) * (BM25_K1 + 1) for term in terms}
+    terms.sort(key=lambda t: bounds[t], reverse=True)
+
+    scores = {}
+    matched_lines = {}
+    remaining = sum(bounds.values())
+
+    for term in terms:
+        threshold = heapq.nlargest(top, scores.values())[-1] if len(scores) >= top else 0.0
+        only_seen = len(scores) >= top and threshold >= remaining
+
+        if only_seen:
+            # No unseen file can reach the top N. If no other seen file can
+            # either, only the current top N still need their scores finished.
+            contenders = [s for s in scores.values() if s < threshold]
+            pool = scores
+            if not contenders or max(contenders) + remaining <= threshold:
+                pool = [rel for rel, s in scores.items() if s >= threshold]
+            candidates = [(rel, postings[term][rel]) for rel in pool if rel in postings[term]]
+        else:
+            candidates = postings[term].items()
+
+        term_idf = idf(term)
+        for rel, lines in candidates:
+            if accept is not None and not accept(rel):
+                continue
+
+            entry = files[rel]
+            tf = weighted_tf(entry, lines)
+            if tf <= 0:
+                continue
+
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * entry["length"] / avg_length)
+            scores[rel] = scores.get(rel, 0.0) + term_idf * tf * (BM25_K1 + 1) / (tf + norm)
+            matched_lines.setdefault(rel, set()).update(lines)
+
+        remaining -= bounds[term]
+
+    best = heapq.nlargest(top, scores.items(), key=lambda item: item[1])
+    return [(score, rel, sorted(matched_lines[rel])) for rel, score in best]
+
+
+def main():
+    workspace, research_root = locator.locate()
+
+    if not research_root.exists():
+        print("No research notes found. Run init.py first.")
+        sys.exit(1)
+
+    scopes = list(walker.SCOPES)
+    for i, arg in enumerate(sys.argv):
+        if arg == "--scope" and i + 1 < len(sys.argv):
+            scopes = [sys.argv[i + 1]]
+
+    for scope in scopes:
+        if scope not in walker.SCOPES:
+            print(f"Error: Invalid scope '{scope}'. Valid scopes: {', '.join(walker.SCOPES)}")
+            sys.exit(1)
+
+    workers = walker.parse_workers(sys.argv)
+
+    print(f"\n✓ Search index up to date\n")
+    for scope in scopes:
+        index = empty_index() if "--rebuild" in sys.argv else None
+        index, changed = refresh_index(research_root, scope, index, workers)
+        print(f"{scope}: {len(index['files'])} files, {len(index['postings'])} tokens, {changed} updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Note templates for new projects, ideas and experiments.
+
+The create_* scripts and batch_create.py render new notes from the
+workspace's `templates/<name>-template.md` files, falling back to the
+built-in templates below when a file is missing. A template is compiled
+once into a format string and cached by the file's mtime and size, so a
+batch renders thousands of notes from one read, and an edited template
+takes effect on the next render.
+
+Placeholders are `{field}` for the template's fields; any other braces
+are kept as written. The frontmatter keys of the fields are always set
+from the values the script was given (a template's `priority: high` is
+replaced by the idea's priority), and added when a template omits them.
+
+Usage:
+    python3 templates.py --list
+    python3 templates.py --show <name>
+"""
+
+import re
+import sys
+
+import locator
+import notewriter
+
+
+TEMPLATES_DIR = "templates"
+
+# Template name -> fields set from the values given to render()
+FIELDS = {
+    "project": ("title", "type", "created", "updated", "tags"),
+    "idea": ("title", "project", "created", "updated", "tags", "priority"),
+    "validation": ("idea",),
+    "experiment": ("title", "idea", "project", "created", "updated"),
+    "results": ("title", "idea", "project"),
+}
+
+DEFAULTS = {
+    "project": """---
+title: {title}
+type: {type}
+created: {created}
+updated: {updated}
+status: active
+tags: {tags}
+priority: medium
+---
+
+## Project Overview
+
+[Brief description of this project]
+
+## Goals
+
+1. [Goal 1]
+2. [Goal 2]
+3. [Goal 3]
+
+## Related Papers
+
+- [Paper Title]
+- [Paper Title]
+
+## Timeline
+
+- [ ] [Milestone 1]
+- [ ] [Milestone 2]
+- [ ] [Milestone 3]
+""",
+    "idea": """---
+title: {title}
+project: {project}
+created: {created}
+updated: {updated}
+status: unverified
+tags: {tags}
+priority: {priority}
+---
+
+## Idea Description
+
+[Describe your idea]
+
+## Hypothesis
+
+[What do you think will happen?]
+
+## Approach
+
+[How will you test this idea?]
+
+## Related Work
+
+[Papers, projects, or previous experiments]
+
+## Next Steps
+
+- [ ] [Next action item]
+""",
+    "validation": """---
+idea: {idea}
+status: unverified
+validated: null
+---
+
+## Validation Summary
+
+[Idea not yet validated]
+
+## Experiments Conducted
+
+[No experiments yet]
+
+## Key Findings
+
+[Fill in after validation]
+
+## Next Steps
+
+- [ ] Create experiment plan
+- [ ] Run experiment
+""",
+    "experiment": """---
+title: {title}
+idea: {idea}
+project: {project}
+created: {created}
+updated: {updated}
+status: planned
+tags: []
+---
+
+## Experiment Setup
+
+[Describe your experimental setup]
+
+- Dataset:
+- Parameters:
+- Metrics:
+- Baseline:
+
+## Hypothesis
+
+[Your hypothesis about what will happen]
+
+## Procedure
+
+[Step-by-step procedure]
+
+1. [Step 1]
+2. [Step 2]
+3. [Step 3]
+
+## Expected Results
+
+[What you expect to happen]
+
+## Actual Results
+
+[Fill in after experiment completes]
+
+## Conclusion
+
+[Your conclusion from the experiment]
+""",
+    "results": """# Experiment Results
+
+[Fill in after experiment completes]
+
+## Metrics
+
+| Metric | Value |
+|--------|-------|
+|        |       |
+
+## Visualizations
+
+[Add plots, charts, or images]
+
+## Raw Data
+
+[Add links to raw data files]
+""",
+}
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# Template path (or name, for a built-in) -> ((mtime_ns, size) or None, render)
+_compiled = {}
+
+
+def template_path(research_root, name):
+    return research_root / TEMPLATES_DIR / f"{name}-template.md"
+
+
+def compile_template(text, fields):
+    """
+    Compile template text into a function from a values dict to a note.
+
+    Frontmatter keys of the fields become placeholders, then the text is
+    turned into one str.format string with every other brace escaped.
+    """
+    text = notewriter.set_frontmatter(text, {field: "{" + field + "}" for field in fields})
+
+    parts = PLACEHOLDER.split(text)
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            parts[i] = part.replace("{", "{{").replace("}", "}}")
+        elif part in fields:
+            parts[i] = "{" + part + "}"
+        else:
+            parts[i] = "{{" + part + "}}"
+    return "".join(parts).format_map
+
+
+def renderer(research_root, name):
+    """Return the compiled render function of a template."""
+    path = template_path(research_root, name)
+    try:
+        stat = path.stat()
+        key, version = str(path), (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key, version = name, None
+
+    cached = _compiled.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    if version is None:
+        text = DEFAULTS[name]
+    else:
+        text = path.read_text(encoding="utf-8")
+    render = compile_template(text, FIELDS[name])
+    _compiled[key] = (version, render)
+    return render
+
+
+def render(research_root, name, **values):
+    """Render a template with values for its fields."""
+    return renderer(research_root, name)(values)
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--list":
+        for name, fields in FIELDS.items():
+            path = template_path(research_root, name)
+            source = path if path.exists() else "built-in"
+            print(f"{name:<12}{source}")
+            print(f"{'':<12}fields: {', '.join(fields)}")
+        return
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "--show":
+        name = sys.argv[2]
+        if name not in FIELDS:
+            print(f"Error: Unknown template '{name}'. Templates: {', '.join(FIELDS)}")
+            sys.exit(1)
+        path = template_path(research_root, name)
+        print(path.read_text(encoding="utf-8") if path.exists() else DEFAULTS[name], end="")
+        return
+
+    print("Usage: python3 templates.py --list")
+    print("       python3 templates.py --show <name>")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
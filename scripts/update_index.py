@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Regenerate index.md and tags.md.
+
+The generated parts of both files live between marker comments
+(`<!-- index:<section> -->` ... `<!-- /index:<section> -->`); anything
+outside the markers is left as written. Each project's contribution
+(its index entry, note counts and tagged notes) is cached in
+.index-cache.json, so after a change only the changed projects are
+re-read, from the metadata catalog when it is enabled or from the notes
+otherwise, and only sections whose text changed are rewritten.
+
+Files are written to a temp file and renamed into place under an
+exclusive lock, so concurrent script runs never see or leave a partial
+file and never drop each other's entries.
+
+Usage:
+    python3 update_index.py [--project <project>]
+"""
+
+import sys
+import json
+import fcntl
+from contextlib import contextmanager
+from datetime import datetime
+
+import autocommit
+import catalog
+import frontmatter
+import locator
+import notewriter
+import resolver
+import walker
+
+
+CACHE_FILE = ".index-cache.json"
+CACHE_VERSION = 1
+LOCK_FILE = ".index.lock"
+
+# Headings of the generated sections; used to add markers to old files
+INDEX_SECTIONS = {"projects": "## Projects", "tags": "## Tags", "stats": "## Quick Stats"}
+TAGS_SECTIONS = {"all-tags": "## All Tags"}
+
+
+@contextmanager
+def locked(research_root):
+    """Hold an exclusive lock on the index files."""
+    with open(research_root / LOCK_FILE, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_cache(research_root):
+    """Load the per-project record cache; None if missing, corrupt or stale."""
+    try:
+        with open(research_root / CACHE_FILE, 'r', encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    if not isinstance(cache.get("projects"), dict):
+        return None
+    return cache
+
+
+def note_link(rel, kind):
+    """Return the link to a note file from a note directory path."""
+    return f"{rel}/{walker.NOTE_FILES[kind]}"
+
+
+def add_tags(record, tags, title, link, kind):
+    """Add a note to the tag lists of a project record."""
+    for tag in tags or []:
+        record["tags"].setdefault(tag, []).append([title, link, kind])
+
+
+def catalog_record(conn, research_root, project_dir):
+    """Build a project record from the metadata catalog."""
+    rel = catalog.rel_path(research_root, project_dir)
+    row = conn.execute("SELECT * FROM projects WHERE path = ?", (rel,)).fetchone()
+    if row is None:
+        return None
+
+    record = {
+        "title": row["title"],
+        "type": row["type"],
+        "created": row["created"],
+        "link": note_link(rel, "project"),
+        "ideas": 0,
+        "experiments": 0,
+        "tags": {},
+    }
+    add_tags(record, json.loads(row["tags"] or "[]"), row["title"], record["link"], "project")
+
+    for table, kind, counter in (("ideas", "idea", "ideas"), ("experiments", "experiment", "experiments")):
+        rows = conn.execute(
+            f"SELECT path, title, tags FROM {table} WHERE project_path = ? ORDER BY path", (rel,)
+        ).fetchall()
+        record[counter] = len(rows)
+        for note in rows:
+            add_tags(record, json.loads(note["tags"] or "[]"), note["title"],
+                     note_link(note["path"], kind), kind)
+
+    return record
+
+
+def scan_record(research_root, project_dir):
+    """Build a project record by reading the project's notes."""
+    project_md = project_dir / "project.md"
+    if not project_md.exists():
+        return None
+
+    meta = frontmatter.read(project_md)
+    rel = catalog.rel_path(research_root, project_dir)
+    title = meta.get("title") or project_dir.name
+    record = {
+        "title": title,
+        "type": meta.get("type"),
+        "created": meta.get("created"),
+        "link": note_link(rel, "project"),
+        "ideas": 0,
+        "experiments": 0,
+        "tags": {},
+    }
+    add_tags(record, meta.get("tags"), title, record["link"], "project")
+
+    ideas_dirs, _ = walker.scan(project_dir / "ideas")
+    for idea_name in sorted(ideas_dirs):
+        idea_dir = ideas_dirs[idea_name]
+        subdirs, files = walker.scan(idea_dir)
+        if "idea.md" in files:
+            record["ideas"] += 1
+            meta = frontmatter.read(idea_dir / "idea.md")
+            add_tags(record, meta.get("tags"), meta.get("title") or idea_name,
+                     note_link(catalog.rel_path(research_root, idea_dir), "idea"), "idea")
+
+        if "experiments" not in subdirs:
+            continue
+        experiment_dirs, _ = walker.scan(subdirs["experiments"])
+        for experiment_name in sorted(experiment_dirs):
+            experiment_dir = experiment_dirs[experiment_name]
+            _, files = walker.scan(experiment_dir)
+            if "experiment.md" not in files:
+                continue
+            record["experiments"] += 1
+            meta = frontmatter.read(experiment_dir / "experiment.md")
+            add_tags(record, meta.get("tags"), meta.get("title") or experiment_name,
+                     note_link(catalog.rel_path(research_root, experiment_dir), "experiment"),
+                     "experiment")
+
+    return record
+
+
+def render_projects(records):
+    """Render the Projects section of index.md."""
+    lines = []
+    for record in records:
+        created = (record["created"] or "")[:10]
+        lines.append(f"- [{record['title']}]({record['link']}) - {record['type']} - {created}")
+    return "\n".join(lines) or "[Projects will be listed here automatically]"
+
+
+def merge_tags(records):
+    """Return {tag: [[title, link, kind], ...]} over all projects."""
+    tags = {}
+    for record in records:
+        for tag, notes in record["tags"].items():
+            tags.setdefault(tag, []).extend(notes)
+    return tags
+
+
+def render_tag_counts(tags):
+    """Render the Tags section of index.md, most used first."""
+    ordered = sorted(tags.items(), key=lambda item: (-len(item[1]), item[0]))
+    lines = [f"- [#{tag}](tags.md#{tag}) ({len(notes)})" for tag, notes in ordered]
+    return "\n".join(lines) or "[Tags will be listed here automatically]"
+
+
+def render_stats(records):
+    """Render the Quick Stats section of index.md."""
+    return "\n".join([
+        f"- Total Projects: {len(records)}",
+        f"- Total Ideas: {sum(record['ideas'] for record in records)}",
+        f"- Total Experiments: {sum(record['experiments'] for record in records)}",
+    ])
+
+
+def render_all_tags(tags):
+    """Render the All Tags section of tags.md."""
+    blocks = []
+    for tag in sorted(tags):
+        lines = [f"### #{tag}", ""]
+        lines.extend(f"- [{title}]({link}) - {kind}" for title, link, kind in tags[tag])
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) or "[Tagged notes will be listed here automatically]"
+
+
+def markers(section):
+    """Return the begin and end markers of a generated section."""
+    return f"<!-- index:{section} -->", f"<!-- /index:{section} -->"
+
+
+def add_markers(content, headings):
+    """Wrap the body of each generated section of an older file in markers."""
+    for section, heading in headings.items():
+        begin, end = markers(section)
+        if begin in content:
+            continue
+
+        block = f"{heading}\n\n{begin}\n{end}\n"
+        start = content.find(f"{heading}\n")
+        if start == -1:
+            # Add missing sections before the tag usage notes, or at the end
+            usage = content.find("## Tag Usage")
+            if usage == -1:
+                content = content.rstrip("\n") + "\n\n" + block
+            else:
+                content = content[:usage] + block + "\n" + content[usage:]
+            continue
+
+        stop = content.find("\n## ", start + len(heading))
+        stop = len(content) if stop == -1 else stop + 1
+        content = content[:start] + block + ("\n" if stop < len(content) else "") + content[stop:]
+    return content
+
+
+def replace_section(content, section, body):
+    """Replace the text between a section's markers; returns (content, changed)."""
+    begin, end = markers(section)
+    start = content.index(begin) + len(begin)
+    stop = content.index(end, start)
+    new = f"\n{body}\n"
+    if content[start:stop] == new:
+        return content, False
+    return content[:start] + new + content[stop:], True
+
+
+def update_file(path, title, headings, sections):
+    """Rewrite the changed sections of one generated file. Returns True if written."""
+    try:
+        old = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        old = f"# {title}\n"
+
+    content = add_markers(old, headings)
+    changed = False
+    for section, body in sections.items():
+        content, section_changed = replace_section(content, section, body)
+        changed = changed or section_changed
+
+    if not changed and content == old:
+        return False
+
+    lines = content.split("\n")
+    for i, line in enumerate(lines):
+        if line.startswith("Last updated: "):
+            lines[i] = f"Last updated: {datetime.now().isoformat()}"
+            break
+    notewriter.atomic_write(path, "\n".join(lines))
+    return True
+
+
+def update_index(research_root, project_dirs=None, conn=None):
+    """
+    Refresh index.md and tags.md after projects changed.
+
+    `project_dirs` are the projects whose notes changed (None rebuilds
+    every project's record). Without a usable cache the other projects'
+    records are unknown, so every project is rebuilt regardless. Uses
+    the catalog connection when given. Returns the names of the files
+    that were rewritten.
+    """
+    with locked(research_root):
+        cache = load_cache(research_root)
+        if cache is None:
+            cache = {"version": CACHE_VERSION, "projects": {}}
+            project_dirs = None
+        records = cache["projects"]
+
+        if project_dirs is None:
+            records.clear()
+            project_dirs, _ = walker.scan(research_root / "projects")
+            project_dirs = list(project_dirs.values())
+
+        for project_dir in project_dirs:
+            rel = catalog.rel_path(research_root, project_dir)
+            if conn is not None:
+                record = catalog_record(conn, research_root, project_dir)
+            else:
+                record = scan_record(research_root, project_dir)
+            if record is None:
+                records.pop(rel, None)
+            else:
+                records[rel] = record
+
+        ordered = [records[rel] for rel in sorted(records)]
+        tags = merge_tags(ordered)
+
+        written = []
+        if update_file(research_root / "index.md", "Research Notes Index", INDEX_SECTIONS, {
+            "projects": render_projects(ordered),
+            "tags": render_tag_counts(tags),
+            "stats": render_stats(ordered),
+        }):
+            written.append("index.md")
+        if update_file(research_root / "tags.md", "Research Notes Tags", TAGS_SECTIONS, {
+            "all-tags": render_all_tags(tags),
+        }):
+            written.append("tags.md")
+
+        notewriter.atomic_write(research_root / CACHE_FILE, json.dumps(cache, separators=(",", ":")))
+        return written
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if not (research_root / "projects").exists():
+        print("No projects directory found. Run init.py first.")
+        sys.exit(1)
+
+    conn = catalog.open_catalog(research_root)
+    if conn:
+        catalog.sync(conn, research_root)
+
+    project_dirs = None
+    for i, arg in enumerate(sys.argv):
+        if arg == "--project" and i + 1 < len(sys.argv):
+            project_dir = resolver.resolve_project(research_root, sys.argv[i + 1], conn)
+            if not project_dir:
+                print(f"Error: Project '{sys.argv[i + 1]}' not found")
+                sys.exit(1)
+            project_dirs = [project_dir]
+
+    written = update_index(research_root, project_dirs, conn)
+    catalog.close_catalog(conn, research_root)
+
+    if written:
+        autocommit.commit(research_root, [research_root / name for name in written], "Update index")
+        print(f"✓ Updated {', '.join(written)}")
+    else:
+        print("✓ Index is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,193 @@
 #!/usr/bin/env python3
 """
-Update validation status for an idea.
+Update validation status for an idea, or for many ideas in one pass.
+
+Bulk mode reads (project, idea, status) updates from a file or stdin
+(`-`), one per line, as JSON objects or tab/comma-separated fields:
+
+    {"project": "3D Neural Rendering", "idea": "Depth Prior", "status": "in-progress"}
+    3D Neural Rendering<TAB>Sparse-view Reconstruction<TAB>validated
+
+Each project and idea is resolved once and each note written once, with
+the updates to one idea applied in order. Every status change is
+appended to the transition log (see validation_log.py).
 
 Usage:
     python3 update_validation.py <project> <idea> --status <status>
+    python3 update_validation.py --batch <file|->
 """
 
 import sys
-import re
+import csv
+import json
 from datetime import datetime
 from pathlib import Path
 
+import autocommit
+import catalog
+import frontmatter
+import locator
+import notewriter
+import resolver
+import validation_log
+
+
+VALID_STATUSES = ["unverified", "planned", "in-progress", "validated", "rejected", "on-hold"]
+
+
+def parse_updates(text):
+    """Parse bulk input into a list of (project, idea, status) tuples."""
+    updates = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            if line.lstrip().startswith("{"):
+                record = json.loads(line)
+                fields = [record.get("project"), record.get("idea"), record.get("status")]
+            else:
+                fields = next(csv.reader([line], delimiter="\t" if "\t" in line else ","))
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"line {number}: {e}")
+        if len(fields) != 3 or not all(fields):
+            raise ValueError(f"line {number}: expected project, idea and status")
+        updates.append(tuple(str(field).strip() for field in fields))
+    return updates
+
+
+class Updates:
+    """Queues status updates, resolving each target only once."""
+
+    def __init__(self, research_root, conn):
+        self.research_root = research_root
+        self.conn = conn
+        self.now = datetime.now().isoformat()
+        self.projects = {}
+        self.ideas = {}
+        self.statuses = {}
+        self.transitions = []
+
+    def project(self, name):
+        key = name.casefold()
+        if key not in self.projects:
+            self.projects[key] = resolver.resolve_project(self.research_root, name, self.conn)
+        return self.projects[key]
+
+    def idea(self, project_dir, title):
+        key = (project_dir, title.casefold())
+        if key not in self.ideas:
+            self.ideas[key] = resolver.resolve_idea(self.research_root, project_dir, title, self.conn)
+        return self.ideas[key]
+
+    def add(self, project_name, idea_title, status):
+        """Queue one update. Raises ValueError for an unknown status or target."""
+        if status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status '{status}'. Valid statuses: {', '.join(VALID_STATUSES)}")
+        project_dir = self.project(project_name)
+        if not project_dir:
+            raise ValueError(f"Project '{project_name}' not found")
+        idea_dir = self.idea(project_dir, idea_title)
+        if not idea_dir:
+            raise ValueError(f"Idea '{idea_title}' not found in project '{project_name}'")
+        self.statuses.setdefault(idea_dir, []).append(status)
+
+    def set_status(self, idea_dir):
+        """idea.md change: log each transition from the status on disk."""
+        def change(content):
+            metadata = frontmatter.parse(content)
+            current = metadata.get("status")
+            title = metadata.get("title") or idea_dir.name
+            for status in self.statuses[idea_dir]:
+                if status != current:
+                    self.transitions.append(validation_log.transition(
+                        self.research_root, idea_dir, title, current, status, self.now))
+                current = status
+            return notewriter.set_frontmatter(content, {"status": current, "updated": self.now})
+        return change
+
+    def set_validation(self, idea_dir):
+        """validation.md change: stamp `validated` on a final status, clear it otherwise."""
+        def change(content):
+            validated = frontmatter.parse(content).get("validated")
+            for status in self.statuses[idea_dir]:
+                validated = (validated or self.now) if status in validation_log.FINAL_STATUSES else None
+            return notewriter.set_frontmatter(content, {"status": status, "validated": validated})
+        return change
+
+    def commit(self):
+        """Write each note once, then log the transitions and update the catalog."""
+        with notewriter.Batch() as batch:
+            for idea_dir in self.statuses:
+                batch.edit(idea_dir / "idea.md", self.set_status(idea_dir))
+                batch.edit(idea_dir / "validation.md", self.set_validation(idea_dir))
+
+        log = validation_log.log_path(self.research_root)
+        log_is_new = not log.exists()
+        validation_log.append(self.research_root, self.transitions)
+
+        if self.conn:
+            for idea_dir in self.statuses:
+                catalog.upsert_idea(self.conn, self.research_root, idea_dir)
+
+        # One commit for every note and the log, if auto_commit is on
+        notes = [idea_dir / name for idea_dir in self.statuses for name in ("idea.md", "validation.md")]
+        moves = ", ".join(f"{t['title']} -> {t['to']}" for t in self.transitions[:3]) or "no status change"
+        if len(self.transitions) > 3:
+            moves += f" and {len(self.transitions) - 3} more"
+        if notes:
+            autocommit.commit(self.research_root, notes + ([] if log_is_new else [log]),
+                              f"Update validation: {moves}", new=[log] if log_is_new and self.transitions else [])
+
+
+def bulk(research_root, source):
+    try:
+        if source == "-":
+            text = sys.stdin.read()
+        else:
+            text = Path(source).read_text(encoding="utf-8")
+        updates = parse_updates(text)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read updates: {e}")
+        sys.exit(1)
+
+    conn = catalog.open_catalog(research_root)
+    batch = Updates(research_root, conn)
+    errors = []
+    for number, update in enumerate(updates, 1):
+        try:
+            batch.add(*update)
+        except ValueError as e:
+            errors.append(f"update {number}: {e}")
+
+    batch.commit()
+    catalog.close_catalog(conn, research_root)
+
+    print(f"✓ Validation statuses updated")
+    print(f"\nIdeas updated: {len(batch.statuses)}")
+    print(f"Transitions logged: {len(batch.transitions)}")
+
+    if errors:
+        print(f"\n⚠️  {len(errors)} updates failed:")
+        for error in errors[:20]:
+            print(f"  {error}")
+        sys.exit(1)
+
 
 def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--batch":
+        if len(sys.argv) < 3:
+            print("Error: --batch requires a file or -")
+            sys.exit(1)
+        bulk(research_root, sys.argv[2])
+        return
+
     if len(sys.argv) < 5:
         print("Usage: python3 update_validation.py <project> <idea> --status <status>")
-        print("\nStatus: unverified, planned, in-progress, validated, rejected, on-hold")
+        print("       python3 update_validation.py --batch <file|->")
+        print(f"\nStatus: {', '.join(VALID_STATUSES)}")
         sys.exit(1)
 
     project_name = sys.argv[1]
@@ -28,122 +200,24 @@ def main():
 
     status = sys.argv[4]
 
-    # Validate status
-    valid_statuses = ["unverified", "planned", "in-progress", "validated", "rejected", "on-hold"]
-    if status not in valid_statuses:
-        print(f"Error: Invalid status '{status}'. Valid statuses: {', '.join(valid_statuses)}")
-        sys.exit(1)
-
-    # Get paths
-    workspace = Path(__file__).parent.parent.parent.parent.parent
-    research_root = workspace / "research-notes"
-    projects_dir = research_root / "projects"
-
-    # Find project and idea directories
-    project_dir = None
-    idea_dir = None
-
-    for p in projects_dir.iterdir():
-        if not p.is_dir():
-            continue
-
-        project_md = p / "project.md"
-        if not project_md.exists():
-            continue
-
-        content = project_md.read_text(encoding="utf-8")
-        # Check if project title matches
-        for line in content.split('\n'):
-            if line.startswith("title:"):
-                project_title = line.split(':', 1)[1].strip().strip('"\'')
-                if project_title.lower() == project_name.lower():
-                    project_dir = p
-                    break
-
-        if project_dir:
-            # Find idea
-            ideas_dir = project_dir / "ideas"
-            if ideas_dir.exists():
-                for i in ideas_dir.iterdir():
-                    if i.is_dir():
-                        idea_md = i / "idea.md"
-                        if idea_md.exists():
-                            idea_content = idea_md.read_text(encoding="utf-8")
-                            for line in idea_content.split('\n'):
-                                if line.startswith("title:"):
-                                    it = line.split(':', 1)[1].strip().strip('"\'')
-                                    if it.lower() == idea_title.lower():
-                                        idea_dir = i
-                                        break
-                            if idea_dir:
-                                break
-            break
-
-    if not project_dir:
-        print(f"Error: Project '{project_name}' not found")
-        sys.exit(1)
-
-    if not idea_dir:
-        print(f"Error: Idea '{idea_title}' not found in project '{project_name}'")
+    # Find project and idea directories, update both notes
+    conn = catalog.open_catalog(research_root)
+    batch = Updates(research_root, conn)
+    try:
+        batch.add(project_name, idea_title, status)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
-    # Update idea.md status
-    idea_md = idea_dir / "idea.md"
-    idea_content = idea_md.read_text(encoding="utf-8")
-
-    # Update status in idea.md
-    idea_content = re.sub(
-        r'^status: .*$',
-        f'status: {status}',
-        idea_content,
-        flags=re.MULTILINE
-    )
-
-    now = datetime.now().isoformat()
-    idea_content = re.sub(
-        r'^updated: .*$',
-        f'updated: {now}',
-        idea_content,
-        flags=re.MULTILINE
-    )
-
-    idea_md.write_text(idea_content, encoding="utf-8")
-
-    # Update validation.md
-    validation_md = idea_dir / "validation.md"
-    validation_content = validation_md.read_text(encoding="utf-8")
-
-    # Update status in validation.md
-    validation_content = re.sub(
-        r'^status: .*$',
-        f'status: {status}',
-        validation_content,
-        flags=re.MULTILINE
-    )
-
-    if status in ["validated", "rejected"]:
-        validation_content = re.sub(
-            r'^validated: null$',
-            f'validated: {now}',
-            validation_content,
-            flags=re.MULTILINE
-        )
-    else:
-        validation_content = re.sub(
-            r'^validated: .*$',
-            'validated: null',
-            validation_content,
-            flags=re.MULTILINE
-        )
-
-    validation_md.write_text(validation_content, encoding="utf-8")
+    batch.commit()
+    catalog.close_catalog(conn, research_root)
 
     print(f"\n✓ Validation status updated successfully!")
     print(f"\nIdea: {idea_title}")
     print(f"Project: {project_name}")
     print(f"New status: {status}")
-    if status in ["validated", "rejected"]:
-        print(f"Validated: {now}")
+    if status in validation_log.FINAL_STATUSES:
+        print(f"Validated: {batch.now}")
 
 
 if __name__ == "__main__":
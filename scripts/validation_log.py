@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Append-only log of validation status transitions.
+
+Every status change made by `update_validation.py` is appended as one
+JSON line to `research-notes/validation-log.jsonl`:
+
+    {"time": "2026-10-16T12:00:00", "path": "projects/3d-neural-rendering/ideas/depth-prior",
+     "project": "3d-neural-rendering", "idea": "depth-prior", "title": "Depth Prior",
+     "from": "planned", "to": "in-progress"}
+
+`path` is the idea directory relative to the notes root and identifies
+the idea in the reports; `project` and `idea` are its directory names
+and `title` is the idea note's title at the time of the change. Lines
+are only ever appended, so the log is the status history the notes
+themselves do not keep, and the reports below are computed from it
+alone, without reading a note.
+An idea's time before its first logged transition is not counted.
+
+Usage:
+    python3 validation_log.py time-in [<status>] [--project <project>]
+    python3 validation_log.py throughput [--by day|week|month] [--project <project>]
+"""
+
+import os
+import sys
+import json
+import fcntl
+from datetime import datetime
+
+import catalog
+import locator
+import resolver
+
+
+LOG_FILE = "validation-log.jsonl"
+FINAL_STATUSES = ("validated", "rejected")
+PERIODS = ("day", "week", "month")
+
+
+def log_path(research_root):
+    return research_root / LOG_FILE
+
+
+def transition(research_root, idea_dir, title, old, new, now):
+    """Return the log record for one status change of an idea."""
+    return {
+        "time": now,
+        "path": idea_dir.relative_to(research_root).as_posix(),
+        "project": idea_dir.parent.parent.name,
+        "idea": idea_dir.name,
+        "title": title,
+        "from": old,
+        "to": new,
+    }
+
+
+def append(research_root, records):
+    """Append records to the log in a single locked write."""
+    if not records:
+        return
+    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    fd = os.open(log_path(research_root), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.write(fd, data.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def read(research_root, project=None):
+    """
+    Return the logged transitions in time order, optionally for one project.
+
+    `project` is a project directory name, as logged.
+    """
+    path = log_path(research_root)
+    if not path.exists():
+        return []
+
+    records = []
+    with open(path, 'r', encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash; the rest of the log is intact
+                continue
+            if project is not None and record.get("project") != project:
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record.get("time", ""))
+    return records
+
+
+def idea_key(record):
+    """The idea's path; derived from its directory names for older records."""
+    return record.get("path") or f"projects/{record['project']}/ideas/{record['idea']}"
+
+
+def time_in(records, status, now):
+    """
+    Return {idea path: (seconds, ongoing)} spent in a status.
+
+    An idea still in the status is counted up to `now`.
+    """
+    entered = {}
+    totals = {}
+    for record in records:
+        key = idea_key(record)
+        time = datetime.fromisoformat(record["time"])
+        if key in entered:
+            seconds, _ = totals.get(key, (0.0, False))
+            totals[key] = (seconds + (time - entered.pop(key)).total_seconds(), False)
+        if record["to"] == status:
+            entered[key] = time
+            totals.setdefault(key, (0.0, False))
+
+    for key, start in entered.items():
+        seconds, _ = totals[key]
+        totals[key] = (seconds + max(0.0, (now - start).total_seconds()), True)
+    return totals
+
+
+def period_key(time, by):
+    """Bucket an ISO timestamp by day, ISO week or month."""
+    if by == "day":
+        return time[:10]
+    if by == "month":
+        return time[:7]
+    year, week, _ = datetime.fromisoformat(time).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def throughput(records, by):
+    """Return {period: {"started": n, "validated": n, "rejected": n}}."""
+    counts = {}
+    for record in records:
+        to = record["to"]
+        if to == "in-progress":
+            column = "started"
+        elif to in FINAL_STATUSES:
+            column = to
+        else:
+            continue
+        period = counts.setdefault(period_key(record["time"], by),
+                                   {"started": 0, "validated": 0, "rejected": 0})
+        period[column] += 1
+    return counts
+
+
+def format_duration(seconds):
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def option(args, name):
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+    return None
+
+
+def positional(args):
+    """Arguments that are neither options nor option values."""
+    values = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg.startswith("--"):
+            skip = True
+        else:
+            values.append(arg)
+    return values
+
+
+def print_usage():
+    print("Usage: python3 validation_log.py time-in [<status>] [--project <project>]")
+    print("       python3 validation_log.py throughput [--by day|week|month] [--project <project>]")
+
+
+def main():
+    # Get paths
+    workspace, research_root = locator.locate()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("time-in", "throughput"):
+        print_usage()
+        sys.exit(1)
+
+    command = sys.argv[1]
+    args = sys.argv[2:]
+    project = option(args, "--project")
+    project_name = None
+    if project:
+        # The log holds directory names; resolve the title like metrics.py does
+        conn = catalog.open_catalog(research_root)
+        project_dir = resolver.resolve_project(research_root, project, conn)
+        catalog.close_catalog(conn, research_root)
+        if not project_dir:
+            print(f"Error: Project '{project}' not found")
+            sys.exit(1)
+        project_name = project_dir.name
+    records = read(research_root, project_name)
+
+    if not records:
+        print(f"No transitions logged{f' for project {project!r}' if project else ''}")
+        return
+
+    if command == "time-in":
+        names = positional(args)
+        status = names[0] if names else "in-progress"
+        totals = time_in(records, status, datetime.now())
+        if not totals:
+            print(f"No idea has been in '{status}'")
+            return
+
+        rows = sorted(totals.items(), key=lambda item: -item[1][0])
+        print(f"Time in {status}:\n")
+        for path, (seconds, ongoing) in rows:
+            print(f"  {format_duration(seconds):>10}  {path}{'  (ongoing)' if ongoing else ''}")
+
+        durations = sorted(seconds for seconds, _ in totals.values())
+        middle = len(durations) // 2
+        median = durations[middle] if len(durations) % 2 else (durations[middle - 1] + durations[middle]) / 2
+        print(f"\nIdeas: {len(durations)}")
+        print(f"Mean: {format_duration(sum(durations) / len(durations))}")
+        print(f"Median: {format_duration(median)}")
+        return
+
+    by = option(args, "--by") or "week"
+    if by not in PERIODS:
+        print(f"Error: Invalid period '{by}'. Valid periods: {', '.join(PERIODS)}")
+        sys.exit(1)
+
+    counts = throughput(records, by)
+    print(f"{by.capitalize():<12}{'Started':>9}{'Validated':>11}{'Rejected':>10}")
+    for period in sorted(counts):
+        c = counts[period]
+        print(f"{period:<12}{c['started']:>9}{c['validated']:>11}{c['rejected']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Shared filesystem walk over research-notes/projects.
+
+The walk uses os.scandir and lists every directory exactly once; note
+files are detected from the parent listing instead of separate exists()
+calls. Per-file work (stat, reads, parsing) is fanned out to a thread
+pool so that slow, network-mounted volumes are read in parallel.
+"""
+
+import os
+from collections import namedtuple
+from pathlib import Path
+
+
+DEFAULT_WORKERS = 8
+
+Note = namedtuple("Note", ["kind", "dir", "path", "project_dir"])
+
+NOTE_FILES = {
+    "project": "project.md",
+    "idea": "idea.md",
+    "experiment": "experiment.md",
+    "results": "results.md",
+}
+
+# Searchable content areas: scope name -> kind of the notes it holds
+SCOPES = {
+    "ideas": "idea",
+    "experiments": "experiment",
+    "results": "results",
+    "papers": "paper",
+    "engineering": "engineering",
+}
+
+
+def default_workers():
+    """Return the worker count from RESEARCH_NOTES_WORKERS, or the default."""
+    try:
+        return max(1, int(os.environ.get("RESEARCH_NOTES_WORKERS", DEFAULT_WORKERS)))
+    except ValueError:
+        return DEFAULT_WORKERS
+
+
+def parse_workers(argv):
+    """Return the value of a --workers flag in argv, or the default."""
+    for i, arg in enumerate(argv):
+        if arg == "--workers" and i + 1 < len(argv):
+            try:
+                return max(1, int(argv[i + 1]))
+            except ValueError:
+                print(f"Error: Invalid worker count '{argv[i + 1]}'")
+                raise SystemExit(1)
+    return default_workers()
+
+
+def scan(directory):
+    """Return ({subdir name: path}, {file names}) for one directory listing."""
+    dirs = {}
+    files = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs[entry.name] = Path(entry.path)
+                else:
+                    files.add(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return dirs, files
+
+
+def note(kind, directory, files, project_dir):
+    """Build a Note for a directory from its file listing."""
+    name = NOTE_FILES[kind]
+    path = directory / name if name in files else None
+    return Note(kind, directory, path, project_dir)
+
+
+def walk(projects_dir):
+    """
+    Yield a Note for every project, idea and experiment directory.
+
+    `path` is the directory's main note file, or None when it is missing.
+    """
+    project_dirs, _ = scan(projects_dir)
+
+    for project_name in sorted(project_dirs):
+        project_dir = project_dirs[project_name]
+        subdirs, files = scan(project_dir)
+        yield note("project", project_dir, files, project_dir)
+
+        if "ideas" not in subdirs:
+            continue
+
+        idea_dirs, _ = scan(subdirs["ideas"])
+        for idea_name in sorted(idea_dirs):
+            idea_dir = idea_dirs[idea_name]
+            subdirs, files = scan(idea_dir)
+            yield note("idea", idea_dir, files, project_dir)
+
+            if "experiments" not in subdirs:
+                continue
+
+            experiment_dirs, _ = scan(subdirs["experiments"])
+            for experiment_name in sorted(experiment_dirs):
+                experiment_dir = experiment_dirs[experiment_name]
+                _, files = scan(experiment_dir)
+                yield note("experiment", experiment_dir, files, project_dir)
+
+
+def walk_markdown(directory, kind, project_dir):
+    """Yield a Note for every markdown file below a directory."""
+    subdirs, files = scan(directory)
+    for name in sorted(files):
+        if name.endswith(".md"):
+            yield Note(kind, directory, directory / name, project_dir)
+    for name in sorted(subdirs):
+        yield from walk_markdown(subdirs[name], kind, project_dir)
+
+
+def walk_scope(projects_dir, scope):
+    """
+    Yield the project Notes plus every note of one search scope.
+
+    Only the part of the tree that holds the scope is listed: a papers
+    walk never enters ideas/, and an experiments walk never lists the
+    idea directories themselves.
+    """
+    kind = SCOPES[scope]
+    project_dirs, _ = scan(projects_dir)
+
+    for project_name in sorted(project_dirs):
+        project_dir = project_dirs[project_name]
+        subdirs, files = scan(project_dir)
+        yield note("project", project_dir, files, project_dir)
+
+        if scope in ("papers", "engineering"):
+            if scope in subdirs:
+                yield from walk_markdown(subdirs[scope], kind, project_dir)
+            continue
+
+        if "ideas" not in subdirs:
+            continue
+
+        idea_dirs, _ = scan(subdirs["ideas"])
+        for idea_name in sorted(idea_dirs):
+            idea_dir = idea_dirs[idea_name]
+            if scope == "ideas":
+                _, files = scan(idea_dir)
+                yield note(kind, idea_dir, files, project_dir)
+                continue
+
+            experiment_dirs, _ = scan(idea_dir / "experiments")
+            for experiment_name in sorted(experiment_dirs):
+                experiment_dir = experiment_dirs[experiment_name]
+                _, files = scan(experiment_dir)
+                yield note(kind, experiment_dir, files, project_dir)
+
+
+def parallel_map(fn, items, workers=None):
+    """Apply fn to every item using a thread pool; results keep input order."""
+    items = list(items)
+    if workers is None:
+        workers = default_workers()
+
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(fn, items))
@@ -0,0 +1,162 @@
+"""Artifact ingest into the content-addressed store, and verify."""
+
+import errno
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import artifacts  # noqa: E402
+
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+# Files of 1 KB and more become symlinks into the store
+CONFIG = {"storage": {"symlink_large_files": True, "symlink_threshold": 1 / 1024}}
+
+
+def make_experiment(research_root, name):
+    experiment_dir = research_root / "projects" / "vision" / "ideas" / "depth" / "experiments" / name
+    experiment_dir.mkdir(parents=True)
+    (experiment_dir / "experiment.md").write_text(f"---\ntitle: {name}\n---\n", encoding="utf-8")
+    artifacts_dir = experiment_dir / "artifacts"
+    artifacts_dir.mkdir()
+    return experiment_dir
+
+
+def make_file(directory, name, data):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_bytes(data)
+    return path
+
+
+def store_objects(research_root):
+    return sorted(p for p in (research_root / artifacts.DEFAULT_STORE / "objects").rglob("*") if p.is_file())
+
+
+def test_reingest_stores_each_content_once(tmp_path):
+    research_root = tmp_path / "research-notes"
+    first = make_experiment(research_root, "first") / "artifacts"
+    second = make_experiment(research_root, "second") / "artifacts"
+    src = make_file(tmp_path / "out", "metrics.json", b'{"psnr": 31.2}\n')
+
+    counts = artifacts.ingest(research_root, first, [src], {})
+    assert (counts["new"], counts["deduplicated"], counts["bytes_stored"]) == (1, 0, src.stat().st_size)
+
+    # The same content again, into the same and into another experiment
+    counts = artifacts.ingest(research_root, first, [src], {})
+    assert (counts["new"], counts["deduplicated"], counts["bytes_stored"]) == (0, 1, 0)
+    counts = artifacts.ingest(research_root, second, [src], {})
+    assert (counts["new"], counts["deduplicated"]) == (0, 1)
+
+    [obj] = store_objects(research_root)
+    assert os.path.samefile(first / "metrics.json", obj)
+    assert os.path.samefile(second / "metrics.json", obj)
+
+
+def test_symlink_threshold_picks_symlink_or_hard_link(tmp_path):
+    research_root = tmp_path / "research-notes"
+    artifacts_dir = make_experiment(research_root, "run") / "artifacts"
+    out = tmp_path / "out"
+    small = make_file(out, "small.txt", b"x" * 100)
+    large = make_file(out, "large.bin", b"y" * 4096)
+
+    counts = artifacts.ingest(research_root, artifacts_dir, [small, large], CONFIG)
+    assert (counts["linked"], counts["hardlinked"], counts["copied"]) == (1, 1, 0)
+
+    assert (artifacts_dir / "large.bin").is_symlink()
+    assert artifacts.object_digest(research_root / artifacts.DEFAULT_STORE, artifacts_dir / "large.bin")
+    assert not (artifacts_dir / "small.txt").is_symlink()
+    assert os.stat(artifacts_dir / "small.txt").st_nlink == 2
+
+    manifest = artifacts.load_manifest(artifacts_dir)
+    assert manifest["large.bin"]["linked"] and not manifest["small.txt"]["linked"]
+
+
+def test_copies_when_hard_links_fail(tmp_path, monkeypatch):
+    research_root = tmp_path / "research-notes"
+    artifacts_dir = make_experiment(research_root, "run") / "artifacts"
+    src = make_file(tmp_path / "out", "weights.bin", b"z" * 100)
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(os, "link", cross_device)
+
+    counts = artifacts.ingest(research_root, artifacts_dir, [src], {})
+    assert (counts["hardlinked"], counts["copied"]) == (0, 1)
+
+    [obj] = store_objects(research_root)
+    dest = artifacts_dir / "weights.bin"
+    assert not os.path.samefile(dest, obj)
+    assert dest.read_bytes() == obj.read_bytes()
+    assert sorted(p.name for p in artifacts_dir.iterdir()) == [artifacts.MANIFEST_FILE, "weights.bin"]
+
+
+def test_digest_cache_rehashes_on_inode_mtime_or_size_change(tmp_path):
+    research_root = tmp_path / "research-notes"
+    experiment_dir = make_experiment(research_root, "run")
+    artifacts_dir = experiment_dir / "artifacts"
+    src = make_file(tmp_path / "out", "log.txt", b"epoch 1\n")
+    artifacts.ingest(research_root, artifacts_dir, [src], {})
+    dest = artifacts_dir / "log.txt"
+
+    def verify():
+        report = artifacts.verify(research_root, [experiment_dir], {}, workers=1)
+        return report["hashed"], report["cached"], len(report["ok"]), len(report["drift"])
+
+    assert verify() == (1, 0, 1, 0)
+    assert verify() == (0, 1, 1, 0)
+
+    # Same content and size, new mtime
+    st = dest.stat()
+    os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert verify() == (1, 0, 1, 0)
+    assert verify() == (0, 1, 1, 0)
+
+    # Same content, size and mtime in a new inode
+    st = dest.stat()
+    copy = artifacts_dir / ".log.txt.tmp"
+    shutil.copyfile(dest, copy)
+    os.utime(copy, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(copy, dest)
+    assert verify() == (1, 0, 1, 0)
+
+    # Same size, new content: the cache must not hide the change
+    dest.chmod(0o644)
+    dest.write_bytes(b"epoch 2\n")
+    os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000))
+    assert verify() == (1, 0, 0, 1)
+
+
+def run_verify(research_root):
+    return subprocess.run([sys.executable, str(SCRIPTS / "artifacts.py"), "verify", "--root", str(research_root)],
+                          capture_output=True, text=True)
+
+
+def test_verify_exit_status(tmp_path):
+    research_root = tmp_path / "research-notes"
+    artifacts_dir = make_experiment(research_root, "run") / "artifacts"
+    out = tmp_path / "out"
+    artifacts.ingest(research_root, artifacts_dir,
+                     [make_file(out, "a.txt", b"alpha\n"), make_file(out, "b.txt", b"beta\n")], {})
+
+    result = run_verify(research_root)
+    assert result.returncode == 0, result.stdout
+
+    # Changed: replaced with other content of another size
+    (artifacts_dir / "a.txt").unlink()
+    (artifacts_dir / "a.txt").write_bytes(b"alpha, edited\n")
+    result = run_verify(research_root)
+    assert result.returncode == 1
+    assert "Changed (1)" in result.stdout
+
+    # Missing
+    artifacts.ingest(research_root, artifacts_dir, [out / "a.txt"], {})
+    (artifacts_dir / "b.txt").unlink()
+    result = run_verify(research_root)
+    assert result.returncode == 1
+    assert "Missing (1)" in result.stdout and "Changed" not in result.stdout
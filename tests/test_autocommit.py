@@ -0,0 +1,157 @@
+"""Auto-commit of note batches into a git repository with a bare remote."""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+pytest.importorskip("yaml")
+
+import autocommit  # noqa: E402
+
+
+CONFIG = """git:
+  auto_commit: true
+  auto_push: true
+  commit_message_prefix: "[Research Notes]"
+  commit_window: 0
+  remote: origin
+"""
+
+
+def git(cwd, *args):
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def commit_count(cwd, rev="HEAD"):
+    return int(git(cwd, "rev-list", "--count", rev))
+
+
+@pytest.fixture
+def notes(tmp_path):
+    """A notes root with one committed note, pushed to a bare remote."""
+    remote = tmp_path / "remote.git"
+    root = tmp_path / "research-notes"
+    root.mkdir()
+    git(tmp_path, "init", "-q", "--bare", str(remote))
+    git(root, "init", "-q")
+    git(root, "config", "user.name", "Test")
+    git(root, "config", "user.email", "test@example.com")
+    git(root, "remote", "add", "origin", str(remote))
+
+    (root / "config.yaml").write_text(CONFIG, encoding="utf-8")
+    (root / ".gitignore").write_text(autocommit.GITIGNORE, encoding="utf-8")
+    (root / "a.md").write_text("# A\n", encoding="utf-8")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "Initial")
+    git(root, "push", "-q", "origin", "HEAD")
+    return root, remote
+
+
+@pytest.fixture
+def git_calls(monkeypatch):
+    """The git subcommands autocommit runs, in order."""
+    calls = []
+    run_git = autocommit.git
+
+    def counting_git(research_root, *args, **kwargs):
+        calls.append(args[0])
+        return run_git(research_root, *args, **kwargs)
+    monkeypatch.setattr(autocommit, "git", counting_git)
+    return calls
+
+
+def test_batch_is_one_commit_and_leaves_staged_changes(notes):
+    root, remote = notes
+    branch = git(root, "symbolic-ref", "--short", "HEAD")
+    before = commit_count(root)
+
+    # Unrelated work the user has staged must survive the batch commit
+    (root / "scratch.md").write_text("draft\n", encoding="utf-8")
+    git(root, "add", "scratch.md")
+
+    (root / "a.md").write_text("# A\n\nEdited.\n", encoding="utf-8")
+    (root / "b.md").write_text("# B\n", encoding="utf-8")
+    (root / "c.md").write_text("# C\n", encoding="utf-8")
+    autocommit.commit(root, [root / "a.md"], "Batch one", new=[root / "b.md", root / "c.md"])
+
+    assert commit_count(root) == before + 1
+    assert git(root, "show", "--name-only", "--format=", "HEAD").split() == ["a.md", "b.md", "c.md"]
+    assert git(root, "log", "-1", "--format=%s") == "[Research Notes] Batch one"
+    assert git(root, "diff", "--cached", "--name-only") == "scratch.md"
+    assert git(root, "status", "--porcelain", "--", "a.md", "b.md", "c.md") == ""
+    assert git(remote, "rev-parse", branch) == git(root, "rev-parse", "HEAD")
+
+    # A batch that only edits tracked notes is one more commit
+    (root / "b.md").write_text("# B\n\nEdited.\n", encoding="utf-8")
+    (root / "c.md").write_text("# C\n\nEdited.\n", encoding="utf-8")
+    autocommit.commit(root, [root / "b.md", root / "c.md"], "Batch two")
+
+    assert commit_count(root) == before + 2
+    assert git(root, "show", "--name-only", "--format=", "HEAD").split() == ["b.md", "c.md"]
+    assert git(root, "diff", "--cached", "--name-only") == "scratch.md"
+    assert git(remote, "rev-parse", branch) == git(root, "rev-parse", "HEAD")
+
+
+@pytest.mark.parametrize("index_version", [2, 3, 4])
+def test_batch_runs_one_git_process_plus_push(notes, git_calls, index_version):
+    root, remote = notes
+    (root / "ideas" / "depth").mkdir(parents=True)
+    (root / "ideas" / "depth" / "idea.md").write_text("# Depth\n", encoding="utf-8")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "Ideas")
+    git(root, "update-index", "--index-version", str(index_version))
+
+    # Unrelated staged work, an edit, and new notes (one reported as changed)
+    (root / "scratch.md").write_text("draft\n", encoding="utf-8")
+    git(root, "add", "scratch.md")
+    (root / "a.md").write_text("# A\n\nEdited.\n", encoding="utf-8")
+    (root / "d.md").write_text("# D\n", encoding="utf-8")
+    (root / "ideas" / "depth" / "results.md").write_text("# Results\n", encoding="utf-8")
+    (root / "ideas" / "flow").mkdir()
+    (root / "ideas" / "flow" / "idea.md").write_text("# Flow\n", encoding="utf-8")
+    autocommit.commit(root, [root / "a.md", root / "d.md"], "Batch",
+                      new=[root / "ideas" / "depth" / "results.md", root / "ideas" / "flow" / "idea.md"])
+
+    assert git_calls == ["commit", "push"]
+    assert git(root, "show", "--name-only", "--format=", "HEAD").split() == [
+        "a.md", "d.md", "ideas/depth/results.md", "ideas/flow/idea.md",
+    ]
+    assert git(root, "status", "--porcelain") == "A  scratch.md"
+    git(root, "fsck", "--no-progress")
+
+
+def test_split_index_falls_back_to_git_add(notes, git_calls):
+    root, remote = notes
+    git(root, "update-index", "--split-index")
+
+    (root / "d.md").write_text("# D\n", encoding="utf-8")
+    autocommit.commit(root, [], "Batch", new=[root / "d.md"])
+
+    assert git_calls == ["add", "commit", "push"]
+    assert git(root, "show", "--name-only", "--format=", "HEAD").split() == ["d.md"]
+    assert git(root, "status", "--porcelain") == ""
+
+
+def test_expired_window_is_flushed_without_a_later_batch(notes, monkeypatch):
+    root, remote = notes
+    (root / "config.yaml").write_text(CONFIG.replace("commit_window: 0", "commit_window: 60"), encoding="utf-8")
+    before = commit_count(root)
+
+    (root / "d.md").write_text("# D\n", encoding="utf-8")
+    autocommit.commit(root, [], "Last batch", new=[root / "d.md"])
+    assert not autocommit.flush_due(root)
+    assert commit_count(root) == before
+
+    # What notes_daemon.py does once the window has passed
+    now = time.time()
+    monkeypatch.setattr(autocommit.time, "time", lambda: now + 61)
+    assert autocommit.flush_due(root)
+    assert commit_count(root) == before + 1
+    assert git(root, "log", "-1", "--format=%s") == "[Research Notes] Last batch"
+    assert not autocommit.flush_due(root)
@@ -0,0 +1,84 @@
+"""Manifest parsing and repeated runs of batch_create.py."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+pytest.importorskip("yaml")
+
+import batch_create  # noqa: E402
+
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+YAML = """projects:
+  - title: 3D Neural Rendering
+    type: academic
+    tags: [nerf]
+    ideas:
+      - title: Depth Prior
+        priority: high
+        experiments:
+          - lr-1e-3
+          - title: lr-1e-4
+"""
+
+JSONL = """{"kind": "project", "title": "3D Neural Rendering", "type": "academic", "tags": ["nerf"]}
+
+{"kind": "idea", "project": "3D Neural Rendering", "title": "Depth Prior", "priority": "high"}
+{"kind": "experiment", "project": "3D Neural Rendering", "idea": "Depth Prior", "title": "lr-1e-3"}
+{"kind": "experiment", "project": "3D Neural Rendering", "idea": "Depth Prior", "title": "lr-1e-4"}
+"""
+
+RECORDS = [
+    {"kind": "project", "title": "3D Neural Rendering", "type": "academic", "tags": ["nerf"]},
+    {"kind": "idea", "project": "3D Neural Rendering", "title": "Depth Prior", "priority": "high"},
+    {"kind": "experiment", "project": "3D Neural Rendering", "idea": "Depth Prior", "title": "lr-1e-3"},
+    {"kind": "experiment", "project": "3D Neural Rendering", "idea": "Depth Prior", "title": "lr-1e-4"},
+]
+
+
+def test_yaml_and_jsonl_manifests_give_the_same_records():
+    assert batch_create.parse_manifest(YAML) == RECORDS
+    assert batch_create.parse_manifest(JSONL) == RECORDS
+    assert batch_create.parse_manifest(JSONL, "jsonl") == RECORDS
+
+
+def test_jsonl_errors_name_the_line():
+    with pytest.raises(ValueError, match="^line 2:"):
+        batch_create.parse_manifest('{"kind": "project", "title": "A"}\n{broken\n', "jsonl")
+
+
+def run(research_root, *args, stdin=None):
+    return subprocess.run([sys.executable, str(SCRIPTS / "batch_create.py"), *args, "--root", str(research_root)],
+                          input=stdin, capture_output=True, text=True)
+
+
+def snapshot(research_root):
+    return {path.relative_to(research_root).as_posix(): path.read_bytes()
+            for path in sorted((research_root / "projects").rglob("*.md"))}
+
+
+def test_rerun_from_stdin_creates_nothing_new(tmp_path):
+    research_root = tmp_path / "research-notes"
+    (research_root / "projects").mkdir(parents=True)
+
+    result = run(research_root, "-", stdin=JSONL)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Projects created: 1" in result.stdout
+    assert "Experiments created: 2" in result.stdout
+    notes = snapshot(research_root)
+    assert "projects/3d-neural-rendering/ideas/depth-prior/experiments/lr-1e-4/experiment.md" in notes
+
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(YAML, encoding="utf-8")
+    result = run(research_root, str(manifest))
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Projects created: 0" in result.stdout
+    assert "Ideas created: 0" in result.stdout
+    assert "Experiments skipped (already exist): 2" in result.stdout
+    assert snapshot(research_root) == notes
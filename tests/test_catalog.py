@@ -0,0 +1,102 @@
+"""Catalog reads after notes were added or edited by hand."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import catalog  # noqa: E402
+import list_projects  # noqa: E402
+import resolver  # noqa: E402
+
+
+CONFIG = {"database": {"enabled": True, "path": ".research-notes.db"}}
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def project(title, status):
+    return f"---\ntitle: {title}\nstatus: {status}\n---\n"
+
+
+def idea(title, status, tags):
+    return f"---\ntitle: {title}\nproject: vision\nstatus: {status}\ntags: [{tags}]\n---\n"
+
+
+def read_catalog(research_root, sync=False):
+    conn = catalog.open_catalog(research_root, CONFIG)
+    try:
+        if sync:
+            catalog.sync(conn, research_root)
+        listing = {p["title"]: p["status"] for p in list_projects.catalog_projects(conn)}
+        tagged = catalog.filter_paths(conn, tag="nerf")
+        drafts = catalog.filter_paths(conn, status="draft")
+        project_dir = resolver.resolve_project(research_root, "Vision 2", conn)
+        idea_dir = project_dir and resolver.resolve_idea(research_root, project_dir, "Pose", conn)
+    finally:
+        catalog.close_catalog(conn, research_root, CONFIG)
+    return listing, tagged, drafts, project_dir, idea_dir
+
+
+def make_root(tmp_path):
+    research_root = tmp_path / "research-notes"
+    project_dir = research_root / "projects" / "vision"
+    write(project_dir / "project.md", project("Vision", "active"))
+    write(project_dir / "ideas" / "depth" / "idea.md", idea("Depth", "draft", "nerf"))
+    return research_root, project_dir
+
+
+def test_opening_an_unchanged_tree_does_not_walk_it(tmp_path, monkeypatch):
+    research_root, project_dir = make_root(tmp_path)
+    listing, tagged, _, _, _ = read_catalog(research_root)
+    assert listing == {"Vision": "active"}
+    assert tagged == {"projects/vision/ideas/depth"}
+
+    def sync(*args):
+        raise AssertionError("tree walked")
+    monkeypatch.setattr(catalog, "sync", sync)
+    read_catalog(research_root)
+
+    # An idea directory added by hand changes ideas/ and triggers a sync
+    monkeypatch.undo()
+    write(project_dir / "ideas" / "flow" / "idea.md", idea("Flow", "draft", "nerf"))
+    _, tagged, _, _, _ = read_catalog(research_root)
+    assert tagged == {"projects/vision/ideas/depth", "projects/vision/ideas/flow"}
+
+
+def test_reads_see_hand_edits_after_a_sync(tmp_path):
+    research_root, project_dir = make_root(tmp_path)
+    idea_dir = project_dir / "ideas" / "depth"
+
+    listing, tagged, drafts, found_project, _ = read_catalog(research_root)
+    assert listing == {"Vision": "active"}
+    assert tagged == drafts == {"projects/vision/ideas/depth"}
+    assert found_project is None
+
+    write(project_dir / "project.md", project("Vision 2", "paused"))
+    write(idea_dir / "idea.md", idea("Pose", "validated", "depth"))
+
+    listing, tagged, drafts, found_project, found_idea = read_catalog(research_root, sync=True)
+    assert listing == {"Vision 2": "paused"}
+    assert tagged == set() and drafts == set()
+    assert found_project == project_dir
+    assert found_idea == idea_dir
+
+
+@pytest.mark.parametrize("rel, note", [
+    ("projects/vision/papers/nerf.md", "projects/vision"),
+    ("projects/vision/engineering/setup/notes.md", "projects/vision"),
+    ("projects/vision/ideas/depth/idea.md", "projects/vision/ideas/depth"),
+    ("projects/vision/ideas/depth/experiments/lr/results.md", "projects/vision/ideas/depth/experiments/lr"),
+])
+def test_files_are_filtered_by_the_note_that_owns_them(rel, note):
+    assert catalog.owner(rel) == note
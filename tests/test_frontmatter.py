@@ -0,0 +1,39 @@
+"""Frontmatter parsing and the per-process metadata cache."""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import frontmatter  # noqa: E402
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_parse_values():
+    metadata = frontmatter.parse(
+        "---\ntitle: \"Depth: a prior\"\ntags: [nerf, 'depth', ]\nlinks: [\"a\", \"b\"]\n"
+        "validated: null\n  indented: skipped\n# comment: skipped\n---\nbody: not frontmatter\n"
+    )
+    assert metadata == {"title": "Depth: a prior", "tags": ["nerf", "depth"], "links": ["a", "b"],
+                        "validated": None}
+    assert frontmatter.parse("no frontmatter\n---\ntitle: x\n---\n") == {}
+
+
+def test_read_stops_at_the_header_and_caches_by_stat(tmp_path):
+    path = tmp_path / "idea.md"
+    # The end of a long body is not valid UTF-8, so reading it would fail
+    path.write_bytes(b"---\ntitle: Depth\n---\n" + b"body line\n" * 100_000 + b"\xff")
+    first = frontmatter.read(path)
+    assert first == {"title": "Depth"}
+    assert frontmatter.read(path) is first
+
+    write(path, "---\ntitle: Pose\n---\n")
+    assert frontmatter.read(path) == {"title": "Pose"}
+    assert frontmatter.read_title(tmp_path / "missing.md", "fallback") == "fallback"
@@ -0,0 +1,64 @@
+"""Locating the notes workspace from --root, the environment or the cwd."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import locator  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean(monkeypatch):
+    monkeypatch.delenv(locator.ENV_VAR, raising=False)
+    monkeypatch.setattr(locator, "_roots", {})
+    monkeypatch.setattr(locator, "_configs", {})
+
+
+def make_workspace(path):
+    research_root = path / locator.DIR_NAME
+    research_root.mkdir(parents=True)
+    (research_root / locator.CONFIG_FILE).write_text("database:\n  enabled: true\n", encoding="utf-8")
+    return research_root
+
+
+def test_root_argument_is_removed_and_exported(tmp_path):
+    research_root = make_workspace(tmp_path / "ws")
+    argv = ["search.py", "query", "--root", str(tmp_path / "ws"), "--scope", "papers"]
+    assert locator.locate(argv) == (tmp_path / "ws", research_root)
+    assert argv == ["search.py", "query", "--scope", "papers"]
+    assert os.environ[locator.ENV_VAR] == str(tmp_path / "ws")
+
+    # The exported root applies to later lookups, and may name the notes directory itself
+    assert locator.locate(["search.py"])[1] == research_root
+    assert locator.locate(["search.py", f"--root={research_root}"])[1] == research_root
+
+
+def test_nearest_config_above_the_cwd(tmp_path, monkeypatch):
+    research_root = make_workspace(tmp_path / "ws")
+    nested = research_root / "projects" / "vision"
+    nested.mkdir(parents=True)
+    monkeypatch.chdir(nested)
+    assert locator.locate(["list_projects.py"])[1] == research_root
+
+    monkeypatch.chdir(tmp_path / "ws")
+    assert locator.locate(["list_projects.py"])[1] == research_root
+
+    # No marker anywhere above: the workspace the scripts are installed in
+    monkeypatch.chdir(tmp_path)
+    assert locator.locate(["list_projects.py"])[1] == locator.default_research_root()
+
+
+def test_config_is_parsed_once_until_it_changes(tmp_path):
+    pytest.importorskip("yaml")
+    research_root = make_workspace(tmp_path)
+    config = locator.load_config(research_root)
+    assert config == {"database": {"enabled": True}}
+    assert locator.load_config(research_root) is config
+
+    (research_root / locator.CONFIG_FILE).write_text("database:\n  enabled: false\n", encoding="utf-8")
+    assert locator.load_config(research_root) == {"database": {"enabled": False}}
+    assert locator.load_config(tmp_path / "elsewhere") == {}
@@ -0,0 +1,79 @@
+"""Baselines of experiments created from the stock template."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import metrics  # noqa: E402
+import templates  # noqa: E402
+
+
+RESULTS = "# Experiment Results\n\n| Metric | Value |\n|---|---|\n| PSNR | {psnr} |\n"
+
+
+def experiment_md(research_root, title, baseline=None):
+    text = templates.render(research_root, "experiment", title=title, idea="Depth", project="Vision",
+                            created="2026-01-01", updated="2026-01-01")
+    if baseline is not None:
+        text = text.replace("- Baseline:\n", f"- Baseline: {baseline}\n")
+    return text
+
+
+def write_experiment(research_root, name, psnr, baseline=None):
+    experiment_dir = research_root / "projects" / "vision" / "ideas" / "depth" / "experiments" / name
+    experiment_dir.mkdir(parents=True)
+    (experiment_dir / "experiment.md").write_text(experiment_md(research_root, name, baseline), encoding="utf-8")
+    (experiment_dir / "results.md").write_text(RESULTS.format(psnr=psnr), encoding="utf-8")
+
+
+def test_empty_baseline_line_of_the_stock_template_is_no_baseline(tmp_path):
+    text = experiment_md(tmp_path, "Base")
+    assert "- Baseline:\n\n## Hypothesis" in text
+    assert metrics.parse_baseline(text) == ""
+    assert metrics.parse_baseline(experiment_md(tmp_path, "Wide", "base")) == "base"
+    assert metrics.parse_baseline(experiment_md(tmp_path, "Base", "yes")) == "yes"
+
+
+def test_compare_deltas_against_the_named_baseline(tmp_path):
+    pytest.importorskip("numpy")
+    research_root = tmp_path / "research-notes"
+    write_experiment(research_root, "base", 30.0)
+    write_experiment(research_root, "wide", 31.5, baseline="base")
+
+    store, _ = metrics.refresh(research_root, workers=1)
+    [(name, lower, table)] = metrics.compare(store, "vision")
+    assert name == "PSNR" and not lower
+    assert table["config"].tolist() == ["wide", "base"]
+    assert table["delta"].tolist() == [1.5, 0.0]
+    assert table["is_baseline"].tolist() == [False, True]
+
+
+def test_parse_metrics_reads_the_first_number_of_every_value_cell():
+    content = ("| Metric | Value |\n|:---|---:|\n| **PSNR** | 31.2 dB |\n| Accuracy | 92% |\n"
+               "| Params | 1,024 |\n| Notes | n/a |\n\n| Name | Score |\n|---|---|\n| other | 5 |\n")
+    assert metrics.parse_metrics(content) == [("PSNR", 31.2), ("Accuracy", 92.0), ("Params", 1024.0)]
+
+
+def test_refresh_parses_only_changed_results_and_ranks_per_group(tmp_path):
+    pytest.importorskip("numpy")
+    research_root = tmp_path / "research-notes"
+    write_experiment(research_root, "base", 30.0)
+    write_experiment(research_root, "wide", 31.5)
+    write_experiment(research_root, "deep", 29.0)
+
+    _, counts = metrics.refresh(research_root, workers=1)
+    assert counts == {"parsed": 3, "unchanged": 0, "removed": 0}
+
+    results = research_root / "projects" / "vision" / "ideas" / "depth" / "experiments" / "deep" / "results.md"
+    results.write_text(RESULTS.format(psnr=32.25), encoding="utf-8")
+    store, counts = metrics.refresh(research_root, workers=1)
+    assert counts == {"parsed": 1, "unchanged": 2, "removed": 0}
+
+    experiments, values = metrics.best(store, "psnr", by="experiment")
+    assert store["experiment"][experiments].tolist() == ["deep", "wide", "base"]
+    assert values.tolist() == [32.25, 31.5, 30.0]
+    experiments, values = metrics.best(store, "PSNR", by="idea", minimize=True)
+    assert store["experiment"][experiments].tolist() == ["base"]
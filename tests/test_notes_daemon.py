@@ -0,0 +1,177 @@
+"""Searches and project listings served by a running notes daemon."""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import daemon_client  # noqa: E402
+import list_projects  # noqa: E402
+import notes_daemon  # noqa: E402
+import search  # noqa: E402
+
+
+SEARCH_OPTIONS = {"ranked": False, "top": 10, "max_per_file": 3, "count_only": False, "use_index": True}
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def idea(title, body):
+    return f"---\ntitle: {title}\nproject: vision\n---\n\n## Idea Description\n\n{body}\n"
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """A daemon serving a notes root with two projects, run on a thread."""
+    monkeypatch.delenv("RESEARCH_NOTES_NO_DAEMON", raising=False)
+    research_root = tmp_path / "research-notes"
+    projects_dir = research_root / "projects"
+    write(projects_dir / "vision" / "project.md", "---\ntitle: Vision\n---\n")
+    write(projects_dir / "vision" / "ideas" / "depth" / "idea.md", idea("Depth", "alphaword"))
+    write(projects_dir / "audio" / "project.md", "---\ntitle: Audio\n---\n")
+
+    server = notes_daemon.NotesDaemon(research_root, workers=1)
+    if server.watcher is None:
+        pytest.skip("inotify is not available")
+    sock_path = daemon_client.socket_path(research_root)
+    thread = threading.Thread(target=server.serve, args=(sock_path,), daemon=True)
+    thread.start()
+    while not sock_path.exists():
+        thread.join(0.01)
+
+    yield research_root, server
+    daemon_client.request(research_root, "shutdown")
+    thread.join(5)
+
+
+def search_count(research_root, query):
+    sections = daemon_client.search(research_root, ["ideas"], query, SEARCH_OPTIONS)
+    assert sections is not None, "the daemon did not answer"
+    return sum(len(hit["matches"]) for _, hits in sections for hit in hits)
+
+
+def test_search_after_a_note_edit(daemon):
+    research_root, _ = daemon
+    path = research_root / "projects" / "vision" / "ideas" / "depth" / "idea.md"
+    assert search_count(research_root, "alphaword") == 1
+
+    write(path, idea("Depth", "betaword"))
+    assert search_count(research_root, "betaword") == 1
+    assert search_count(research_root, "alphaword") == 0
+
+
+def test_listing_updates_only_the_changed_project(daemon, monkeypatch):
+    research_root, server = daemon
+    listing = daemon_client.list_projects(research_root)
+    assert [(p["title"], p["ideas_count"]) for p in listing] == [("Audio", 0), ("Vision", 1)]
+    audio = server.projects["audio"]
+
+    # Later changes must not walk the whole tree again
+    def collect_projects(*args):
+        raise AssertionError("full listing rebuild")
+    monkeypatch.setattr(list_projects, "collect_projects", collect_projects)
+
+    projects_dir = research_root / "projects"
+    write(projects_dir / "vision" / "ideas" / "pose" / "idea.md", idea("Pose", "gammaword"))
+    write(projects_dir / "vision" / "project.md", "---\ntitle: Vision 2\n---\n")
+    write(projects_dir / "speech" / "project.md", "---\ntitle: Speech\n---\n")
+
+    listing = daemon_client.list_projects(research_root)
+    assert [(p["title"], p["ideas_count"]) for p in listing] == [
+        ("Audio", 0), ("Speech", 0), ("Vision 2", 2),
+    ]
+    assert server.projects["audio"] is audio
+
+
+def test_a_slow_search_does_not_hold_up_other_clients(daemon, monkeypatch):
+    research_root, _ = daemon
+    started = threading.Event()
+    release = threading.Event()
+    real_search = search.search
+
+    def slow_search(research_root, scopes, query, **kwargs):
+        if query == "slowword":
+            started.set()
+            assert release.wait(10)
+        return real_search(research_root, scopes, query, **kwargs)
+    monkeypatch.setattr(search, "search", slow_search)
+
+    slow = threading.Thread(target=search_count, args=(research_root, "slowword"))
+    slow.start()
+    counts = []
+    fast = threading.Thread(target=lambda: counts.append(search_count(research_root, "alphaword")))
+    try:
+        assert started.wait(10)
+        fast.start()
+        fast.join(5)
+        assert counts == [1]
+    finally:
+        release.set()
+        slow.join(10)
+        fast.join(10)
+
+
+def test_overflow_watches_directories_created_meanwhile(tmp_path, monkeypatch):
+    try:
+        watcher = notes_daemon.InotifyWatcher(tmp_path)
+    except OSError:
+        pytest.skip("inotify is not available")
+
+    # The kernel dropped every event, including the creation of new/deeper
+    new_dir = tmp_path / "new" / "deeper"
+    new_dir.mkdir(parents=True)
+    real_read = os.read
+    overflow = [notes_daemon.EVENT_HEADER.pack(-1, notes_daemon.IN_Q_OVERFLOW, 0, 0)]
+
+    def read(fd, size):
+        if fd == watcher.fd:
+            if overflow:
+                return overflow.pop()
+            raise BlockingIOError
+        return real_read(fd, size)
+    monkeypatch.setattr(os, "read", read)
+    try:
+        assert watcher.read_events() is None
+        monkeypatch.undo()
+
+        real_read(watcher.fd, 65536)  # the events the overflow stood for
+        (new_dir / "idea.md").write_text("x", encoding="utf-8")
+        assert new_dir / "idea.md" in watcher.read_events()
+    finally:
+        watcher.close()
+
+
+def test_polling_daemon_answers_from_the_notes_on_disk(tmp_path, monkeypatch):
+    def no_inotify(root):
+        raise OSError("inotify is not available")
+    monkeypatch.setattr(notes_daemon, "InotifyWatcher", no_inotify)
+
+    research_root = tmp_path / "research-notes"
+    path = research_root / "projects" / "vision" / "ideas" / "depth" / "idea.md"
+    write(research_root / "projects" / "vision" / "project.md", "---\ntitle: Vision\n---\n")
+    write(path, idea("Depth", "alphaword"))
+    server = notes_daemon.NotesDaemon(research_root, workers=1, poll_interval=3600)
+    assert server.watcher is None
+
+    def count(query):
+        args = dict(SEARCH_OPTIONS, scopes=["ideas"], query=query)
+        sections = server.handle_request({"op": "search", "args": args})
+        return sum(len(hit["matches"]) for _, hits in sections for hit in hits)
+
+    # Long before the next poll
+    write(path, idea("Depth", "betaword"))
+    assert count("betaword") == 1 and count("alphaword") == 0
+
+    write(research_root / "projects" / "audio" / "project.md", "---\ntitle: Audio\n---\n")
+    listing = server.handle_request({"op": "list_projects"})
+    assert [p["title"] for p in listing] == ["Audio", "Vision"]
@@ -0,0 +1,95 @@
+"""Locked, atomic note writes under concurrent writers."""
+
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import notewriter  # noqa: E402
+
+
+WRITERS = 4
+EDITS = 50
+# Long enough that a torn write would be visible to a reader
+BODY = "\n## Notes\n\n" + "padding line\n" * 2000 + "END\n"
+
+
+def note(count):
+    return f"---\ntitle: Counter\ncount: {count}\n---\n{BODY}"
+
+
+def count_of(content):
+    for line in content.split("\n"):
+        if line.startswith("count:"):
+            return int(line.split(":", 1)[1])
+    raise AssertionError("no count line")
+
+
+def increment(content):
+    return notewriter.set_frontmatter(content, {"count": count_of(content) + 1})
+
+
+def write_many(path, edits):
+    for _ in range(edits):
+        notewriter.edit(path, increment)
+
+
+def read_many(path, stop, torn):
+    while not stop.is_set():
+        content = path.read_text(encoding="utf-8")
+        if not content.startswith("---\n") or not content.endswith("END\n"):
+            torn.value += 1
+
+
+def test_concurrent_writers_lose_no_update_and_never_tear(tmp_path):
+    path = tmp_path / "idea.md"
+    path.write_text(note(0), encoding="utf-8")
+
+    context = multiprocessing.get_context("fork")
+    stop = context.Event()
+    torn = context.Value("i", 0)
+    reader = context.Process(target=read_many, args=(path, stop, torn))
+    writers = [context.Process(target=write_many, args=(path, EDITS)) for _ in range(WRITERS)]
+    reader.start()
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(60)
+        assert writer.exitcode == 0
+    stop.set()
+    reader.join(10)
+
+    assert count_of(path.read_text(encoding="utf-8")) == WRITERS * EDITS
+    assert torn.value == 0
+    assert sorted(os.listdir(tmp_path)) == ["idea.md"]
+
+
+def test_failed_write_keeps_the_note_and_removes_the_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "idea.md"
+    path.write_text(note(0), encoding="utf-8")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+
+    with pytest.raises(OSError):
+        notewriter.update_frontmatter(path, count=1)
+    assert path.read_text(encoding="utf-8") == note(0)
+    assert sorted(os.listdir(tmp_path)) == ["idea.md"]
+
+
+def test_failed_change_leaves_the_note_untouched(tmp_path):
+    path = tmp_path / "idea.md"
+    path.write_text(note(0), encoding="utf-8")
+
+    def change(content):
+        raise ValueError("bad edit")
+
+    with pytest.raises(ValueError):
+        notewriter.edit(path, increment, change)
+    assert path.read_text(encoding="utf-8") == note(0)
+    assert sorted(os.listdir(tmp_path)) == ["idea.md"]
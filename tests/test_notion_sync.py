@@ -0,0 +1,194 @@
+"""Request counts of incremental and full Notion syncs against a local API stub."""
+
+import json
+import shutil
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+pytest.importorskip("notion_client")
+
+import notion_sync  # noqa: E402
+import notion_transport  # noqa: E402
+
+
+DATABASE_ID = "db"
+
+PROJECT = """---
+title: Sweep
+type: academic
+---
+
+## Project Overview
+
+Hyperparameter sweeps.
+"""
+
+IDEA = """---
+title: Warmup
+project: sweep
+priority: medium
+---
+
+## Idea Description
+
+Longer warmup.
+"""
+
+
+class Stub(BaseHTTPRequestHandler):
+    """
+    Answers every request with a new page and records (method, path).
+
+    Requests listed in `fail` get a 400 response.
+    """
+
+    requests = []
+    fail = set()
+
+    def log_message(self, *args):
+        pass
+
+    def handle_any(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.requests.append((self.command, self.path))
+        if (self.command, self.path) in self.fail:
+            data = json.dumps({"object": "error", "status": 400, "code": "validation_error",
+                               "message": "injected"}).encode()
+            self.send_response(400)
+        else:
+            data = json.dumps({"object": "page", "id": str(uuid.uuid4())}).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = handle_any
+
+
+@pytest.fixture
+def stub():
+    Stub.requests = []
+    Stub.fail = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def sync(research_root, base_url, incremental=True, failing=0):
+    """Run one sync expecting `failing` failed ops; return the requests it made."""
+    config = {"token": "secret", "base_url": base_url, "rate_limit": 0}
+    state = notion_sync.load_state(research_root, DATABASE_ID)
+    notes = notion_sync.collect_notes(research_root)
+    ops, _ = notion_sync.plan_sync(research_root, notes, state, incremental=incremental)
+
+    start = len(Stub.requests)
+    if ops:
+        def on_done(op, page_id, error):
+            if error is None:
+                notion_sync.apply_push(state, op, page_id)
+
+        failures, _ = notion_transport.run_push(config, DATABASE_ID, ops, on_done)
+        assert len(failures) == failing
+    notion_sync.save_state(research_root, state)
+    return Stub.requests[start:]
+
+
+def page_ids(research_root):
+    state = notion_sync.load_state(research_root, DATABASE_ID)
+    return {rel: entry["page_id"] for rel, entry in state["pages"].items()}
+
+
+def test_incremental_sync_request_counts(tmp_path, stub):
+    project_dir = tmp_path / "projects" / "sweep"
+    idea_dir = project_dir / "ideas" / "warmup"
+    idea_dir.mkdir(parents=True)
+    (project_dir / "project.md").write_text(PROJECT, encoding="utf-8")
+    idea_path = idea_dir / "idea.md"
+    idea_path.write_text(IDEA, encoding="utf-8")
+    idea = idea_path.relative_to(tmp_path).as_posix()
+
+    # First sync: one create per note
+    requests = sync(tmp_path, stub)
+    assert [method for method, _ in requests] == ["POST", "POST"]
+    first_id = page_ids(tmp_path)[idea]
+
+    # Unchanged: nothing is sent
+    assert sync(tmp_path, stub) == []
+
+    # Frontmatter edit: one properties update of the same page
+    idea_path.write_text(IDEA.replace("priority: medium", "priority: high"), encoding="utf-8")
+    assert sync(tmp_path, stub) == [("PATCH", f"/v1/pages/{first_id}")]
+    assert page_ids(tmp_path)[idea] == first_id
+
+    # Body edit: a new page is created and the old one archived
+    idea_path.write_text(IDEA.replace("Longer warmup.", "Longer warmup, lower peak."), encoding="utf-8")
+    requests = sync(tmp_path, stub)
+    assert requests == [("POST", "/v1/pages"), ("PATCH", f"/v1/pages/{first_id}")]
+    second_id = page_ids(tmp_path)[idea]
+    assert second_id != first_id
+
+    # Delete: the page is archived and dropped from the state
+    shutil.rmtree(idea_dir)
+    assert sync(tmp_path, stub) == [("PATCH", f"/v1/pages/{second_id}")]
+    assert idea not in page_ids(tmp_path)
+
+
+def test_full_sync_only_pushes_changed_notes(tmp_path, stub):
+    project_dir = tmp_path / "projects" / "sweep"
+    idea_dir = project_dir / "ideas" / "warmup"
+    idea_dir.mkdir(parents=True)
+    (project_dir / "project.md").write_text(PROJECT, encoding="utf-8")
+    idea_path = idea_dir / "idea.md"
+    idea_path.write_text(IDEA, encoding="utf-8")
+    idea = idea_path.relative_to(tmp_path).as_posix()
+
+    assert len(sync(tmp_path, stub, incremental=False)) == 2
+    first_ids = page_ids(tmp_path)
+
+    # Unchanged: every note is read again but nothing is sent
+    assert sync(tmp_path, stub, incremental=False) == []
+    assert page_ids(tmp_path) == first_ids
+
+    # Frontmatter edit: one properties update, page IDs are kept
+    idea_path.write_text(IDEA.replace("priority: medium", "priority: high"), encoding="utf-8")
+    assert sync(tmp_path, stub, incremental=False) == [("PATCH", f"/v1/pages/{first_ids[idea]}")]
+    assert page_ids(tmp_path) == first_ids
+
+
+def test_failed_replace_leaves_no_orphaned_page(tmp_path, stub):
+    idea_dir = tmp_path / "projects" / "sweep" / "ideas" / "warmup"
+    idea_dir.mkdir(parents=True)
+    (tmp_path / "projects" / "sweep" / "project.md").write_text(PROJECT, encoding="utf-8")
+    idea_path = idea_dir / "idea.md"
+    idea_path.write_text(IDEA, encoding="utf-8")
+    idea = idea_path.relative_to(tmp_path).as_posix()
+
+    sync(tmp_path, stub)
+    first_id = page_ids(tmp_path)[idea]
+
+    # The new page is created, archiving the old one fails: the new page is archived again
+    idea_path.write_text(IDEA.replace("Longer warmup.", "Longer warmup, lower peak."), encoding="utf-8")
+    Stub.fail = {("PATCH", f"/v1/pages/{first_id}")}
+    requests = sync(tmp_path, stub, failing=1)
+    assert [method for method, _ in requests] == ["POST", "PATCH", "PATCH"]
+    assert requests[1] == ("PATCH", f"/v1/pages/{first_id}")
+    new_page = requests[2]
+    assert new_page != requests[1]
+    assert page_ids(tmp_path)[idea] == first_id
+
+    # The next sync replaces the page once
+    Stub.fail = set()
+    requests = sync(tmp_path, stub)
+    assert requests == [("POST", "/v1/pages"), ("PATCH", f"/v1/pages/{first_id}")]
+    assert page_ids(tmp_path)[idea] != first_id
@@ -0,0 +1,90 @@
+"""Incremental rebuilds of the HTML report."""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import report  # noqa: E402
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def make_root(tmp_path):
+    research_root = tmp_path / "research-notes"
+    for slug in ("vision", "audio"):
+        project_dir = research_root / "projects" / slug
+        write(project_dir / "project.md", f"---\ntitle: {slug.title()}\nstatus: active\n---\n")
+        idea_dir = project_dir / "ideas" / "depth"
+        write(idea_dir / "idea.md", "---\ntitle: Depth\nstatus: planned\ntags: [nerf]\n---\n")
+        write(idea_dir / "experiments" / "lr" / "experiment.md", "---\ntitle: LR\nstatus: running\n---\n")
+        write(idea_dir / "experiments" / "lr" / "results.md", "| Metric | Value |\n|---|---|\n| PSNR | 30.1 |\n")
+    return research_root
+
+
+def rendered(research_root, out_dir, monkeypatch):
+    names = []
+    real_write_page = report.write_page
+
+    def write_page(task):
+        names.append(task[1])
+        return real_write_page(task)
+    monkeypatch.setattr(report, "write_page", write_page)
+    counts = report.build_report(research_root, out_dir, workers=1)
+    monkeypatch.undo()
+    assert counts["rendered"] == len(names)
+    return sorted(names)
+
+
+def test_rebuild_renders_only_pages_whose_data_changed(tmp_path, monkeypatch):
+    research_root = make_root(tmp_path)
+    out_dir = tmp_path / "report"
+    idea_dir = research_root / "projects" / "vision" / "ideas" / "depth"
+    experiment_dir = idea_dir / "experiments" / "lr"
+
+    assert rendered(research_root, out_dir, monkeypatch) == [
+        "index.html", "projects/audio.html", "projects/vision.html", "style.css",
+        "tags/nerf.html", "validation.html",
+    ]
+    assert rendered(research_root, out_dir, monkeypatch) == []
+
+    write(experiment_dir / "results.md", "| Metric | Value |\n|---|---|\n| PSNR | 31.4 |\n")
+    assert rendered(research_root, out_dir, monkeypatch) == ["projects/vision.html"]
+    assert "31.4" in (out_dir / "projects" / "vision.html").read_text(encoding="utf-8")
+
+    # The index shows experiment counts, not experiment titles
+    write(experiment_dir / "experiment.md", "---\ntitle: LR sweep\nstatus: done\n---\n")
+    assert rendered(research_root, out_dir, monkeypatch) == ["projects/vision.html"]
+
+    write(idea_dir / "experiments" / "wd" / "experiment.md", "---\ntitle: WD\n---\n")
+    assert rendered(research_root, out_dir, monkeypatch) == ["index.html", "projects/vision.html"]
+
+    write(idea_dir / "idea.md", "---\ntitle: Depth\nstatus: validated\ntags: [nerf]\n---\n")
+    assert rendered(research_root, out_dir, monkeypatch) == [
+        "index.html", "projects/vision.html", "tags/nerf.html", "validation.html",
+    ]
+
+
+def test_pages_of_removed_projects_and_tags_are_deleted(tmp_path, monkeypatch):
+    research_root = make_root(tmp_path)
+    out_dir = tmp_path / "report"
+    report.build_report(research_root, out_dir, workers=1)
+
+    audio_dir = research_root / "projects" / "audio"
+    for path in sorted(audio_dir.rglob("*"), reverse=True):
+        path.unlink() if path.is_file() else path.rmdir()
+    audio_dir.rmdir()
+    write(research_root / "projects" / "vision" / "ideas" / "depth" / "idea.md", "---\ntitle: Depth\n---\n")
+
+    counts = report.build_report(research_root, out_dir, workers=1)
+    assert counts["removed"] == 2
+    assert not (out_dir / "projects" / "audio.html").exists()
+    assert not (out_dir / "tags" / "nerf.html").exists()
+    assert (out_dir / "index.html").exists()
@@ -0,0 +1,87 @@
+"""Title lookups through the persistent resolver cache."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import frontmatter  # noqa: E402
+import resolver  # noqa: E402
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def research_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(resolver, "_caches", {})
+    research_root = tmp_path / "research-notes"
+    write(research_root / "projects" / "vision" / "project.md", "---\ntitle: Vision\n---\n")
+    write(research_root / "projects" / "audio" / "project.md", "---\ntitle: Audio\n---\n")
+    return research_root
+
+
+def count_reads(monkeypatch):
+    reads = []
+    real_read = frontmatter.read
+
+    def read(path):
+        reads.append(path.parent.name)
+        return real_read(path)
+    monkeypatch.setattr(frontmatter, "read", read)
+    return reads
+
+
+def test_cached_titles_survive_the_process(research_root, monkeypatch):
+    projects_dir = research_root / "projects"
+    assert resolver.resolve_project(research_root, "VISION") == projects_dir / "vision"
+    assert (research_root / resolver.CACHE_FILE).exists()
+
+    # A new process loads the map from disk and reads no note for a hit
+    monkeypatch.setattr(resolver, "_caches", {})
+    reads = count_reads(monkeypatch)
+    assert resolver.resolve_project(research_root, "audio") == projects_dir / "audio"
+    assert resolver.resolve_project(research_root, "Nowhere") is None
+    assert reads == []
+
+
+def test_a_retitled_note_is_reread_alone(research_root, monkeypatch):
+    projects_dir = research_root / "projects"
+    assert resolver.resolve_project(research_root, "Vision") == projects_dir / "vision"
+    reads = count_reads(monkeypatch)
+
+    write(projects_dir / "vision" / "project.md", "---\ntitle: Vision 2\n---\n")
+    assert resolver.resolve_project(research_root, "Vision 2") == projects_dir / "vision"
+    assert reads == ["vision"]
+    assert resolver.resolve_project(research_root, "Vision") is None
+
+    # Swapped titles: the stale slug must not be returned
+    write(projects_dir / "vision" / "project.md", "---\ntitle: Audio\n---\n")
+    write(projects_dir / "audio" / "project.md", "---\ntitle: Vision\n---\n")
+    assert resolver.resolve_project(research_root, "Vision") == projects_dir / "audio"
+    assert resolver.resolve_project(research_root, "Audio") == projects_dir / "vision"
+
+
+def test_new_and_removed_notes(research_root):
+    projects_dir = research_root / "projects"
+    assert resolver.resolve_project(research_root, "Speech") is None
+
+    write(projects_dir / "speech" / "project.md", "---\ntitle: Speech\n---\n")
+    assert resolver.resolve_project(research_root, "Speech") == projects_dir / "speech"
+
+    (projects_dir / "speech" / "project.md").unlink()
+    assert resolver.resolve_project(research_root, "Speech") is None
+
+    idea_dir = projects_dir / "vision" / "ideas" / "depth"
+    write(idea_dir / "idea.md", "---\ntitle: Depth Prior\n---\n")
+    resolver.remember_idea(research_root, idea_dir, "Depth Prior")
+    assert resolver.resolve_idea(research_root, projects_dir / "vision", "depth prior") == idea_dir
+    assert resolver.resolve_idea(research_root, projects_dir / "audio", "Depth Prior") is None
@@ -0,0 +1,76 @@
+"""search.py over the index and over a plain scan of the notes."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import search  # noqa: E402
+import walker  # noqa: E402
+
+
+NOTES = {
+    "project.md": "---\ntitle: Vision\n---\nRendering roadmap.\n",
+    "ideas/nerf/idea.md": "---\ntitle: NeRF\nproject: vision\ntags: [rendering]\n---\n\n"
+                          "## Idea Description\n\nNeural RENDERING, re-rendered.\nNo match here.\n",
+    "ideas/nerf/experiments/lr/experiment.md": "---\ntitle: LR sweep\nidea: NeRF\n---\nRender at 512px.\n",
+    "ideas/nerf/experiments/lr/results.md": "Rendering PSNR 31.2\nrendering time 4 s\nrender\n",
+    "papers/mildenhall.md": "---\ntitle: NeRF paper\n---\nVolume rendering.\n" * 3,
+    "engineering/renderer/notes.md": "# Renderer\n\nCUDA renderer.\n",
+}
+
+
+def make_root(tmp_path):
+    research_root = tmp_path / "research-notes"
+    for rel, text in NOTES.items():
+        path = research_root / "projects" / "vision" / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return research_root
+
+
+@pytest.mark.parametrize("query", ["render", "ender", "Rendering PSNR", "no such words", "-"])
+@pytest.mark.parametrize("count_only", [False, True])
+def test_index_and_scan_find_the_same_hits(tmp_path, query, count_only):
+    research_root = make_root(tmp_path)
+    scopes = list(walker.SCOPES)
+
+    def run(use_index):
+        sections = search.search(research_root, scopes, query, max_per_file=1,
+                                 count_only=count_only, use_index=use_index, workers=1)
+        return [(scope, sorted((str(hit["path"]), hit["title"], hit["idea"], hit["project"],
+                                tuple(hit["matches"]), hit["count"], hit["complete"])
+                               for hit in hits))
+                for scope, hits in sections]
+
+    assert run(True) == run(False)
+    if query == "render":
+        assert all(hits for _, hits in run(True))
+
+
+@pytest.mark.parametrize("options", [{"use_index": False}, {"count_only": True}])
+def test_ranked_search_rejects_scan_and_count_only(tmp_path, options):
+    with pytest.raises(ValueError):
+        search.search(make_root(tmp_path), ["ideas"], "render", ranked=True, **options)
+
+
+def test_read_lines_streams_and_stops_after_the_last_wanted_line(tmp_path, monkeypatch):
+    path = tmp_path / "idea.md"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 10001)), encoding="utf-8")
+    monkeypatch.setattr(search, "CHUNK_SIZE", 1024)
+
+    reads = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        read = f.read
+        f.read = lambda size=-1: reads.append(size) or read(size)
+        return f
+    monkeypatch.setattr("builtins.open", counting_open)
+
+    assert search.read_lines(path, [120, 3]) == [(3, "line 3"), (120, "line 120")]
+    assert reads and all(size == 1024 for size in reads)
+    assert len(reads) <= 2
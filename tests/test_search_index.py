@@ -0,0 +1,104 @@
+"""Index lookups against the notes they were built from."""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import search_index  # noqa: E402
+
+
+IDEA = """---
+title: {title}
+project: vision
+---
+
+## Idea Description
+
+{body}
+"""
+
+
+def write_idea(research_root, slug, title, body):
+    idea_dir = research_root / "projects" / "vision" / "ideas" / slug
+    idea_dir.mkdir(parents=True, exist_ok=True)
+    path = idea_dir / "idea.md"
+    path.write_text(IDEA.format(title=title, body=body), encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    return path
+
+
+def make_root(tmp_path):
+    research_root = tmp_path / "research-notes"
+    project_dir = research_root / "projects" / "vision"
+    project_dir.mkdir(parents=True)
+    (project_dir / "project.md").write_text("---\ntitle: Vision\n---\n", encoding="utf-8")
+    return research_root
+
+
+def test_lookup_finds_infix_matches_next_to_prefix_matches(tmp_path):
+    research_root = make_root(tmp_path)
+    write_idea(research_root, "cache", "Cache", "Enders and splat renders.")
+    write_idea(research_root, "nerf", "NeRF", "Neural rendering of scenes.")
+    index, _ = search_index.refresh_index(research_root, "ideas")
+
+    # "enders" starts with the query; "renders" and "rendering" only contain it
+    result = search_index.lookup(index, "ender")
+    assert sorted(result) == [
+        "projects/vision/ideas/cache/idea.md",
+        "projects/vision/ideas/nerf/idea.md",
+    ]
+    assert "renders" in search_index.matching_tokens(index, "ender")
+    assert "rendering" in search_index.matching_tokens(index, "ender")
+
+
+def test_lookup_sees_tokens_swapped_by_an_in_place_refresh(tmp_path):
+    research_root = make_root(tmp_path)
+    write_idea(research_root, "zebra", "Zebra", "zebrafoo")
+    index, _ = search_index.refresh_index(research_root, "ideas")
+    assert search_index.lookup(index, "zebrafoo")
+
+    # Same number of distinct tokens, refreshed into the same index object
+    write_idea(research_root, "zebra", "Zebra", "qqqwww")
+    refreshed, changed = search_index.refresh_index(research_root, "ideas", index)
+    assert refreshed is index and changed == 1
+
+    assert search_index.lookup(index, "zebrafoo") == {}
+    assert list(search_index.lookup(index, "qqqwww")) == ["projects/vision/ideas/zebra/idea.md"]
+
+
+def test_rank_expands_terms_like_lookup_and_counts_occurrences(tmp_path):
+    research_root = make_root(tmp_path)
+    write_idea(research_root, "once", "Once", "Splat renders.")
+    write_idea(research_root, "twice", "Twice", "Splat renders, renders again.")
+    write_idea(research_root, "other", "Other", "Depth maps.")
+    index, _ = search_index.refresh_index(research_root, "ideas")
+
+    # "ender" is no indexed token of its own, only part of "renders"
+    ranked = search_index.rank(index, "ender")
+    assert [rel.split("/")[3] for _, rel, _ in ranked] == ["twice", "once"]
+    assert ranked[0][0] > ranked[1][0]
+    assert set(search_index.lookup(index, "ender")) == {rel for _, rel, _ in ranked}
+
+
+def test_results_entry_follows_its_experiment_title(tmp_path):
+    research_root = make_root(tmp_path)
+    experiment_dir = research_root / "projects" / "vision" / "ideas" / "nerf" / "experiments" / "lr"
+    experiment_dir.mkdir(parents=True)
+    experiment = experiment_dir / "experiment.md"
+    experiment.write_text("---\ntitle: LR sweep\nidea: NeRF\n---\n", encoding="utf-8")
+    (experiment_dir / "results.md").write_text("PSNR 31.2\n", encoding="utf-8")
+
+    index, _ = search_index.refresh_index(research_root, "results")
+    [entry] = index["files"].values()
+    assert entry["title"] == "LR sweep"
+
+    experiment.write_text("---\ntitle: Warmup sweep\nidea: NeRF\n---\n", encoding="utf-8")
+    stat = experiment.stat()
+    os.utime(experiment, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    index, changed = search_index.refresh_index(research_root, "results")
+    [entry] = index["files"].values()
+    assert changed == 1 and entry["title"] == "Warmup sweep"
@@ -0,0 +1,72 @@
+"""Rendering notes from built-in and workspace templates."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import frontmatter  # noqa: E402
+import templates  # noqa: E402
+
+
+IDEA_VALUES = {"title": "Depth Prior", "project": "Vision", "created": "2026-01-01",
+               "updated": "2026-01-02", "tags": "[nerf]", "priority": "high"}
+
+
+@pytest.fixture(autouse=True)
+def compiled(monkeypatch):
+    monkeypatch.setattr(templates, "_compiled", {})
+
+
+def write_template(research_root, name, text):
+    path = templates.template_path(research_root, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    # A rewrite within the same mtime tick must still look changed
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_built_in_template_without_a_workspace_file(tmp_path):
+    text = templates.render(tmp_path, "idea", **IDEA_VALUES)
+    assert frontmatter.parse(text) == {
+        "title": "Depth Prior", "project": "Vision", "created": "2026-01-01", "updated": "2026-01-02",
+        "status": "unverified", "tags": ["nerf"], "priority": "high",
+    }
+    assert "## Idea Description" in text
+
+
+def test_fields_override_template_keys_and_other_braces_are_kept(tmp_path):
+    write_template(tmp_path, "idea", "---\ntitle: Untitled\npriority: low\nowner: {owner}\n---\n\n"
+                                     "# {title}\n\nSee {project} and {{literal}} and `{}`.\n")
+    text = templates.render(tmp_path, "idea", **IDEA_VALUES)
+    metadata = frontmatter.parse(text)
+    assert metadata["title"] == "Depth Prior" and metadata["priority"] == "high"
+    assert metadata["owner"] == "{owner}"
+    # Fields the template left out are added
+    assert metadata["created"] == "2026-01-01" and metadata["tags"] == ["nerf"]
+    assert "# Depth Prior\n\nSee Vision and {{literal}} and `{}`.\n" in text
+
+
+def test_compiled_template_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    write_template(tmp_path, "validation", "---\nidea: x\n---\nFirst {idea}\n")
+    assert templates.render(tmp_path, "validation", idea="Depth").endswith("First Depth\n")
+
+    compiles = []
+    real_compile = templates.compile_template
+    monkeypatch.setattr(templates, "compile_template",
+                        lambda text, fields: compiles.append(text) or real_compile(text, fields))
+    for _ in range(3):
+        templates.render(tmp_path, "validation", idea="Depth")
+    assert compiles == []
+
+    write_template(tmp_path, "validation", "---\nidea: x\n---\nSecond {idea}\n")
+    assert templates.render(tmp_path, "validation", idea="Depth").endswith("Second Depth\n")
+    assert len(compiles) == 1
+
+    # Removing the file falls back to the built-in template
+    templates.template_path(tmp_path, "validation").unlink()
+    assert "## Validation Summary" in templates.render(tmp_path, "validation", idea="Depth")
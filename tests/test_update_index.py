@@ -0,0 +1,92 @@
+"""index.md and tags.md regenerated from per-project records."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import update_index  # noqa: E402
+
+
+OLD_INDEX = """# Research Notes Index
+
+Last updated: 2026-01-01T00:00:00
+
+Hand-written introduction.
+
+## Projects
+
+- [Stale](projects/stale/project.md) - research - 2025-01-01
+
+## Tags
+
+## Tag Usage
+
+Keep tags short.
+"""
+
+
+def write_project(research_root, slug, title, tags, ideas=()):
+    project_dir = research_root / "projects" / slug
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "project.md").write_text(
+        f"---\ntitle: {title}\ntype: research\ncreated: 2026-01-01T09:00:00\ntags: [{tags}]\n---\n",
+        encoding="utf-8")
+    for idea_slug, idea_tags in ideas:
+        idea_dir = project_dir / "ideas" / idea_slug
+        idea_dir.mkdir(parents=True, exist_ok=True)
+        (idea_dir / "idea.md").write_text(f"---\ntitle: {idea_slug.title()}\ntags: [{idea_tags}]\n---\n",
+                                          encoding="utf-8")
+    return project_dir
+
+
+@pytest.fixture
+def research_root(tmp_path):
+    research_root = tmp_path / "research-notes"
+    write_project(research_root, "vision", "Vision", "nerf", [("depth", "nerf, depth")])
+    write_project(research_root, "audio", "Audio", "speech")
+    (research_root / "index.md").write_text(OLD_INDEX, encoding="utf-8")
+    return research_root
+
+
+def test_generated_sections_replace_old_ones_and_keep_hand_written_text(research_root):
+    assert update_index.update_index(research_root) == ["index.md", "tags.md"]
+
+    index = (research_root / "index.md").read_text(encoding="utf-8")
+    assert "Hand-written introduction." in index and "Keep tags short." in index
+    assert "Stale" not in index
+    assert "- [Audio](projects/audio/project.md) - research - 2026-01-01" in index
+    assert "- [#nerf](tags.md#nerf) (2)" in index
+    assert "- Total Ideas: 1" in index
+    assert index.index("## Tags") < index.index("## Quick Stats") < index.index("## Tag Usage")
+
+    tags = (research_root / "tags.md").read_text(encoding="utf-8")
+    assert "### #depth\n\n- [Depth](projects/vision/ideas/depth/idea.md) - idea" in tags
+
+    # Nothing changed: nothing is rewritten
+    assert update_index.update_index(research_root) == []
+
+
+def test_only_the_given_projects_are_reread(research_root, monkeypatch):
+    update_index.update_index(research_root)
+    audio_dir = research_root / "projects" / "audio"
+    write_project(research_root, "audio", "Audio 2", "speech")
+    (research_root / "projects" / "vision" / "project.md").unlink()
+
+    reread = []
+    real_scan_record = update_index.scan_record
+    monkeypatch.setattr(update_index, "scan_record",
+                        lambda root, project_dir: reread.append(project_dir.name) or real_scan_record(root, project_dir))
+    assert update_index.update_index(research_root, [audio_dir]) == ["index.md", "tags.md"]
+    assert reread == ["audio"]
+
+    index = (research_root / "index.md").read_text(encoding="utf-8")
+    assert "[Audio 2]" in index and "[Vision]" in index
+
+    # A lost cache rebuilds every project
+    (research_root / update_index.CACHE_FILE).write_text("{", encoding="utf-8")
+    update_index.update_index(research_root, [audio_dir])
+    assert sorted(reread[1:]) == ["audio", "vision"]
+    assert "[Vision]" not in (research_root / "index.md").read_text(encoding="utf-8")
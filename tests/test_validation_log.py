@@ -0,0 +1,72 @@
+"""Reports computed from the validation status transition log."""
+
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import validation_log  # noqa: E402
+
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def record(time, idea, old, new, project="3d-vision"):
+    return {"time": time, "path": f"projects/{project}/ideas/{idea}", "project": project,
+            "idea": idea, "title": idea.title(), "from": old, "to": new}
+
+
+RECORDS = [
+    record("2026-03-02T09:00:00", "depth", "planned", "in-progress"),
+    record("2026-03-03T09:00:00", "pose", "planned", "in-progress"),
+    record("2026-03-04T21:00:00", "depth", "in-progress", "validated"),
+    # Back to in-progress after a rejection: both stretches count
+    record("2026-03-05T09:00:00", "pose", "in-progress", "rejected"),
+    record("2026-03-09T09:00:00", "pose", "rejected", "in-progress"),
+    record("2026-03-10T08:00:00", "flow", "planned", "in-progress", project="audio"),
+]
+
+
+def test_time_in_sums_every_stretch_and_counts_ongoing_ones_to_now():
+    now = datetime.fromisoformat("2026-03-10T09:00:00")
+    totals = validation_log.time_in(RECORDS, "in-progress", now)
+    assert totals == {
+        "projects/3d-vision/ideas/depth": (2.5 * 86400, False),
+        "projects/3d-vision/ideas/pose": (3 * 86400, True),
+        "projects/audio/ideas/flow": (3600, True),
+    }
+    assert validation_log.time_in(RECORDS, "validated", now) == {
+        "projects/3d-vision/ideas/depth": (5.5 * 86400, True),
+    }
+
+
+def test_throughput_buckets_starts_and_final_statuses():
+    assert validation_log.throughput(RECORDS, "week") == {
+        "2026-W10": {"started": 2, "validated": 1, "rejected": 1},
+        "2026-W11": {"started": 2, "validated": 0, "rejected": 0},
+    }
+    by_day = validation_log.throughput(RECORDS, "day")
+    assert by_day["2026-03-04"] == {"started": 0, "validated": 1, "rejected": 0}
+    assert sorted(validation_log.throughput(RECORDS, "month")) == ["2026-03"]
+
+
+def test_project_option_takes_the_project_title(tmp_path):
+    research_root = tmp_path / "research-notes"
+    project_dir = research_root / "projects" / "3d-vision"
+    project_dir.mkdir(parents=True)
+    (project_dir / "project.md").write_text("---\ntitle: 3D Vision\n---\n", encoding="utf-8")
+    validation_log.append(research_root, RECORDS)
+
+    def run(*args):
+        return subprocess.run([sys.executable, str(SCRIPTS / "validation_log.py"), "throughput", "--by", "month",
+                               *args, "--root", str(research_root)], capture_output=True, text=True)
+
+    result = run("--project", "3D Vision")
+    assert result.returncode == 0, result.stdout
+    assert result.stdout.splitlines()[1].split() == ["2026-03", "3", "1", "1"]
+
+    result = run("--project", "Nowhere")
+    assert result.returncode == 1
+    assert "not found" in result.stdout
@@ -0,0 +1,83 @@
+"""The shared walk over research-notes/projects."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import walker  # noqa: E402
+
+
+FILES = [
+    "vision/project.md",
+    "vision/ideas/depth/idea.md",
+    "vision/ideas/depth/experiments/lr/experiment.md",
+    "vision/ideas/depth/experiments/lr/results.md",
+    "vision/ideas/depth/experiments/wd/notes.txt",
+    "vision/ideas/pose/README.md",
+    "vision/papers/nerf.md",
+    "vision/papers/2020/mip.md",
+    "vision/papers/2020/mip.pdf",
+    "vision/engineering/renderer/notes.md",
+    "audio/notes.txt",
+]
+
+
+@pytest.fixture
+def projects_dir(tmp_path):
+    projects_dir = tmp_path / "projects"
+    for rel in FILES:
+        path = projects_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+    return projects_dir
+
+
+def listing(notes, projects_dir):
+    return [(n.kind, n.dir.relative_to(projects_dir).as_posix(),
+             n.path and n.path.relative_to(projects_dir).as_posix(), n.project_dir.name) for n in notes]
+
+
+def test_walk_lists_every_note_directory_once(projects_dir, monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+
+    assert listing(walker.walk(projects_dir), projects_dir) == [
+        ("project", "audio", None, "audio"),
+        ("project", "vision", "vision/project.md", "vision"),
+        ("idea", "vision/ideas/depth", "vision/ideas/depth/idea.md", "vision"),
+        ("experiment", "vision/ideas/depth/experiments/lr", "vision/ideas/depth/experiments/lr/experiment.md", "vision"),
+        ("experiment", "vision/ideas/depth/experiments/wd", None, "vision"),
+        ("idea", "vision/ideas/pose", None, "vision"),
+    ]
+    assert len(listed) == len(set(map(str, listed)))
+
+
+def test_parallel_map_keeps_input_order():
+    items = list(range(50))
+    assert walker.parallel_map(lambda i: i * i, items, workers=8) == [i * i for i in items]
+    assert walker.parallel_map(lambda i: i, [], workers=8) == []
+
+
+@pytest.mark.parametrize("scope, paths", [
+    ("ideas", ["vision/ideas/depth/idea.md"]),
+    ("results", ["vision/ideas/depth/experiments/lr/results.md"]),
+    ("papers", ["vision/papers/nerf.md", "vision/papers/2020/mip.md"]),
+    ("engineering", ["vision/engineering/renderer/notes.md"]),
+])
+def test_walk_scope_yields_the_notes_of_one_scope(projects_dir, scope, paths):
+    notes = [n for n in walker.walk_scope(projects_dir, scope) if n.kind != "project" and n.path]
+    assert [n.path.relative_to(projects_dir).as_posix() for n in notes] == paths
+    assert {n.kind for n in notes} == {walker.SCOPES[scope]}
+
+
+def test_papers_walk_never_enters_ideas(projects_dir, monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(Path(path)) or real_scandir(path))
+    list(walker.walk_scope(projects_dir, "papers"))
+    assert not [path for path in listed if "ideas" in path.parts]